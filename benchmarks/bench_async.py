@@ -0,0 +1,135 @@
+"""Load test of asyncio API: latency of concurrent requests and event loop lag.
+
+Requests with sources of different sizes are sent at once (like uploads to web service)
+and checked by ``AsyncChecker`` with thread or process pool, or directly in event loop
+(``blocking`` mode, as calling ``Plugin.run`` from coroutine does). Heartbeat task shows
+how long event loop is blocked.
+
+Usage::
+
+    python -m benchmarks.bench_async --requests 200 --modes blocking thread process
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from flake8_hangover.aio import AsyncChecker
+from flake8_hangover.api import check_source
+
+from .corpus import (
+    CorpusParams,
+    generate_corpus,
+)
+
+HEARTBEAT_INTERVAL = 0.001
+
+
+class LoadResult(NamedTuple):
+    """Latencies of requests and event loop lag in seconds."""
+
+    latencies: List[float]
+    max_lag: float
+    total: float
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Get percentile of values (nearest rank)."""
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+async def heartbeat(lags: List[float]) -> None:
+    """Measure delays of event loop."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(loop.time() - expected)
+
+
+async def run_load(sources: List[str], checker: Optional[AsyncChecker]) -> LoadResult:
+    """Check all sources concurrently and collect latencies."""
+    lags: List[float] = [0.0]
+    beat = asyncio.ensure_future(heartbeat(lags))
+    await asyncio.sleep(0)
+
+    async def request(source: str) -> float:
+        if checker is None:
+            check_source(source)
+        else:
+            await checker.check(source)
+        return time.perf_counter() - started  # all requests arrive at once
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(request(source) for source in sources))
+    total = time.perf_counter() - started
+    await asyncio.sleep(HEARTBEAT_INTERVAL * 2)  # let heartbeat see the last lag
+    beat.cancel()
+    return LoadResult(list(latencies), max(lags), total)
+
+
+async def run_mode(mode: str, sources: List[str], concurrency: int) -> LoadResult:
+    """Run load test in mode."""
+    if mode == 'blocking':
+        return await run_load(sources, None)
+    if mode == 'thread':
+        async with AsyncChecker(max_concurrency=concurrency) as checker:
+            return await run_load(sources, checker)
+    with ProcessPoolExecutor(concurrency) as executor:
+        # start workers before measurement
+        warmup = AsyncChecker(executor, max_concurrency=concurrency)
+        await asyncio.gather(*(warmup.check('x = 1\n') for _ in range(concurrency)))
+        return await run_load(sources, AsyncChecker(executor, max_concurrency=concurrency))
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--requests', type=int, default=200, help='number of requests')
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[50, 200, 1000],
+        help='lines of sources (requests are spread over them)',
+    )
+    parser.add_argument('--concurrency', type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        '--modes',
+        nargs='+',
+        choices=['blocking', 'thread', 'process'],
+        default=['blocking', 'thread', 'process'],
+    )
+    args = parser.parse_args()
+
+    sizes: List[int] = args.sizes
+    corpora = [generate_corpus(CorpusParams(lines=size, seed=size)) for size in sizes]
+    sources = [corpora[i % len(corpora)] for i in range(args.requests)]
+
+    sys.stdout.write(
+        f'{"mode":>10} {"p50 ms":>10} {"p95 ms":>10} {"p99 ms":>10} '
+        f'{"max lag ms":>12} {"req/s":>10}\n',
+    )
+    modes: List[str] = args.modes
+    for mode in modes:
+        result = asyncio.run(run_mode(mode, sources, args.concurrency))
+        sys.stdout.write(
+            f'{mode:>10} '
+            f'{percentile(result.latencies, 50) * 1e3:>10.1f} '
+            f'{percentile(result.latencies, 95) * 1e3:>10.1f} '
+            f'{percentile(result.latencies, 99) * 1e3:>10.1f} '
+            f'{result.max_lag * 1e3:>12.1f} '
+            f'{len(sources) / result.total:>10.1f}\n',
+        )
+
+
+if __name__ == '__main__':
+    main()
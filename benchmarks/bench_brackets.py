@@ -0,0 +1,136 @@
+"""Micro-benchmark for bracket matching in ``IndentValidator``.
+
+Compares per-token cost of current implementation with the legacy one
+(``queue.LifoQueue`` stacks and ``Parenthese`` objects for every bracket).
+
+Usage::
+
+    python -m benchmarks.bench_brackets --lines 20000
+"""
+import argparse
+import sys
+import time
+from io import StringIO
+from queue import LifoQueue
+from token import (
+    DEDENT,
+    INDENT,
+    OP,
+)
+from tokenize import (
+    TokenInfo,
+    generate_tokens,
+)
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+from flake8_hangover.validator import IndentValidator
+
+
+class LegacyParenthese:
+    """Bracket record as it was stored before (with ``__dict__``)."""
+
+    def __init__(self, line: int, column: int, type: int, open: bool, indent: int) -> None:
+        self.line = line
+        self.column = column
+        self.type = type
+        self.open = open
+        self.indent = indent
+        self.pair: Optional['LegacyParenthese'] = None
+
+
+def legacy_validate(tokens: List[TokenInfo]) -> Dict[int, int]:
+    """Legacy implementation: two token scans, list of all brackets, locking queues."""
+    indents: Dict[int, int] = {}
+    for t in tokens:
+        if t.type in (INDENT, DEDENT):
+            continue
+        if t.start[0] not in indents:
+            indents[t.start[0]] = t.start[1]
+
+    parentheses = []
+    for t in tokens:
+        if t.type != OP or t.string not in '()[]{}':
+            continue
+        types = {'(': 1, ')': 1, '[': 2, ']': 2, '{': 3, '}': 3}
+        parentheses.append(LegacyParenthese(
+            line=t.start[0],
+            column=t.start[1],
+            type=types.get(t.string, 0),
+            open=t.string in '([{',
+            indent=indents[t.start[0]],
+        ))
+
+    queues: Dict[int, LifoQueue] = {1: LifoQueue(), 2: LifoQueue(), 3: LifoQueue()}
+    for p in parentheses:
+        if p.open:
+            queues[p.type].put(p)
+        else:
+            p_open = queues[p.type].get()
+            p.pair = p_open
+            p_open.pair = p
+
+    errors = {}
+    for p in parentheses:
+        if p.open and p.pair and p.line != p.pair.line and p.indent != p.pair.indent:
+            errors[p.pair.line] = p.pair.column
+    return errors
+
+
+def current_validate(tokens: List[TokenInfo]) -> Dict[int, int]:
+    """Current implementation."""
+    validator = IndentValidator(tokens=tokens)
+    validator.validate()
+    return {line: col for line, col in validator.errors}
+
+
+def make_corpus(lines: int) -> str:
+    """Generate bracket-heavy code with about ``lines`` lines."""
+    chunk = (
+        'result = func(\n'
+        '    [a[0], b[1], {"k": (c, d)}],\n'
+        '    {"x": [(1, 2), (3, 4)]},\n'
+        '    other(x)[y](z))\n'
+    )
+    return chunk * max(lines // chunk.count('\n'), 1)
+
+
+def measure(
+    func: Callable[[List[TokenInfo]], Dict[int, int]],
+    tokens: List[TokenInfo],
+    repeat: int,
+) -> float:
+    """Return best time of ``repeat`` runs in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(tokens)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--lines', type=int, default=20000, help='corpus size in lines')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (best is taken)')
+    args = parser.parse_args()
+
+    source = make_corpus(args.lines)
+    tokens = list(generate_tokens(StringIO(source).readline))
+    assert legacy_validate(tokens) == current_validate(tokens)
+
+    legacy = measure(legacy_validate, tokens, args.repeat)
+    current = measure(current_validate, tokens, args.repeat)
+    sys.stdout.write(f'tokens: {len(tokens)}\n')
+    for name, seconds in (('legacy', legacy), ('current', current)):
+        sys.stdout.write(f'{name:>8}: {seconds * 1e9 / len(tokens):8.1f} ns/token\n')
+    sys.stdout.write(f'{"speedup":>8}: {legacy / current:8.2f}x\n')
+
+
+if __name__ == '__main__':
+    main()
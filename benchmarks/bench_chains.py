@@ -0,0 +1,94 @@
+"""Benchmark of function name width on long fluent method chains.
+
+Every multiline call in chain like ``qs.filter(...).exclude(...)`` may need width of
+its function name. Time per chain link must stay constant with chain growth.
+
+Usage::
+
+    python -m benchmarks.bench_chains --links 100 200 300 400 500
+"""
+import argparse
+import ast
+import sys
+import time
+from io import StringIO
+from tokenize import generate_tokens
+from typing import (
+    Any,
+    List,
+    Type,
+)
+
+from flake8_hangover.messages import TAB_SIZE
+from flake8_hangover.rules import CallRule
+from flake8_hangover.visitor import Visitor
+
+
+class LegacyCallRule(CallRule):
+    """Rule which rebuilds full function name for every call."""
+
+    def _get_func_name_offset(self, node: Any) -> int:
+        return int(node.col_offset + max(len(self._get_func_name(node.func)), TAB_SIZE))
+
+    def _get_func_name(self, obj: Any) -> str:
+        try:
+            if isinstance(obj, ast.Attribute):
+                return f'{self._get_func_name(obj.value)}.{obj.attr}'
+            if isinstance(obj, ast.Call):
+                return self._get_func_name(obj.func)
+            if isinstance(obj, ast.Subscript):
+                return f'{self._get_func_name(obj.value)}[{self._get_func_name(obj.slice)}]'
+            if isinstance(obj, ast.Index):
+                return self._get_func_name(obj.value)
+            if isinstance(obj, ast.Constant):
+                return str(obj.value)
+            return str(obj.id)
+        except Exception:
+            return ''
+
+
+def make_chain(links: int) -> str:
+    """Generate statement with fluent chain of ``links`` multiline calls."""
+    return 'qs = qs' + ''.join(f'.method_{i}(\n    arg={i},\n)' for i in range(links)) + '\n'
+
+
+def measure(rule_class: Type[CallRule], source: str, repeat: int) -> float:
+    """Return best time of ``repeat`` runs in seconds.
+
+    Function name offset is calculated for every call in chain (outer calls first,
+    like visitor does).
+    """
+    tree = ast.parse(source)
+    tokens = list(generate_tokens(StringIO(source).readline))
+    calls = [node for node in ast.walk(tree) if isinstance(node, ast.Call)]
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rule = rule_class(Visitor(tokens=tokens))
+        for node in calls:
+            rule._get_func_name_offset(node)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--links', type=int, nargs='+', default=[100, 200, 300, 400, 500])
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (best is taken)')
+    args = parser.parse_args()
+
+    # legacy name builder needs few frames per chain link
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), max(args.links) * 20))
+
+    sys.stdout.write(f'{"links":>6} {"legacy us/link":>15} {"current us/link":>16}\n')
+    links: List[int] = args.links
+    for n in links:
+        source = make_chain(n)
+        legacy = measure(LegacyCallRule, source, args.repeat)
+        current = measure(CallRule, source, args.repeat)
+        sys.stdout.write(f'{n:>6} {legacy * 1e6 / n:>15.2f} {current * 1e6 / n:>16.2f}\n')
+
+
+if __name__ == '__main__':
+    main()
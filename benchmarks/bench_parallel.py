@@ -0,0 +1,75 @@
+"""Benchmark of parallel checks of huge file by chunks of top-level statements.
+
+Compares wall time of ``Plugin.run`` on single huge file checked as usual and by chunks
+in ``--jobs`` worker processes (time of forking workers for the file is included).
+Results of both are checked for parity.
+
+Usage::
+
+    python -m benchmarks.bench_parallel --lines 100000 --jobs 2 4 8
+"""
+import argparse
+import ast
+import sys
+import time
+from io import StringIO
+from tokenize import generate_tokens
+from typing import (
+    List,
+    Tuple,
+)
+
+from flake8_hangover.parallel import ChunkChecker
+from flake8_hangover.plugin import Plugin
+
+from .corpus import (
+    CorpusParams,
+    generate_corpus,
+)
+from .run import add_corpus_arguments
+
+
+def measure(source: str, repeat: int) -> Tuple[float, List[Tuple[int, int, str]]]:
+    """Return best time of ``repeat`` runs in seconds and results."""
+    tree = ast.parse(source)
+    tokens = list(generate_tokens(StringIO(source).readline))
+    lines = source.splitlines(keepends=True)
+    best = float('inf')
+    results: List[Tuple[int, int, str]] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [r[:3] for r in Plugin(tree=tree, file_tokens=tokens, lines=lines).run()]
+        best = min(best, time.perf_counter() - start)
+    return best, sorted(results)
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    add_corpus_arguments(parser)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[2, 4])
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs (best is taken)')
+    parser.set_defaults(lines=100000)
+    args = parser.parse_args()
+
+    params = CorpusParams(**{name: getattr(args, name) for name in CorpusParams._fields})
+    source = generate_corpus(params)
+    serial_time, expected = measure(source, args.repeat)
+    sys.stdout.write(f'{"jobs":>6} {"time ms":>10} {"speedup":>8} {"parity":>8}\n')
+    sys.stdout.write(f'{"serial":>6} {serial_time * 1e3:>10.1f} {1:>7.2f}x {"ok":>8}\n')
+
+    jobs: List[int] = args.jobs
+    for count in jobs:
+        Plugin.parallel = ChunkChecker(min_lines=1, jobs=count)
+        try:
+            parallel_time, results = measure(source, args.repeat)
+        finally:
+            Plugin.parallel = None
+        sys.stdout.write(
+            f'{count:>6} {parallel_time * 1e3:>10.1f} {serial_time / parallel_time:>7.2f}x '
+            f'{"ok" if results == expected else "FAILED":>8}\n',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark of raw source scanner against ``tokenize`` for brackets and indents.
+
+Compares time of ``tokenize.generate_tokens`` with scan of ``FileIndex`` (data used by
+``IndentValidator`` when tokens come from flake8 or are built by API) and time of
+``SourceIndex``, which finds the same data in raw source. Results of both are checked
+for parity.
+
+Usage::
+
+    python -m benchmarks.bench_scanner --lines 20000
+"""
+import argparse
+import sys
+import time
+from io import StringIO
+from tokenize import generate_tokens
+from typing import (
+    Callable,
+    Tuple,
+)
+
+from flake8_hangover.index import FileIndex
+from flake8_hangover.scanner import SourceIndex
+
+from .corpus import (
+    CorpusParams,
+    generate_corpus,
+)
+from .run import add_corpus_arguments
+
+
+def tokenize_index(source: str) -> FileIndex:
+    """Tokenize source and scan tokens."""
+    index = FileIndex(list(generate_tokens(StringIO(source).readline)))
+    index.scan()
+    return index
+
+
+def scan_index(source: str) -> FileIndex:
+    """Scan raw source."""
+    index = SourceIndex(source)
+    index.scan()
+    return index
+
+
+def measure(func: Callable[[str], FileIndex], source: str, repeat: int) -> Tuple[float, FileIndex]:
+    """Return best time of ``repeat`` runs in seconds and result."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(source)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    add_corpus_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (best is taken)')
+    args = parser.parse_args()
+
+    params = CorpusParams(**{name: getattr(args, name) for name in CorpusParams._fields})
+    source = generate_corpus(params)
+    tokenize_time, expected = measure(tokenize_index, source, args.repeat)
+    scan_time, index = measure(scan_index, source, args.repeat)
+    parity = index.pairs == expected.pairs and index.line_indents == expected.line_indents
+
+    sys.stdout.write(f'{"lines":>8} {"tokenize ms":>12} {"scanner ms":>12} {"speedup":>8}\n')
+    sys.stdout.write(
+        f'{params.lines:>8} {tokenize_time * 1e3:>12.2f} {scan_time * 1e3:>12.2f} '
+        f'{tokenize_time / scan_time:>7.1f}x\n',
+    )
+    sys.stdout.write(f'parity: {"ok" if parity else "FAILED"} ({len(index.pairs)} pairs)\n')
+    if not parity:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
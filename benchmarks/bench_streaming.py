@@ -0,0 +1,64 @@
+"""Benchmark of errors streaming on legacy file with many violations.
+
+Measures time to the first error yielded by ``Plugin.run``, time of all errors and peak
+memory allocated while errors are consumed one by one (as flake8 does).
+
+Usage::
+
+    python -m benchmarks.bench_streaming --statements 20000
+"""
+import argparse
+import ast
+import sys
+import time
+import tracemalloc
+from io import StringIO
+from tokenize import generate_tokens
+from typing import Tuple
+
+from flake8_hangover.plugin import Plugin
+
+# every statement has errors of both visitor and validator
+STATEMENT = 'def func_{}(a,\n        b):\n    return g(\n          a,\n    )\n'
+
+
+def measure(source: str, repeat: int) -> Tuple[float, float, int, int]:
+    """Return best times of first and all errors, number of errors and peak memory."""
+    tree = ast.parse(source)
+    tokens = list(generate_tokens(StringIO(source).readline))
+    lines = source.splitlines(keepends=True)
+    first_time = total_time = float('inf')
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = Plugin(tree=tree, file_tokens=tokens, lines=lines).run()
+        next(results)
+        first_time = min(first_time, time.perf_counter() - start)
+        count = 1 + sum(1 for _ in results)
+        total_time = min(total_time, time.perf_counter() - start)
+
+    tracemalloc.start()
+    for _ in Plugin(tree=tree, file_tokens=tokens, lines=lines).run():
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first_time, total_time, count, peak
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--statements', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (best is taken)')
+    args = parser.parse_args()
+
+    source = ''.join(STATEMENT.format(i) for i in range(args.statements))
+    first_time, total_time, count, peak = measure(source, args.repeat)
+    sys.stdout.write(
+        f'{"errors":>8} {"first ms":>10} {"total ms":>10} {"peak KiB":>10}\n'
+        f'{count:>8} {first_time * 1e3:>10.2f} {total_time * 1e3:>10.1f} {peak / 1024:>10.1f}\n',
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark of AST walking in ``Visitor`` on corpus and deeply nested expressions.
+
+Compares iterative walker with the legacy recursive one (``ast.NodeVisitor`` style
+recursion through ``generic_visit``). Legacy walker needs two frames per nesting level,
+so it fails with ``RecursionError`` on deep expressions.
+
+Usage::
+
+    python -m benchmarks.bench_walker --lines 20000 --depths 1000 2000 3000
+"""
+import argparse
+import ast
+import sys
+import time
+from io import StringIO
+from tokenize import generate_tokens
+from typing import (
+    Any,
+    List,
+    Optional,
+    Type,
+)
+
+from flake8_hangover.visitor import Visitor
+
+from .corpus import (
+    CorpusParams,
+    generate_corpus,
+)
+from .run import add_corpus_arguments
+
+
+class RecursiveVisitor(Visitor):
+    """Visitor which walks nodes recursively as ``ast.NodeVisitor`` does."""
+
+    def visit(self, node: ast.AST) -> None:
+        self.nodes_visited += 1
+        for handler in self._handlers.get(type(node), ()):
+            handler(node)
+        self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        for child in ast.iter_child_nodes(node):
+            if not self._is_single_line(child) and self._is_in_line_ranges(child):
+                self.visit(child)
+
+    def _is_single_line(self, node: ast.AST) -> bool:
+        """Check that node and all its children are placed on single line."""
+        if not node._fields:
+            return True  # nodes like ``ast.Load`` have no children at all
+
+        lineno = getattr(node, 'lineno', None)
+        if lineno is None or lineno != getattr(node, 'end_lineno', None):
+            return False
+
+        # decorators are placed before first line of function/class definition
+        return not getattr(node, 'decorator_list', None)
+
+
+def make_nested(depth: int) -> str:
+    """Generate expression of ``depth`` nested multiline binary operations with calls."""
+    return 'x = (\n    a\n' + '    + f(\n        a,\n    )\n' * depth + ')\n'
+
+
+def measure(visitor_class: Type[Visitor], tree: ast.AST, tokens: List[Any], repeat: int) -> float:
+    """Return best time of ``repeat`` runs in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        visitor_class(tokens=tokens).visit(tree)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def try_measure(
+    visitor_class: Type[Visitor],
+    tree: ast.AST,
+    tokens: List[Any],
+    repeat: int,
+) -> Optional[float]:
+    """Return best time of runs in seconds (``None`` if recursion limit is exceeded)."""
+    try:
+        return measure(visitor_class, tree, tokens, repeat)
+    except RecursionError:
+        return None
+
+
+def format_time(seconds: Optional[float], width: int) -> str:
+    """Format time in milliseconds."""
+    if seconds is None:
+        return f'{"RecursionError":>{width}}'
+    return f'{seconds * 1e3:>{width}.2f}'
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    add_corpus_arguments(parser)
+    parser.add_argument('--depths', type=int, nargs='+', default=[1000, 2000, 3000])
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (best is taken)')
+    args = parser.parse_args()
+
+    params = CorpusParams(**{name: getattr(args, name) for name in CorpusParams._fields})
+    source = generate_corpus(params)
+    tree = ast.parse(source)
+    tokens = list(generate_tokens(StringIO(source).readline))
+    sys.stdout.write(f'{"corpus":>8} {"legacy ms":>15} {"current ms":>15}\n')
+    sys.stdout.write(
+        f'{params.lines:>8} '
+        f'{format_time(try_measure(RecursiveVisitor, tree, tokens, args.repeat), 15)} '
+        f'{format_time(try_measure(Visitor, tree, tokens, args.repeat), 15)}\n',
+    )
+
+    sys.stdout.write(f'{"depth":>8} {"legacy ms":>15} {"current ms":>15}\n')
+    depths: List[int] = args.depths
+    for depth in depths:
+        source = make_nested(depth)
+        # parser itself needs deep recursion, visitors are run with default limit
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, depth * 2))
+        try:
+            tree = ast.parse(source)
+        finally:
+            sys.setrecursionlimit(limit)
+        tokens = list(generate_tokens(StringIO(source).readline))
+        sys.stdout.write(
+            f'{depth:>8} '
+            f'{format_time(try_measure(RecursiveVisitor, tree, tokens, args.repeat), 15)} '
+            f'{format_time(try_measure(Visitor, tree, tokens, args.repeat), 15)}\n',
+        )
+
+
+if __name__ == '__main__':
+    main()
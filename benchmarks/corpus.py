@@ -0,0 +1,119 @@
+"""Synthetic corpus generator for benchmarks.
+
+Generated code is valid python with configurable amount of multiline constructions.
+Same parameters and seed always give the same code.
+"""
+import random
+from typing import (
+    List,
+    NamedTuple,
+)
+
+INDENT = ' ' * 4
+
+
+class CorpusParams(NamedTuple):
+    """Parameters of generated corpus."""
+
+    lines: int = 10000  # approximate number of lines
+    depth: int = 3  # nesting depth of multiline calls
+    args: int = 3  # number of arguments in calls and function definitions
+    chain: int = 5  # number of links in fluent call chains
+    bracket_density: float = 0.3  # share of statements with multiline brackets
+    errors: float = 0.05  # share of multiline constructions with hanging indentation
+    seed: int = 0
+
+
+class CorpusGenerator:
+    """Generate python code by ``CorpusParams``."""
+
+    def __init__(self, params: CorpusParams) -> None:
+        self.params = params
+        self.random = random.Random(params.seed)
+
+    def generate(self) -> str:
+        """Generate corpus code."""
+        result: List[str] = []
+        lines_count = 0
+        i = 0
+        while lines_count < self.params.lines:
+            block = self._function(i) if i % 10 == 0 else self._statement(i, indent='')
+            result.extend(block)
+            lines_count += len(block)
+            i += 1
+        return '\n'.join(result) + '\n'
+
+    def _statement(self, i: int, indent: str) -> List[str]:
+        """Generate single statement (single line or multiline)."""
+        if self.random.random() >= self.params.bracket_density:
+            return [indent + line for line in self._simple(i)]
+
+        kind = self.random.choice((self._call, self._chain, self._literal))
+        lines = kind(i, self.params.depth)
+        lines[0] = f'value_{i} = {lines[0]}'
+        return [indent + line for line in lines]
+
+    def _simple(self, i: int) -> List[str]:
+        """Generate single line statements."""
+        return self.random.choice((
+            [f'value_{i} = compute(item_{i}, key=value_{i - 1}) + {i}'],
+            [f'result = [x * {i} for x in range(value_{i - 1}) if x % 2]'],
+            [f'if value_{i - 1} > {i}:', f'{INDENT}value_{i} = data["{i}"][0]'],
+            [f'for item in items_{i}:', f'{INDENT}total += item.size * {i}'],
+        ))
+
+    def _function(self, i: int) -> List[str]:
+        """Generate function definition with multiline arguments."""
+        lines = [f'def function_{i}(']
+        for n in range(self.params.args):
+            lines.append(f'{INDENT}arg_{n}: int = {n},')
+        lines.append(') -> int:')
+        for n in range(3):
+            lines.extend(self._statement(i * 10 + n, indent=INDENT))
+        lines.append(f'{INDENT}return value_{i}')
+        lines.append('')
+        return lines
+
+    def _call(self, i: int, depth: int) -> List[str]:
+        """Generate multiline call with nested multiline calls."""
+        lines = [f'func_{depth}(']
+        for n in range(self.params.args):
+            if n == self.params.args - 1 and depth > 1:
+                nested = self._call(i, depth - 1)
+                lines.append(f'{INDENT}key_{n}={nested[0]}')
+                lines.extend(INDENT + line for line in nested[1:])
+                lines[-1] += ','
+            else:
+                lines.append(f'{INDENT}key_{n}=item_{n},')
+        return self._close(lines, ')')
+
+    def _chain(self, i: int, depth: int) -> List[str]:
+        """Generate fluent call chain with multiline calls."""
+        lines = [f'queryset_{i}.filter(']
+        for n in range(self.params.chain):
+            if n:
+                lines.append(f').method_{n}(')
+            lines.extend(f'{INDENT}field_{k}=value_{k},' for k in range(self.params.args))
+        return self._close(lines, ')')
+
+    def _literal(self, i: int, depth: int) -> List[str]:
+        """Generate multiline list of dicts."""
+        lines = ['[']
+        for n in range(self.params.args):
+            lines.append(INDENT + '{')
+            lines.extend(f'{INDENT * 2}"key_{k}": ({k}, [{n}]),' for k in range(self.params.args))
+            lines.append(INDENT + '},')
+        return self._close(lines, ']')
+
+    def _close(self, lines: List[str], bracket: str) -> List[str]:
+        """Close multiline construction (sometimes with hanging indentation)."""
+        if self.random.random() < self.params.errors:
+            lines[-1] += bracket
+        else:
+            lines.append(bracket)
+        return lines
+
+
+def generate_corpus(params: CorpusParams) -> str:
+    """Generate corpus code."""
+    return CorpusGenerator(params).generate()
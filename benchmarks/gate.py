@@ -0,0 +1,139 @@
+"""Performance regression gate for ``Plugin.run``.
+
+Runs plugin on fixed synthetic corpus and compares results with stored baseline.
+Throughput is normalized by calibration loop, so results are comparable between
+machines. Exits with non-zero code if throughput drops or peak memory grows more
+than allowed tolerance.
+
+Usage::
+
+    python -m benchmarks.gate               # compare with baseline
+    python -m benchmarks.gate --update      # store new baseline
+"""
+import argparse
+import ast
+import json
+import sys
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+from tokenize import generate_tokens
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+from .corpus import (
+    CorpusParams,
+    generate_corpus,
+)
+from .run import (
+    measure,
+    run_plugin,
+)
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+CORPUS_PARAMS = CorpusParams(lines=20000, depth=4, args=4, chain=5, bracket_density=0.4)
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Return best time of reference pure python workload in seconds."""
+    data = list(range(200000))
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        buckets: Dict[int, int] = {}
+        for i in data:
+            if isinstance(i, int) and i % 3:
+                buckets[i & 1023] = buckets.get(i & 1023, 0) + i
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def collect(repeat: int) -> Dict[str, Any]:
+    """Collect normalized throughput and peak memory of plugin on fixed corpus."""
+    source = generate_corpus(CORPUS_PARAMS)
+    tree = ast.parse(source)
+    tokens = list(generate_tokens(StringIO(source).readline))
+    lines = source.count('\n')
+
+    calibration = calibrate(repeat)
+    seconds = measure(run_plugin, tree, tokens, repeat)
+
+    tracemalloc.start()
+    try:
+        run_plugin(tree, tokens)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'params': CORPUS_PARAMS._asdict(),
+        'calibration_seconds': calibration,
+        'seconds': seconds,
+        # lines checked in time of single calibration run
+        'normalized_throughput': lines / seconds * calibration,
+        'peak_memory': peak_memory,
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float,
+    memory_tolerance: float,
+) -> List[str]:
+    """Compare results with baseline and return list of found regressions."""
+    if current['params'] != baseline['params']:
+        return ['Corpus params differ from baseline, update baseline with --update']
+
+    regressions = []
+    min_throughput = baseline['normalized_throughput'] * (1 - tolerance)
+    if current['normalized_throughput'] < min_throughput:
+        regressions.append(
+            f'Throughput dropped: {current["normalized_throughput"]:.1f} '
+            f'< {min_throughput:.1f} (baseline {baseline["normalized_throughput"]:.1f})',
+        )
+    max_memory = baseline['peak_memory'] * (1 + memory_tolerance)
+    if current['peak_memory'] > max_memory:
+        regressions.append(
+            f'Peak memory grew: {current["peak_memory"]} '
+            f'> {max_memory:.0f} bytes (baseline {baseline["peak_memory"]})',
+        )
+    return regressions
+
+
+def main() -> None:
+    """Run regression gate."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed throughput drop')
+    parser.add_argument(
+        '--memory-tolerance',
+        type=float,
+        default=0.1,
+        help='allowed peak memory growth',
+    )
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (best is taken)')
+    parser.add_argument('--update', action='store_true', help='store results as new baseline')
+    args = parser.parse_args()
+
+    current = collect(args.repeat)
+    if args.update:
+        args.baseline.write_text(json.dumps(current, indent=2) + '\n')
+        sys.stdout.write(f'Baseline stored to {args.baseline}\n')
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(current, baseline, args.tolerance, args.memory_tolerance)
+    sys.stdout.write(json.dumps(current, indent=2) + '\n')
+    if regressions:
+        sys.stderr.write('\n'.join(regressions) + '\n')
+        sys.exit(1)
+    sys.stdout.write('No performance regressions found\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark suite for plugin engines on synthetic corpus.
+
+Times full ``Plugin.run``, ``Visitor`` and ``IndentValidator`` separately and prints
+results as JSON.
+
+Usage::
+
+    python -m benchmarks.run --lines 20000 --depth 4 --chain 10 --output results.json
+"""
+import argparse
+import ast
+import json
+import platform
+import sys
+import time
+from io import StringIO
+from tokenize import (
+    TokenInfo,
+    generate_tokens,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+)
+
+from flake8_hangover.__version__ import __version__
+from flake8_hangover.plugin import Plugin
+from flake8_hangover.validator import IndentValidator
+from flake8_hangover.visitor import Visitor
+
+from .corpus import (
+    CorpusParams,
+    generate_corpus,
+)
+
+
+def run_plugin(tree: ast.AST, tokens: List[TokenInfo]) -> None:
+    """Run full plugin."""
+    for _ in Plugin(tree=tree, file_tokens=tokens).run():
+        pass
+
+
+def run_visitor(tree: ast.AST, tokens: List[TokenInfo]) -> None:
+    """Run only AST visitor."""
+    Visitor(tokens=tokens).visit(tree)
+
+
+def run_validator(tree: ast.AST, tokens: List[TokenInfo]) -> None:
+    """Run only indent validator."""
+    IndentValidator(tokens=tokens).validate()
+
+
+ENGINES: Dict[str, Callable[[ast.AST, List[TokenInfo]], None]] = {
+    'plugin': run_plugin,
+    'visitor': run_visitor,
+    'validator': run_validator,
+}
+
+
+def measure(
+    engine: Callable[[ast.AST, List[TokenInfo]], None],
+    tree: ast.AST,
+    tokens: List[TokenInfo],
+    repeat: int,
+) -> float:
+    """Return best time of ``repeat`` runs in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine(tree, tokens)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(params: CorpusParams, repeat: int = 5) -> Dict[str, Any]:
+    """Run all benchmarks on corpus and return results."""
+    source = generate_corpus(params)
+    tree = ast.parse(source)
+    tokens = list(generate_tokens(StringIO(source).readline))
+    lines = source.count('\n')
+
+    results = {}
+    for name, engine in ENGINES.items():
+        seconds = measure(engine, tree, tokens, repeat)
+        results[name] = {
+            'seconds': seconds,
+            'lines_per_sec': lines / seconds,
+            'tokens_per_sec': len(tokens) / seconds,
+        }
+
+    return {
+        'version': __version__,
+        'python': platform.python_version(),
+        'params': params._asdict(),
+        'lines': lines,
+        'tokens': len(tokens),
+        'results': results,
+    }
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add arguments for all corpus params."""
+    for name, default in CorpusParams._field_defaults.items():
+        parser.add_argument(
+            f'--{name.replace("_", "-")}',
+            type=type(default),
+            default=default,
+            help=f'corpus {name.replace("_", " ")} (default: {default})',
+        )
+
+
+def main() -> None:
+    """Run benchmarks and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    add_corpus_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (best is taken)')
+    parser.add_argument('--output', help='write results to file instead of stdout')
+    args = parser.parse_args()
+
+    params = CorpusParams(**{name: getattr(args, name) for name in CorpusParams._fields})
+    report = json.dumps(run_benchmarks(params, repeat=args.repeat), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        sys.stdout.write(report + '\n')
+
+
+if __name__ == '__main__':
+    main()
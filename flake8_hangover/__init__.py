@@ -1 +1,21 @@
 from .plugin import Plugin
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .api import (  # noqa: F401
+        Checker,
+        Diagnostic,
+        Source,
+        check_many,
+        check_source,
+    )
+
+# API is imported on first use only, as package is imported by flake8 in every process
+API_NAMES = ('Checker', 'Diagnostic', 'Source', 'check_many', 'check_source')
+
+
+def __getattr__(name: str) -> object:
+    if name in API_NAMES:
+        from . import api
+        return getattr(api, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
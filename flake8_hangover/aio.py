@@ -0,0 +1,274 @@
+"""Asyncio API to check sources without blocking event loop.
+
+Example::
+
+    from flake8_hangover.aio import AsyncChecker
+
+    async with AsyncChecker(max_concurrency=4) as checker:
+        diagnostics = await checker.check(text, filename='module.py')
+        async for index, diagnostics in checker.check_many(texts):
+            ...
+        async for diagnostic in checker.iter_check(text):
+            ...
+
+Checks are run in executor (own thread pool by default). Every thread reuses its own
+engines, and shared plugin state (memo, cache and stats) is thread-safe, so checks of
+several threads run at once (though they share GIL). Process pool can be passed to use
+several CPUs, plugin options should be set in its workers by ``initializer`` then
+(unless they are forked from process with parsed options).
+"""
+import ast
+import asyncio
+import threading
+import tokenize
+from concurrent.futures import (
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+)
+from contextlib import suppress
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .api import (
+    Checker,
+    Diagnostic,
+    Source,
+    SourceText,
+)
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+IndexedResult = Tuple[int, List[Diagnostic]]  # index of source and its errors
+
+# checkers of worker threads (engines of checker can't be shared by threads)
+_local = threading.local()
+
+
+def get_checker() -> Checker:
+    """Get checker of current thread (it is reused by all checks of thread)."""
+    checker: Optional[Checker] = getattr(_local, 'checker', None)
+    if checker is None:
+        checker = _local.checker = Checker()
+    return checker
+
+
+def check_in_worker(
+    source: SourceText,
+    tree: Optional[ast.AST] = None,
+    tokens: Optional[List[tokenize.TokenInfo]] = None,
+    filename: str = 'stdin',
+) -> List[Diagnostic]:
+    """Check source in executor worker."""
+    return get_checker().check(source, tree=tree, tokens=tokens, filename=filename)
+
+
+def stream_in_worker(
+    put: Callable[[Optional[Diagnostic]], None],
+    stopped: threading.Event,
+    source: SourceText,
+    tree: Optional[ast.AST] = None,
+    tokens: Optional[List[tokenize.TokenInfo]] = None,
+    filename: str = 'stdin',
+) -> None:
+    """Check source in worker thread and put errors as soon as they are found.
+
+    ``None`` is put after the last error. Check is stopped if ``stopped`` is set.
+    """
+    try:
+        for diagnostic in get_checker().iter_check(
+            source,
+            tree=tree,
+            tokens=tokens,
+            filename=filename,
+        ):
+            if stopped.is_set():
+                return
+            put(diagnostic)
+    finally:
+        put(None)
+
+
+class AsyncChecker:
+    """Checker of sources which offloads checks to executor.
+
+    No more than ``max_concurrency`` checks are submitted to executor at once, other ones
+    wait for free slot (so executor queue doesn't grow with number of requests). Cancelled
+    check releases its slot when executor really stops it: check which is already
+    running can't be interrupted, so its slot is released when it is finished.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be positive')
+        self.max_concurrency = max_concurrency
+        self._executor = executor
+        self._own_executor = executor is None
+        # semaphore is created in event loop, as it can't be shared by several loops
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def check(
+        self,
+        source: SourceText,
+        *,
+        tree: Optional[ast.AST] = None,
+        tokens: Optional[List[tokenize.TokenInfo]] = None,
+        filename: str = 'stdin',
+    ) -> List[Diagnostic]:
+        """Check source and return errors sorted by position (see ``api.check_source``)."""
+        future = await self._submit(check_in_worker, source, tree, tokens, filename)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()  # not started check is not run at all
+            raise
+
+    async def iter_check(
+        self,
+        source: SourceText,
+        *,
+        tree: Optional[ast.AST] = None,
+        tokens: Optional[List[tokenize.TokenInfo]] = None,
+        filename: str = 'stdin',
+    ) -> AsyncIterator[Diagnostic]:
+        """Check source and iterate over its errors as soon as they are found.
+
+        Errors are streamed from thread pool by top-level statements (see
+        ``api.Checker.iter_check``). Other executors can't stream them, so errors are
+        yielded after whole source is checked there. Check is stopped when iteration is
+        stopped.
+        """
+        if not isinstance(self._get_executor(), ThreadPoolExecutor):
+            for diagnostic in await self.check(
+                source,
+                tree=tree,
+                tokens=tokens,
+                filename=filename,
+            ):
+                yield diagnostic
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: 'asyncio.Queue[Optional[Diagnostic]]' = asyncio.Queue()
+        stopped = threading.Event()
+
+        def put(diagnostic: Optional[Diagnostic]) -> None:
+            with suppress(RuntimeError):  # loop is already closed
+                loop.call_soon_threadsafe(queue.put_nowait, diagnostic)
+
+        future = await self._submit(
+            stream_in_worker,
+            put,
+            stopped,
+            source,
+            tree,
+            tokens,
+            filename,
+        )
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield item
+            await asyncio.wrap_future(future)  # error of check is raised
+        finally:
+            stopped.set()
+            future.cancel()  # not started check is not run at all
+
+    async def check_many(
+        self,
+        sources: Iterable[Union[SourceText, Source]],
+    ) -> AsyncIterator[IndexedResult]:
+        """Check sources and iterate over their indexes and errors in order of completion.
+
+        Sources are taken from iterable only when there is free slot, so sources can be
+        generated lazily. Checks which are not finished are cancelled when iteration is
+        stopped.
+        """
+        pending: Set['asyncio.Task[IndexedResult]'] = set()
+
+        async def check_indexed(index: int, source: Union[SourceText, Source]) -> IndexedResult:
+            if isinstance(source, Source):
+                return index, await self.check(
+                    source.source,
+                    tree=source.tree,
+                    tokens=source.tokens,
+                    filename=source.filename,
+                )
+            return index, await self.check(source)
+
+        items = enumerate(sources)
+        try:
+            while True:
+                for index, source in items:
+                    pending.add(asyncio.ensure_future(check_indexed(index, source)))
+                    if len(pending) >= self.max_concurrency:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> 'Future[Any]':
+        """Submit function to executor when there is free slot.
+
+        Slot is released when function is finished (or cancelled before it is started).
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore
+        if semaphore is None or self._loop is not loop:
+            self._loop = loop
+            semaphore = self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await semaphore.acquire()
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        def release(_: 'Future[Any]') -> None:
+            with suppress(RuntimeError):  # loop is already closed
+                loop.call_soon_threadsafe(semaphore.release)
+
+        future.add_done_callback(release)
+        return future
+
+    def _get_executor(self) -> Executor:
+        """Get executor (own thread pool is created on first use)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self.max_concurrency,
+                thread_name_prefix='flake8-hangover',
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down own executor (passed executor is left to its owner)."""
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self) -> 'AsyncChecker':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,184 @@
+"""Programmatic API to check sources in process without flake8.
+
+Example::
+
+    from flake8_hangover import check_source
+
+    for diagnostic in check_source(text, filename='module.py'):
+        print(diagnostic.line, diagnostic.column, diagnostic.code, diagnostic.message)
+
+Checks use plugin options (all codes are checked by default, see ``Plugin.parse_options``).
+"""
+import ast
+import io
+import tokenize
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .plugin import Plugin
+from .rules import get_rules
+from .scanner import (
+    SCANNER_SUPPORTED,
+    SourceIndex,
+)
+from .validator import IndentValidator
+from .visitor import Visitor
+
+SourceText = Union[str, bytes]
+
+
+class Diagnostic(NamedTuple):
+    """Error found in source (``column`` starts from 1, as in flake8 output)."""
+
+    line: int
+    column: int
+    code: str
+    message: str
+
+    def __str__(self) -> str:
+        return f'{self.line}:{self.column}: {self.code} {self.message}'
+
+
+class Source(NamedTuple):
+    """Source with its tree and tokens (they are built from source if missing)."""
+
+    source: SourceText
+    tree: Optional[ast.AST] = None
+    tokens: Optional[List[tokenize.TokenInfo]] = None
+    filename: str = 'stdin'
+
+
+class Checker:
+    """Checker of sources which reuses visitor and validator for all of them.
+
+    Engines (with their rules and handlers tables) are created for the first source only
+    and reset for next ones. Checker is not thread-safe, every thread should use its own.
+    """
+
+    def __init__(self) -> None:
+        self._visitor: Optional[Visitor] = None
+        self._validator: Optional[IndentValidator] = None
+
+    def check(
+        self,
+        source: SourceText,
+        *,
+        tree: Optional[ast.AST] = None,
+        tokens: Optional[List[tokenize.TokenInfo]] = None,
+        filename: str = 'stdin',
+    ) -> List[Diagnostic]:
+        """Check source and return errors sorted by position.
+
+        Source is parsed and tokenized only if ``tree`` and ``tokens`` are not passed.
+        If only rules of brackets are selected, source is not tokenized at all (brackets
+        are found by ``scanner.SourceIndex``).
+        Syntax errors are returned as ``E999`` errors and undecodable sources as ``E902``
+        ones (like flake8 does).
+        """
+        return sorted(self.iter_check(source, tree=tree, tokens=tokens, filename=filename))
+
+    def iter_check(
+        self,
+        source: SourceText,
+        *,
+        tree: Optional[ast.AST] = None,
+        tokens: Optional[List[tokenize.TokenInfo]] = None,
+        filename: str = 'stdin',
+    ) -> Iterator[Diagnostic]:
+        """Check source and yield errors as soon as they are found (see ``check``).
+
+        Errors are yielded by top-level statements in order of positions (unless plugin
+        collects all of them, e.g. for cache or stats).
+        """
+        try:
+            if isinstance(source, bytes):
+                encoding, _ = tokenize.detect_encoding(io.BytesIO(source).readline)
+                source = source.decode(encoding)
+        except (SyntaxError, UnicodeError) as e:
+            yield Diagnostic(0, 1, 'E902', f'{type(e).__name__}: {e}')
+            return
+
+        lines = io.StringIO(source, newline=None).readlines()
+        try:
+            if tree is None:
+                tree = ast.parse(''.join(lines), filename=filename)
+            if tokens is None and self._can_scan():
+                yield from self._check_scanned(''.join(lines))
+                return
+            if tokens is None:
+                tokens = list(tokenize.generate_tokens(iter(lines).__next__))
+        except (SyntaxError, tokenize.TokenError) as e:
+            row, col = (e.lineno or 1, e.offset or 0) if isinstance(e, SyntaxError) else e.args[1]
+            yield Diagnostic(row, col, 'E999', f'{type(e).__name__}: {e.args[0]}')
+            return
+
+        plugin = Plugin(tree=tree, file_tokens=tokens, lines=lines, filename=filename)
+        # engines are taken while source is checked, so they are not reset by other checks
+        plugin.visitor, self._visitor = self._visitor, None
+        plugin.validator, self._validator = self._validator, None
+        yield from self._make_diagnostics(result[:3] for result in plugin.run())
+        self._visitor = plugin.visitor
+        self._validator = plugin.validator
+
+    def _can_scan(self) -> bool:
+        """Check that only rules of brackets are used, so source may be not tokenized."""
+        rules = get_rules(Plugin.codes)
+        return SCANNER_SUPPORTED and not any(rule.node_types for rule in rules)
+
+    def _check_scanned(self, source: str) -> Iterator[Diagnostic]:
+        """Check brackets found in raw source by scanner (without tokenizing it).
+
+        Plugin cache, memo and stats are not used, as checks of brackets are cheap.
+        ``# noqa`` comments (if they are used) are found by scanner as well.
+        """
+        index = SourceIndex(source, noqa=Plugin.noqa)
+        validator, self._validator = self._validator, None
+        if validator is None:
+            validator = IndentValidator([], noqa=index.noqa, index=index, codes=Plugin.codes)
+        else:
+            validator.reset([], noqa=index.noqa, index=index)
+        yield from self._make_diagnostics(validator.iter_errors())
+        self._validator = validator
+
+    def _make_diagnostics(self, results: Iterable[Tuple[int, int, str]]) -> Iterator[Diagnostic]:
+        """Make diagnostics from plugin results."""
+        for lineno, col_offset, msg in results:
+            code, _, message = msg.partition(' ')
+            yield Diagnostic(lineno, col_offset + 1, code, message)
+
+
+def check_source(
+    source: SourceText,
+    *,
+    tree: Optional[ast.AST] = None,
+    tokens: Optional[List[tokenize.TokenInfo]] = None,
+    filename: str = 'stdin',
+) -> List[Diagnostic]:
+    """Check source (its ``tree`` and ``tokens`` are reused if they are passed)."""
+    return Checker().check(source, tree=tree, tokens=tokens, filename=filename)
+
+
+def check_many(sources: Iterable[Union[SourceText, Source]]) -> Iterator[List[Diagnostic]]:
+    """Check sources (with their trees and tokens if they are passed as ``Source``).
+
+    Errors of every source are returned in order of sources. Visitor and validator are
+    reused for all sources.
+    """
+    checker = Checker()
+    for source in sources:
+        if isinstance(source, Source):
+            yield checker.check(
+                source.source,
+                tree=source.tree,
+                tokens=source.tokens,
+                filename=source.filename,
+            )
+        else:
+            yield checker.check(source)
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import threading
+from contextlib import suppress
+from typing import (
+    List,
+    Optional,
+    Tuple,
+)
+
+from .__version__ import __version__
+
+Result = Tuple[int, int, str]
+
+
+class ResultCache:
+    """On-disk cache of plugin results keyed by file content.
+
+    Every entry is stored in separate file, so cache can be used by several processes
+    at once: entries are written atomically and missing or broken entries are treated
+    as cache misses. Least recently used entries are evicted when number of entries
+    exceeds ``max_entries``.
+    """
+
+    def __init__(self, directory: str, max_entries: int) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries: Optional[int] = None  # approximate number of entries
+
+    def make_key(self, lines: List[str], options: str = '') -> str:
+        """Make cache key for file content and active options."""
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f'{__version__}\0{options}\0'.encode())
+        h.update(''.join(lines).encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[List[Result]]:
+        """Get cached results (``None`` if there are no results for key)."""
+        path = self._get_path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                results = [(int(line), int(col), str(msg)) for line, col, msg in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            return None
+
+        with suppress(OSError):
+            os.utime(path)  # mark entry as recently used
+        return results
+
+    def set(self, key: str, results: List[Result]) -> None:
+        """Store results for key."""
+        path = self._get_path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        if self._entries is None:
+            self._entries = self._count_entries()
+        else:
+            self._entries += 1
+        if self._entries > self.max_entries:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries to fit in cache size (with some reserve)."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith('.json'):
+                        continue
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue  # removed by another process
+        except OSError:
+            return
+
+        keep = self.max_entries * 9 // 10
+        entries.sort(reverse=True)
+        for _, path in entries[keep:]:
+            with suppress(OSError):
+                os.remove(path)
+        self._entries = min(len(entries), keep)
+
+    def _count_entries(self) -> int:
+        """Count entries in cache directory."""
+        try:
+            with os.scandir(self.directory) as it:
+                return sum(1 for entry in it if entry.name.endswith('.json'))
+        except OSError:
+            return 0
+
+    def _get_path(self, key: str) -> str:
+        """Get path of entry file."""
+        return os.path.join(self.directory, f'{key}.json')
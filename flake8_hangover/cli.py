@@ -0,0 +1,265 @@
+"""Standalone command line interface without flake8 machinery.
+
+Usage::
+
+    python -m flake8_hangover --jobs 8 src tests
+"""
+import argparse
+import configparser
+import fnmatch
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Collection,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .__version__ import __version__
+from .api import Checker
+from .plugin import Plugin
+
+DEFAULT_EXCLUDE = '.svn,CVS,.bzr,.hg,.git,__pycache__,.tox,.nox,.eggs,*.egg,venv,.venv'
+# files searched for flake8 config (in the same order as flake8 does)
+CONFIG_FILES = ('setup.cfg', 'tox.ini', '.flake8')
+# options of codes selection (they can be set in flake8 config as well)
+SELECTION_OPTIONS = ('select', 'ignore', 'extend_select', 'extend_ignore')
+CODES_SEPARATOR_REGEX = re.compile(r'[,\s]+')
+
+FileResults = Tuple[str, List[str]]
+Error = Tuple[int, int, str]  # line, column (starting from 1), message
+
+
+class OptionsAdapter:
+    """Adapter to add plugin options (in flake8 style) to ``argparse`` parser."""
+
+    def __init__(self, parser: argparse.ArgumentParser) -> None:
+        self.parser = parser
+        self.config_options: List[str] = []  # destinations of options parsed from config
+
+    def add_option(self, *args: Any, parse_from_config: bool = False, **kwargs: Any) -> None:
+        """Add option (other flake8 specific arguments are ignored)."""
+        action = self.parser.add_argument(*args, **kwargs)
+        if parse_from_config:
+            self.config_options.append(action.dest)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Get parser for command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog='python -m flake8_hangover',
+        description='Check files with flake8-hangover rules only (without flake8).',
+    )
+    parser.add_argument('paths', nargs='*', default=['.'], help='files and directories to check')
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='number of processes to check files (Default: number of CPUs)',
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=None,
+        help='number of files sent to process at once (Default: calculated by files count)',
+    )
+    parser.add_argument(
+        '--exclude',
+        default=DEFAULT_EXCLUDE,
+        help='comma-separated list of files and directories patterns to exclude '
+             '(Default: %(default)s)',
+    )
+    parser.add_argument('--version', action='version', version=__version__)
+    set_config_defaults(parser, add_plugin_arguments(parser))
+    return parser
+
+
+def add_plugin_arguments(parser: argparse.ArgumentParser) -> List[str]:
+    """Add plugin options and flake8 options used by plugin to parser.
+
+    Destinations of options which can be set in flake8 config are returned.
+    """
+    adapter = OptionsAdapter(parser)
+    Plugin.add_options(adapter)
+    parser.add_argument(
+        '--disable-noqa',
+        action='store_true',
+        help='report errors on lines with "# noqa" comments as well (as flake8 does)',
+    )
+    parser.add_argument(
+        '--select',
+        type=parse_codes,
+        default=None,
+        help='comma-separated list of codes (or their prefixes) to check (Default: all)',
+    )
+    parser.add_argument(
+        '--ignore',
+        type=parse_codes,
+        default=None,
+        help='comma-separated list of codes (or their prefixes) to skip',
+    )
+    parser.add_argument(
+        '--extend-select',
+        type=parse_codes,
+        default=None,
+        help='comma-separated list of codes to check in addition to selected ones',
+    )
+    parser.add_argument(
+        '--extend-ignore',
+        type=parse_codes,
+        default=None,
+        help='comma-separated list of codes to skip in addition to ignored ones',
+    )
+    return [*adapter.config_options, *SELECTION_OPTIONS]
+
+
+def parse_codes(value: str) -> List[str]:
+    """Parse list of codes separated by commas or whitespaces (as in flake8 config)."""
+    return [code for code in CODES_SEPARATOR_REGEX.split(value) if code]
+
+
+def find_config(directory: str) -> Optional[configparser.RawConfigParser]:
+    """Find flake8 config in directory or its parents (up to home directory).
+
+    The first of config files which has flake8 sections is used (as flake8 does).
+    """
+    home = os.path.expanduser('~')
+    directory = os.path.abspath(directory)
+    while True:
+        for name in CONFIG_FILES:
+            config = configparser.RawConfigParser()
+            try:
+                config.read(os.path.join(directory, name), encoding='utf-8')
+            except (UnicodeDecodeError, configparser.ParsingError):
+                continue
+            if config.has_section('flake8') or config.has_section('flake8:local-plugins'):
+                return config
+
+        parent = os.path.dirname(directory)
+        if parent in (directory, home):
+            return None
+        directory = parent
+
+
+def set_config_defaults(
+    parser: argparse.ArgumentParser,
+    options: Collection[str],
+    directory: str = '.',
+) -> None:
+    """Use values of ``options`` from ``[flake8]`` section of config as defaults of parser.
+
+    Values are parsed as command line arguments, so arguments override them.
+    """
+    config = find_config(directory)
+    if config is None or not config.has_section('flake8'):
+        return
+    defaults = {}
+    for name, value in config.items('flake8'):
+        dest = name.replace('-', '_')
+        if dest in options:
+            defaults[dest] = value
+    parser.set_defaults(**defaults)
+
+
+def find_files(paths: Sequence[str], exclude: Sequence[str]) -> Iterator[str]:
+    """Find python files in paths."""
+    def is_excluded(path: str) -> bool:
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(path, p) for p in exclude)
+
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not is_excluded(os.path.join(root, d)))
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                if name.endswith('.py') and not is_excluded(file_path):
+                    yield file_path
+
+
+def check_file(path: str, checker: Optional[Checker] = None) -> List[str]:
+    """Check file and return errors in flake8 format."""
+    errors = get_errors(path, checker=checker)
+    return [f'{path}:{row}:{col}: {message}' for row, col, message in errors]
+
+
+def get_errors(
+    path: str,
+    source: Optional[str] = None,
+    checker: Optional[Checker] = None,
+) -> List[Error]:
+    """Check file (or its ``source`` if it is given) and return sorted errors.
+
+    ``checker`` is reused for several files if it is passed.
+    """
+    content: Union[str, bytes]
+    if source is None:
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            return [(0, 1, f'E902 {type(e).__name__}: {e}')]
+    else:
+        content = source
+
+    diagnostics = (checker or Checker()).check(content, filename=path)
+    return [(d.line, d.column, f'{d.code} {d.message}') for d in diagnostics]
+
+
+def check_files(paths: List[str]) -> List[FileResults]:
+    """Check chunk of files."""
+    checker = Checker()
+    return [(path, check_file(path, checker)) for path in paths]
+
+
+def init_worker(options: argparse.Namespace) -> None:
+    """Initialize plugin options in worker process (not forked from main one)."""
+    Plugin.parse_options(options)
+
+
+def run(options: argparse.Namespace) -> Iterator[FileResults]:
+    """Check files in parallel and return results in files order."""
+    exclude = [p.strip() for p in options.exclude.split(',') if p.strip()]
+    files = list(find_files(options.paths, exclude))
+    jobs = max(min(options.jobs, len(files)), 1)
+    chunk_size = options.chunk_size or max(min(len(files) // (jobs * 4), 64), 1)
+    chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+
+    if jobs == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            yield from check_files(chunk)
+        return
+
+    # forked processes already have plugin options, other ones must parse them
+    if 'fork' in multiprocessing.get_all_start_methods():
+        executor = ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context('fork'))
+    else:
+        executor = ProcessPoolExecutor(jobs, initializer=init_worker, initargs=(options,))
+
+    with executor:
+        for results in executor.map(check_files, chunks):
+            yield from results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run command line interface and return exit code."""
+    options = get_parser().parse_args(argv)
+    Plugin.parse_options(options)
+
+    found_errors = False
+    for _, errors in run(options):
+        for error in errors:
+            found_errors = True
+            sys.stdout.write(error + '\n')
+    return 1 if found_errors else 0
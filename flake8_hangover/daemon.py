@@ -0,0 +1,231 @@
+"""Long-running daemon which checks files sent over Unix socket.
+
+Daemon keeps plugin warm (modules are imported once and results of unchanged statements
+are memoized), so editors and pre-commit hooks don't pay for interpreter start and
+imports on every check. Protocol is JSON lines: every request line
+``{"path": ..., "source": ...}`` (``source`` is optional, file is read by daemon without
+it) is answered with line ``{"path": ..., "errors": [[line, column, message], ...]}``
+(or ``{"error": ...}`` for invalid request). Any number of requests can be sent over
+one connection, and several clients are served at once.
+
+Usage::
+
+    python -m flake8_hangover.daemon serve --socket /tmp/hangover.sock
+    python -m flake8_hangover.daemon check --socket /tmp/hangover.sock src tests
+    python -m flake8_hangover.daemon check --socket /tmp/hangover.sock - < module.py
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from contextlib import suppress
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+)
+
+from .api import Checker
+from .cli import (
+    DEFAULT_EXCLUDE,
+    add_plugin_arguments,
+    find_files,
+    get_errors,
+    set_config_defaults,
+)
+from .plugin import Plugin
+
+DEFAULT_MEMO_SIZE = 100000
+STDIN_PATH = '-'
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Handler of client connection (every request line is answered with line)."""
+
+    server: 'DaemonServer'
+
+    def handle(self) -> None:
+        """Handle requests until client closes connection."""
+        for line in self.rfile:
+            response = self.server.process(line)
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """Server which checks files in warm process.
+
+    Every client is served in separate thread, but checks are run one at a time, as
+    plugin options, memo and stats are shared (and checks are CPU bound anyway).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str) -> None:
+        super().__init__(socket_path, RequestHandler)
+        self.socket_path = socket_path
+        self.files_checked = 0
+        self._lock = threading.Lock()
+        self._checker = Checker()
+
+    def process(self, line: bytes) -> Dict[str, Any]:
+        """Process request line and return response."""
+        try:
+            request = json.loads(line)
+            path = request['path']
+            source = request.get('source')
+            if not isinstance(path, str) or not isinstance(source, (str, type(None))):
+                raise TypeError('path and source must be strings')
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return {'error': f'Invalid request: {type(e).__name__}: {e}'}
+
+        with self._lock:
+            errors = get_errors(path, source, self._checker)
+            self.files_checked += 1
+        return {'path': path, 'errors': errors}
+
+    def server_close(self) -> None:
+        """Close server and remove its socket."""
+        super().server_close()
+        with suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+
+
+def is_running(socket_path: str) -> bool:
+    """Check that daemon is listening on socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def create_server(socket_path: str) -> DaemonServer:
+    """Create server on socket (socket left by stopped daemon is removed)."""
+    if os.path.exists(socket_path):
+        if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            raise FileExistsError(f'File {socket_path} is not a socket')
+        if is_running(socket_path):
+            raise FileExistsError(f'Daemon is already running on {socket_path}')
+        os.unlink(socket_path)
+    return DaemonServer(socket_path)
+
+
+def send_requests(
+    socket_path: str,
+    requests: Iterable[Dict[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    """Send requests to daemon and return its responses (in order of requests)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        with sock.makefile('rwb') as f:
+            for request in requests:
+                f.write(json.dumps(request).encode() + b'\n')
+                f.flush()
+                response = f.readline()
+                if not response:
+                    raise ConnectionError('Daemon closed connection')
+                yield json.loads(response)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Get parser for command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog='python -m flake8_hangover.daemon',
+        description='Check files with flake8-hangover rules in long-running daemon.',
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='run daemon')
+    serve.add_argument('--socket', required=True, help='path of Unix socket to listen')
+    config_options = add_plugin_arguments(serve)
+    serve.set_defaults(hangover_memo_size=DEFAULT_MEMO_SIZE)
+    set_config_defaults(serve, config_options)
+
+    check = commands.add_parser('check', help='check files with running daemon')
+    check.add_argument('--socket', required=True, help='path of Unix socket of daemon')
+    check.add_argument(
+        'paths',
+        nargs='*',
+        default=['.'],
+        help=f'files and directories to check ("{STDIN_PATH}" for stdin)',
+    )
+    check.add_argument(
+        '--stdin-filename',
+        default='stdin',
+        help='name of file read from stdin (Default: %(default)s)',
+    )
+    check.add_argument(
+        '--exclude',
+        default=DEFAULT_EXCLUDE,
+        help='comma-separated list of files and directories patterns to exclude '
+             '(Default: %(default)s)',
+    )
+    return parser
+
+
+def serve(options: argparse.Namespace) -> int:
+    """Run daemon until it is interrupted."""
+    Plugin.parse_options(options)
+    try:
+        server = create_server(options.socket)
+    except OSError as e:
+        sys.stderr.write(f'{e}\n')
+        return 2
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    with server, suppress(KeyboardInterrupt):
+        server.serve_forever()
+    return 0
+
+
+def check(options: argparse.Namespace) -> int:
+    """Check files with running daemon and write errors in flake8 format."""
+    exclude = [p.strip() for p in options.exclude.split(',') if p.strip()]
+    paths = []
+    for path in options.paths:
+        if path == STDIN_PATH:
+            paths.append(path)
+        else:
+            paths.extend(find_files([path], exclude))
+
+    def get_requests() -> Iterator[Dict[str, Any]]:
+        for path in paths:
+            if path == STDIN_PATH:
+                yield {'path': options.stdin_filename, 'source': sys.stdin.read()}
+            else:
+                # daemon may be run in another working directory
+                yield {'path': os.path.abspath(path)}
+
+    found_errors = False
+    try:
+        for path, response in zip(paths, send_requests(options.socket, get_requests())):
+            if path == STDIN_PATH:
+                path = options.stdin_filename
+            for row, col, message in response['errors']:
+                found_errors = True
+                sys.stdout.write(f'{path}:{row}:{col}: {message}\n')
+    except OSError as e:
+        sys.stderr.write(f'Daemon is not available on {options.socket}: {e}\n')
+        return 2
+    return 1 if found_errors else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run command line interface and return exit code."""
+    options = get_parser().parse_args(argv)
+    if options.command == 'serve':
+        return serve(options)
+    return check(options)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
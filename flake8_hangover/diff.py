@@ -0,0 +1,103 @@
+import atexit
+import contextlib
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+from typing import (
+    Dict,
+    List,
+    Tuple,
+)
+
+from .ranges import LineRanges
+
+HUNK_REGEX = re.compile(r'^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+# path of file with diff read from stdin (inherited by worker processes)
+STDIN_DIFF_ENV_VAR = 'FLAKE8_HANGOVER_STDIN_DIFF'
+
+
+def normalize_path(path: str) -> str:
+    """Normalize path to compare file names from diff and from flake8."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def read_diff(path: str) -> Dict[str, LineRanges]:
+    """Read changed line ranges from unified diff file or from stdin (``-``).
+
+    Stdin can be read only once and only in main process (spawned workers of flake8
+    parse options again, but their stdin is empty), so diff from stdin is saved to
+    temporary file, and workers read it from there.
+    """
+    if path != '-':
+        with open(path) as f:
+            return parse_unified_diff(f.read())
+
+    if multiprocessing.parent_process() is not None:
+        saved_path = os.environ.get(STDIN_DIFF_ENV_VAR)
+        if not saved_path:
+            raise RuntimeError('Diff from stdin is not read by main process')
+        with open(saved_path) as f:
+            return parse_unified_diff(f.read())
+
+    text = sys.stdin.read()
+    fd, saved_path = tempfile.mkstemp(prefix='flake8-hangover-', suffix='.diff')
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    atexit.register(remove_file, saved_path)
+    os.environ[STDIN_DIFF_ENV_VAR] = saved_path
+    return parse_unified_diff(text)
+
+
+def remove_file(path: str) -> None:
+    """Remove file if it still exists."""
+    with contextlib.suppress(OSError):
+        os.remove(path)
+
+
+def parse_unified_diff(text: str) -> Dict[str, LineRanges]:
+    """Get changed line ranges of new files versions from unified diff.
+
+    Added lines are treated as changed. For removed lines both lines around removed
+    ones are treated as changed.
+    """
+    changes: Dict[str, List[Tuple[int, int]]] = {}
+    ranges: List[Tuple[int, int]] = []
+    lineno = 0
+    old_left = new_left = 0  # lines left in current hunk
+
+    for line in text.splitlines():
+        if old_left > 0 or new_left > 0:
+            if line.startswith('+'):
+                ranges.append((lineno, lineno))
+                lineno += 1
+                new_left -= 1
+            elif line.startswith('-'):
+                ranges.append((max(lineno - 1, 1), lineno))
+                old_left -= 1
+            elif not line.startswith('\\'):  # "\\ No newline at end of file"
+                lineno += 1
+                old_left -= 1
+                new_left -= 1
+            continue
+
+        if line.startswith('+++ '):
+            path = line[4:].split('\t')[0].strip()
+            if path == '/dev/null':
+                ranges = []  # file is removed, nothing to check
+                continue
+            if path.startswith('b/'):
+                path = path[2:]
+            ranges = changes.setdefault(normalize_path(path), [])
+            continue
+
+        match = HUNK_REGEX.match(line)
+        if match:
+            old_count, new_start, new_count = match.groups()
+            old_left = 1 if old_count is None else int(old_count)
+            new_left = 1 if new_count is None else int(new_count)
+            # hunk without new lines (removal in ``-U0`` diff) starts after line before it
+            lineno = int(new_start) + (new_left == 0)
+
+    return {path: LineRanges(file_ranges) for path, file_ranges in changes.items()}
@@ -0,0 +1,48 @@
+from typing import (
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .prescan import NoqaIndex
+
+
+class Engine:
+    """Base class of engines which dispatch nodes or tokens to rules (see ``rules.Rule``).
+
+    Errors added by rules are filtered by selected ``codes`` and ``noqa`` index and kept
+    until flush, so engine yields them by parts (like top-level statements) and doesn't
+    keep errors of whole file.
+    """
+
+    codes: FrozenSet[str]
+    noqa: Optional[NoqaIndex]
+
+    def reset_errors(self) -> None:
+        """Forget errors of previous file."""
+        self._pending: List[Tuple[int, int, str]] = []  # errors added since last flush
+        self._seen: Set[Tuple[int, int]] = set()  # their positions
+
+    def add_error(self, lineno: int, offset: int, error: str) -> None:
+        """Add error (unique only) to errors of part being checked."""
+        code = error.split(' ', 1)[0]
+        if code not in self.codes or self.is_suppressed(lineno, code):
+            return
+        key = (lineno, offset)
+        if key not in self._seen:
+            self._seen.add(key)
+            self._pending.append((lineno, offset, error))
+
+    def flush(self) -> List[Tuple[int, int, str]]:
+        """Get errors added since last flush sorted by position."""
+        errors = self._pending
+        errors.sort()
+        self._pending = []
+        self._seen.clear()
+        return errors
+
+    def is_suppressed(self, lineno: int, code: str) -> bool:
+        """Check that error with code on line is suppressed by ``# noqa`` comment."""
+        return self.noqa is not None and self.noqa.suppresses(lineno, code)
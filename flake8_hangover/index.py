@@ -0,0 +1,193 @@
+from bisect import bisect_left
+from token import (
+    COMMENT,
+    DEDENT,
+    INDENT,
+    NL,
+    OP,
+)
+from tokenize import TokenInfo
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+# bracket string -> (type, is open bracket)
+BRACKETS: Dict[str, Tuple[int, bool]] = {
+    '(': (1, True),
+    ')': (1, False),
+    '[': (2, True),
+    ']': (2, False),
+    '{': (3, True),
+    '}': (3, False),
+}
+
+
+class Parenthese:
+    """Store full info for single parentheses."""
+
+    __slots__ = ('line', 'column', 'type', 'open', 'indent', 'pair')
+
+    def __init__(
+        self,
+        line: int,
+        column: int,
+        type: int,
+        open: bool,
+        indent: int = 0,
+        pair: Optional['Parenthese'] = None,
+    ) -> None:
+        self.line = line
+        self.column = column
+        self.type = type
+        self.open = open
+        self.indent = indent
+        self.pair = pair
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        s = f"{self.line}:{self.column} ({self.indent}) type:{self.type} open:{self.open}"
+        if self.pair:
+            s += f" | pair: <{self.pair.line}:{self.pair.column} ({self.pair.indent})>"
+        return s
+
+
+class BracketPair(NamedTuple):
+    """Open and close brackets placed on different lines."""
+
+    open_line: int
+    close_line: int
+    close_column: int
+
+
+class FileIndex:
+    """Index of file tokens shared by ``Visitor`` and ``IndentValidator``.
+
+    Pairs of multiline brackets and indents of their lines are collected on first use in
+    single forward pass over tokens (or only over slices of tokens from ``windows``, which must
+    not start inside of brackets). Windows are scanned one by one as their pairs are taken
+    (see ``iter_pairs``). Tokens are looked up by position with binary search.
+    """
+
+    def __init__(
+        self,
+        tokens: List[TokenInfo],
+        windows: Optional[List[Tuple[int, int]]] = None,
+    ) -> None:
+        self.tokens = tokens
+        self.windows = windows
+        # indents of lines with multiline brackets (position of first token on line)
+        self.line_indents: Dict[int, int] = {}
+        self.pairs: List[BracketPair] = []  # ordered by close brackets
+        self.tokens_scanned = 0
+        self.brackets_paired = 0
+        self._scanned = False
+        self._windows_scanned = 0
+        self._starts: Optional[List[Tuple[int, int]]] = None
+
+    def scan(self) -> None:
+        """Collect line indents and bracket pairs (only once)."""
+        while self._scan_window():
+            pass
+
+    def iter_pairs(self) -> Iterator[BracketPair]:
+        """Yield bracket pairs ordered by close brackets.
+
+        Next window is scanned only when all pairs of previous ones are taken (pairs which
+        are already collected, e.g. by another engine, are yielded without scanning).
+        """
+        pairs = self.pairs
+        i = 0
+        while True:
+            while i < len(pairs):
+                yield pairs[i]
+                i += 1
+            if not self._scan_window():
+                return
+
+    def _scan_window(self) -> bool:
+        """Scan next window of tokens (``False`` is returned if all of them are scanned)."""
+        if self._scanned:
+            return False
+        if self.windows is None:
+            self._scanned = True
+            self._scan_tokens(self.tokens)
+            return True
+        if self._windows_scanned == len(self.windows):
+            self._scanned = True
+            return False
+        start, end = self.windows[self._windows_scanned]
+        self._windows_scanned += 1
+        self._scan_tokens(self.tokens[start:end])
+        return True
+
+    def _scan_tokens(self, tokens: Sequence[TokenInfo]) -> None:
+        """Collect line indents and bracket pairs from tokens."""
+        # stacks of open brackets lines and indents (index is brackets type)
+        stacks: Tuple[List[Tuple[int, int]], ...] = ([], [], [], [])
+        line_indents = self.line_indents
+        pairs = self.pairs
+        cur_line = 0
+        cur_indent = 0
+        self.tokens_scanned += len(tokens)
+
+        for t in tokens:
+            type = t[0]
+            if type in (INDENT, DEDENT):
+                continue
+
+            line, column = t[2]
+            if line != cur_line:
+                cur_line = line
+                cur_indent = column
+
+            if type != OP or t[1] not in BRACKETS:
+                continue
+
+            bracket_type, open = BRACKETS[t[1]]
+            if open:
+                stacks[bracket_type].append((line, cur_indent))
+                continue
+            if not stacks[bracket_type]:
+                p = Parenthese(line, column, bracket_type, open, cur_indent)
+                raise ValueError(f"Unexpected close parentheses {p}")
+
+            open_line, open_indent = stacks[bracket_type].pop()
+            self.brackets_paired += 1
+            if open_line != line:
+                pairs.append(BracketPair(open_line, line, column))
+                line_indents[open_line] = open_indent
+                line_indents[line] = cur_indent
+
+    def find_token(self, line: int, column: int) -> int:
+        """Find index of first token started at position or after it."""
+        if self._starts is None:
+            self._starts = [t.start for t in self.tokens]
+        return bisect_left(self._starts, (line, column))
+
+    def find_keyword(self, value_line: int, value_column: int) -> Optional[Tuple[int, int]]:
+        """Find position of keyword argument (``name=`` or ``**``) by position of its value.
+
+        ``None`` is returned if there is no such keyword before value.
+        """
+        i = self.find_token(value_line, value_column) - 1
+        tokens = self.tokens
+        # value may be placed in brackets or on the next line
+        while i >= 0 and (tokens[i].type in (NL, COMMENT) or tokens[i].string == '('):
+            i -= 1
+        if i < 0 or tokens[i].type != OP:
+            return None
+        if tokens[i].string == '**':
+            return tokens[i].start
+        if tokens[i].string != '=':
+            return None
+
+        i -= 1
+        while i >= 0 and tokens[i].type in (NL, COMMENT):
+            i -= 1
+        return tokens[i].start if i >= 0 else None
@@ -0,0 +1,114 @@
+import ast
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import (
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+Result = Tuple[int, int, str]
+
+
+class Segment:
+    """Lines of top-level statement (or method of top-level class) with its source."""
+
+    __slots__ = ('start', 'end', 'source')
+
+    def __init__(self, start: int, end: int, source: str) -> None:
+        self.start = start
+        self.end = end
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f'Segment({self.start}, {self.end})'
+
+
+class StatementMemo:
+    """In-memory cache of plugin results of unchanged statements.
+
+    Results of every segment (see ``get_segments``) are keyed by its normalized source
+    and stored with line numbers relative to its first line, so they are reused when
+    statement is moved by edits above it. Least recently used entries are evicted when
+    number of entries exceeds ``max_entries``. Memo can be used by several threads.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple[str, str], List[Result]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, options: str, segment: Segment) -> Optional[List[Result]]:
+        """Get results of segment shifted to its lines (``None`` if they are missing)."""
+        key = (options, segment.source)
+        with self._lock:
+            results = self._entries.get(key)
+            if results is None:
+                return None
+            self._entries.move_to_end(key)
+        start = segment.start
+        return [(start + line, col, msg) for line, col, msg in results]
+
+    def set(self, options: str, segment: Segment, results: Iterable[Result]) -> None:
+        """Store results of segment."""
+        start = segment.start
+        shifted = [(line - start, col, msg) for line, col, msg in results]
+        with self._lock:
+            self._entries[(options, segment.source)] = shifted
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_segments(tree: ast.AST, lines: List[str]) -> List[Segment]:
+    """Split file to segments checked independently of each other.
+
+    Every top-level statement (with its decorators) is a segment, but classes are split
+    to header and statements of body, so changes in one method don't invalidate results
+    of other ones. Statements sharing lines (e.g. separated by ``;``) are merged.
+    Trailing whitespaces are not part of segments source.
+    """
+    ranges: List[Tuple[int, int]] = []
+    for node in getattr(tree, 'body', ()):
+        start = _get_start_lineno(node)
+        body = getattr(node, 'body', None)
+        if isinstance(node, ast.ClassDef) and body and body[0].lineno > node.lineno:
+            ranges.append((start, _get_start_lineno(body[0]) - 1))
+            ranges.extend(
+                (_get_start_lineno(stmt), stmt.end_lineno or stmt.lineno) for stmt in body
+            )
+        else:
+            ranges.append((start, node.end_lineno or node.lineno))
+
+    segments: List[Segment] = []
+    for start, end in ranges:
+        if segments and start <= segments[-1].end:
+            segments[-1].end = max(segments[-1].end, end)
+        else:
+            segments.append(Segment(start, end, ''))
+    for segment in segments:
+        segment.source = '\n'.join(line.rstrip() for line in lines[segment.start - 1:segment.end])
+    return segments
+
+
+def split_results(results: Iterable[Result], segments: List[Segment]) -> List[List[Result]]:
+    """Split results by segments (results outside of segments are dropped)."""
+    starts = [segment.start for segment in segments]
+    by_segment: List[List[Result]] = [[] for _ in segments]
+    for result in results:
+        i = bisect_left(starts, result[0] + 1) - 1
+        if i >= 0 and result[0] <= segments[i].end:
+            by_segment[i].append(result)
+    return by_segment
+
+
+def _get_start_lineno(node: ast.stmt) -> int:
+    """Get first line of statement (including decorators)."""
+    decorators: List[ast.expr] = getattr(node, 'decorator_list', [])
+    if decorators:
+        return min(node.lineno, decorators[0].lineno)
+    return node.lineno
@@ -1,3 +1,7 @@
+# width of indentation level checked by rules
+TAB_SIZE = 4
+
+
 class Messages:
     """Linter messages."""
 
@@ -6,3 +10,6 @@ class Messages:
     FHG003 = 'FHG003 Function call keyword argument has hanging indentation'
     FHG004 = 'FHG004 First function argument must be on new line'
     FHG005 = 'FHG005 Close bracket have different indentation with open bracket'
+
+
+ALL_CODES = frozenset(name for name in vars(Messages) if name.startswith('FHG'))
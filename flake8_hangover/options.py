@@ -0,0 +1,80 @@
+"""Options of plugin (they are not needed until flake8 parses arguments)."""
+import os
+from typing import Any
+
+from .plugin import (
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_MEMO_SIZE,
+    DEFAULT_PARALLEL_LINES,
+    DEFAULT_PROFILE_THRESHOLD,
+)
+
+
+def add_options(parser: Any) -> None:
+    """Add plugin options to flake8 option manager (or to adapter of other parser)."""
+    parser.add_option(
+        '--hangover-cache-dir',
+        default=None,
+        parse_from_config=True,
+        help='Directory to cache results of flake8-hangover for unchanged files. '
+             'Cache is disabled by default.',
+    )
+    parser.add_option(
+        '--hangover-cache-size',
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        parse_from_config=True,
+        help='Maximum number of files in flake8-hangover cache '
+             '(least recently used are removed). (Default: %(default)s)',
+    )
+    parser.add_option(
+        '--hangover-memo-size',
+        type=int,
+        default=DEFAULT_MEMO_SIZE,
+        parse_from_config=True,
+        help='Maximum number of statements which results are kept in memory to check '
+             'only changed statements when the same process checks file again '
+             '(for editors and long-running processes). (Default: %(default)s)',
+    )
+    parser.add_option(
+        '--hangover-parallel-lines',
+        type=int,
+        default=DEFAULT_PARALLEL_LINES,
+        parse_from_config=True,
+        help='Check files with at least this number of lines by chunks of top-level '
+             'statements in parallel processes, 0 disables it (flake8 workers can not '
+             'start processes, so use it with -j 1). (Default: %(default)s)',
+    )
+    parser.add_option(
+        '--hangover-parallel-jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        parse_from_config=True,
+        help='Number of processes to check chunks of huge file, not more than --jobs. '
+             '(Default: number of CPUs)',
+    )
+    parser.add_option(
+        '--hangover-diff',
+        default=None,
+        help='Check only lines changed in unified diff from file ("-" for stdin) '
+             'by flake8-hangover. Files missing in diff are not checked.',
+    )
+    parser.add_option(
+        '--hangover-stats',
+        default=None,
+        help='Write JSON report with timings and counters of flake8-hangover '
+             'to file (can be set by FLAKE8_HANGOVER_STATS env var as well).',
+    )
+    parser.add_option(
+        '--hangover-profile-dir',
+        default=None,
+        help='Profile flake8-hangover checks and store profiles (.pstats) of slow files '
+             'and ranked summary of them to directory.',
+    )
+    parser.add_option(
+        '--hangover-profile-threshold',
+        type=float,
+        default=DEFAULT_PROFILE_THRESHOLD,
+        help='Store profiles only for files checked longer than this number of seconds. '
+             '(Default: %(default)s)',
+    )
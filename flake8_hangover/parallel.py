@@ -0,0 +1,141 @@
+import ast
+import gc
+import multiprocessing
+import os
+import threading
+import tokenize
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .plugin import Plugin
+from .prescan import Regions
+from .ranges import LineRanges
+
+Result = Tuple[int, int, str]
+
+
+class SharedFile(NamedTuple):
+    """File checked by forked workers (it is inherited by them, not sent)."""
+
+    tree: ast.AST
+    tokens: List[tokenize.TokenInfo]
+    lines: List[str]
+    regions: Regions  # multiline regions of whole file
+
+
+class ChunkChecker:
+    """Checker of huge files by chunks of top-level statements in parallel processes.
+
+    Rules never cross boundaries of top-level statements, so file is split to ``jobs``
+    chunks of whole statements with similar number of lines, and every worker checks
+    only lines of its chunk (as diff mode does). Workers are forked for every file, so
+    they get its already built tree, tokens and multiline regions without parsing or
+    sending them (pickling them costs several times more than checking, so workers are
+    not reused for other files). Results of chunks are merged in order of positions.
+
+    Files are split only in main single-threaded process: never in workers of flake8
+    (``flake8 -j N``) or of command line interface, where workers would be nested in
+    their pool, and never in processes with other threads (like daemon), which can't be
+    forked safely. Platforms without ``fork`` are not supported as well.
+    """
+
+    # file checked by workers (set before they are forked)
+    shared_file: Optional[SharedFile] = None
+
+    def __init__(self, min_lines: int, jobs: int) -> None:
+        self.min_lines = min_lines
+        self.jobs = jobs
+        self.files_checked = 0
+
+    def can_split(self, lines: List[str]) -> bool:
+        """Check that file is big enough and worker processes can be forked."""
+        return (
+            self.jobs > 1
+            and len(lines) >= self.min_lines
+            and 'fork' in multiprocessing.get_all_start_methods()
+            and multiprocessing.parent_process() is None
+            and threading.active_count() == 1
+        )
+
+    def check(self, file: SharedFile) -> List[Result]:
+        """Check file by chunks and return errors sorted by position."""
+        if not file.regions.windows:
+            return []  # nothing to check, workers are not needed
+
+        chunks = split_chunks(file.tree, len(file.lines), self.jobs)
+        ChunkChecker.shared_file = file
+        # objects of file are not traversed by collector of workers, so their memory pages
+        # are not copied in workers and stay shared
+        gc.freeze()
+        try:
+            with ProcessPoolExecutor(
+                len(chunks),
+                mp_context=multiprocessing.get_context('fork'),
+            ) as executor:
+                results: List[Result] = []
+                # chunks are ordered and don't overlap
+                for chunk_results in executor.map(check_chunk, chunks):
+                    results.extend(chunk_results)
+        finally:
+            gc.unfreeze()
+            ChunkChecker.shared_file = None
+        self.files_checked += 1
+        return results
+
+
+def get_jobs(options: Any) -> int:
+    """Get number of processes checking huge file by plugin options.
+
+    It is capped by ``--jobs`` of flake8 (or of command line interface), as workers
+    replace its processes: files are checked in main process if they are split.
+    """
+    jobs: int = getattr(options, 'hangover_parallel_jobs', None) or os.cpu_count() or 1
+    outer_jobs = getattr(options, 'jobs', None)
+    outer_jobs = getattr(outer_jobs, 'n_jobs', outer_jobs)  # ``JobsArgument`` of flake8
+    if isinstance(outer_jobs, int) and outer_jobs > 1:
+        jobs = min(jobs, outer_jobs)
+    return jobs
+
+
+def split_chunks(tree: ast.AST, lines_count: int, count: int) -> List[Tuple[int, int]]:
+    """Split file to ``count`` (or less) line ranges of whole top-level statements.
+
+    Lines between statements belong to the previous chunk, so chunks cover whole file.
+    """
+    starts: List[int] = []
+    end = 0
+    for node in getattr(tree, 'body', ()):
+        decorators: List[ast.expr] = getattr(node, 'decorator_list', [])
+        start = min([node.lineno] + [d.lineno for d in decorators])
+        if start > end:  # statements sharing lines (e.g. separated by ``;``) are not split
+            starts.append(start)
+        end = max(end, node.end_lineno or node.lineno)
+    if not starts:
+        return [(1, lines_count)] if lines_count else []
+
+    starts[0] = 1
+    chunk_size = lines_count / count
+    chunk_starts = [1]
+    for start in starts:
+        if start - 1 >= chunk_size * len(chunk_starts):
+            chunk_starts.append(start)
+    return [
+        (start, end - 1)
+        for start, end in zip(chunk_starts, chunk_starts[1:] + [lines_count + 1])
+    ]
+
+
+def check_chunk(chunk: Tuple[int, int]) -> List[Result]:
+    """Check lines of shared file in worker and return errors sorted by position."""
+    file = ChunkChecker.shared_file
+    if file is None:
+        raise RuntimeError('Shared file is not inherited by worker')
+    plugin = Plugin(tree=file.tree, file_tokens=file.tokens, lines=file.lines)
+    plugin.stats = None  # stats of workers are not collected
+    return sorted(plugin.check(LineRanges([chunk]), regions=file.regions))
@@ -1,165 +1,54 @@
-import ast
-import tokenize
-from typing import (
-    Any,
-    Dict,
-    Generator,
-    List,
-    Optional,
-    Tuple,
-    Type,
-)
-
-from .__version__ import __version__
-from .messages import Messages
-from .validator import IndentValidator
-
-TAB_SIZE = 4
-
-
-class Visitor(ast.NodeVisitor):
-    """Class for visiting ast nodes."""
-
-    def __init__(self, tokens: List[tokenize.TokenInfo]) -> None:
-        """Initialize class instance."""
-        self.errors: Dict[Tuple[int, int], str] = {}
-        self._tokens = tokens
-
-    def add_error(self, lineno: int, offset: int, error: str) -> None:
-        """Add error (unique only) to errors list."""
-        key = (lineno, offset)
-        if key not in self.errors:
-            self.errors[key] = error
-
-    def visit_Call(self, node: ast.Call) -> None:
-        """Visit ``Call`` node."""
-        cur_lineno = node.lineno
-        func_name_offset = None
-        last_inner_lineno = cur_lineno  # not include args which started at the same line as node
-
-        # Iterate over positional arguments
-        for arg in node.args:
-            arg_col_offset = self._get_arg_col_offset(arg)
-            arg_lineno = self._get_arg_lineno(arg)
-
-            if arg_lineno - cur_lineno == 1:
-                if func_name_offset is None:
-                    func_name_offset = self._get_func_name_offset(node)
-
-                if arg_col_offset > func_name_offset or arg_col_offset % TAB_SIZE != 0:
-                    self.add_error(arg_lineno, arg_col_offset, Messages.FHG002)
-
-            cur_lineno = self._get_arg_end_lineno(arg, default=arg_lineno)
-            if arg_lineno != node.lineno:
-                last_inner_lineno = max(last_inner_lineno, cur_lineno)
-
-        # Iterate over keyword arguments
-        for kwarg in node.keywords:
-            kwarg_col_offset = self._get_arg_col_offset(kwarg)
-            kwarg_lineno = self._get_arg_lineno(kwarg)
-
-            if kwarg_lineno - cur_lineno == 1:
-                if func_name_offset is None:
-                    func_name_offset = self._get_func_name_offset(node)
-
-                if (
-                    kwarg_col_offset > func_name_offset
-                    or (kwarg.arg and kwarg_col_offset % TAB_SIZE != 0)
-                ):
-                    self.add_error(kwarg_lineno, kwarg_col_offset, Messages.FHG003)
-
-            cur_lineno = self._get_arg_end_lineno(kwarg, default=kwarg_lineno)
-            if getattr(kwarg, 'lineno', kwarg_lineno) != node.lineno:
-                last_inner_lineno = max(last_inner_lineno, cur_lineno)
-
-        self.generic_visit(node)
-
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        """Visit ``FunctionDef`` node."""
-        self._check_func_args_indentations(node)
-        self.generic_visit(node)
-
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
-        """Visit ``AsyncFunctionDef`` node."""
-        self._check_func_args_indentations(node)
-        self.generic_visit(node)
-
-    def _check_func_args_indentations(self, node: Any) -> None:
-        """Check indentations in function args/kwargs."""
-        cur_lineno = node.lineno
-        first_argument = None
-        multiline_arguments = False
-
-        for i, arg in enumerate(node.args.args):
-            if i == 0:
-                first_argument = (arg.lineno, arg.col_offset)
-
-            if arg.lineno != cur_lineno:
-                if arg.col_offset != node.col_offset + 4:
-                    self.add_error(arg.lineno, arg.col_offset, Messages.FHG001)
-                cur_lineno = arg.lineno
-                multiline_arguments = True
-
-        if (
-            multiline_arguments
-            and first_argument
-            and first_argument[0] == node.lineno
-        ):
-            self.add_error(*first_argument, Messages.FHG004)
-
-    def _get_arg_col_offset(self, obj: Any) -> int:
-        """Get `col_offset` for object."""
-        if isinstance(obj, ast.keyword):
-            return obj.value.col_offset - len(str(obj.arg or '')) - 1  # 1 is for "="
-        if isinstance(obj, ast.GeneratorExp):
-            return self._get_arg_col_offset(obj.elt)
-        return int(obj.col_offset)
-
-    def _get_arg_lineno(self, obj: Any) -> int:
-        """Get `lineno` for object."""
-        if isinstance(obj, ast.keyword):
-            return self._get_arg_lineno(obj.value)
-        if isinstance(obj, ast.GeneratorExp):
-            return self._get_arg_lineno(obj.elt)
-
-        return int(obj.lineno)
-
-    def _get_arg_end_lineno(self, obj: Any, default: Optional[int] = None) -> int:
-        """Get `end_lineno` for object."""
-        if isinstance(obj, ast.GeneratorExp):
-            last_gen = obj.generators[-1]
-            return max(
-                self._get_arg_end_lineno(last_gen.target),
-                self._get_arg_end_lineno(last_gen.iter),
-            )
-
-        return getattr(obj, 'end_lineno', int(obj.lineno if default is None else default))
+# This module is imported by flake8 in every process, so only required modules are
+# imported here. Other ones are imported when they are really used, and annotations
+# are not evaluated (``typing`` is not imported at all).
+from __future__ import annotations
 
-    def _get_func_name_offset(self, node: Any) -> int:
-        """Get function name offset."""
-        func_name = self._get_func_name(node.func)
-        return int(node.col_offset + max(len(func_name), TAB_SIZE))
+import os
+import sys
 
-    def _get_func_name(self, obj: Any) -> str:
-        """Extract function full name from node.
+from .__version__ import __version__
+# tab size is imported for backward compatibility
+from .messages import (  # noqa: F401
+    ALL_CODES,
+    TAB_SIZE,
+    Messages,
+)
 
-        May not fully correctly work. For this cases function returns empty string.
-        """
-        try:
-            if isinstance(obj, ast.Attribute):
-                return f'{self._get_func_name(obj.value)}.{obj.attr}'
-            if isinstance(obj, ast.Call):
-                return self._get_func_name(obj.func)
-            if isinstance(obj, ast.Subscript):
-                return f'{self._get_func_name(obj.value)}[{self._get_func_name(obj.slice)}]'
-            if isinstance(obj, ast.Index):
-                return self._get_func_name(obj.value)
-            if isinstance(obj, ast.Constant):
-                return str(obj.value)
-
-            return str(obj.id)
-        except Exception:
-            return ''
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import ast
+    import tokenize
+    from typing import (
+        Any,
+        Callable,
+        Dict,
+        FrozenSet,
+        Generator,
+        Iterable,
+        Iterator,
+        List,
+        Optional,
+        Tuple,
+        Type,
+    )
+
+    from .cache import ResultCache
+    from .memo import StatementMemo
+    from .parallel import ChunkChecker
+    from .prescan import Regions
+    from .profiler import SlowFileProfiler
+    from .ranges import LineRanges
+    from .stats import Stats
+    from .validator import IndentValidator
+    from .visitor import Visitor
+
+DEFAULT_CACHE_SIZE = 50000
+DEFAULT_MEMO_SIZE = 0
+DEFAULT_PARALLEL_LINES = 0
+STATS_ENV_VAR = 'FLAKE8_HANGOVER_STATS'
+DEFAULT_PROFILE_THRESHOLD = 0.5
+# positions in trees and keyword arguments differ between Python versions
+PYTHON_VERSION = '{}.{}'.format(*sys.version_info)
 
 
 class Plugin:
@@ -168,22 +57,364 @@ class Plugin:
     name = 'flake8-hangover'
     version = __version__
 
-    def __init__(self, tree: ast.AST, file_tokens: List[tokenize.TokenInfo]):
+    # options of plugin (set by ``parse_options``)
+    cache: Optional[ResultCache] = None
+    memo: Optional[StatementMemo] = None
+    parallel: Optional[ChunkChecker] = None
+    diff_ranges: Optional[Dict[str, LineRanges]] = None  # changed lines by file path
+    stats: Optional[Stats] = None
+    profiler: Optional[SlowFileProfiler] = None
+    codes: FrozenSet[str] = ALL_CODES  # codes selected in flake8
+    noqa = False  # skip checks of errors suppressed by ``# noqa`` comments
+    options_key = ''  # options which affect results (part of cache key)
+
+    # engines of checked file, they are reused by next file if it gets them (see ``api``)
+    visitor: Optional[Visitor] = None
+    validator: Optional[IndentValidator] = None
+
+    def __init__(
+        self,
+        tree: ast.AST,
+        file_tokens: List[tokenize.TokenInfo],
+        lines: Optional[List[str]] = None,
+        filename: str = 'stdin',
+    ):
         """Initialize class instance."""
         self._tree = tree
         self._tokens = file_tokens
+        self._lines = lines
+        self._filename = filename
+
+    @classmethod
+    def add_options(cls, parser: Any) -> None:
+        """Add plugin options to flake8."""
+        from .options import add_options
+        add_options(parser)
+
+    @classmethod
+    def parse_options(cls, options: Any) -> None:
+        """Parse plugin options."""
+        cache_dir = getattr(options, 'hangover_cache_dir', None)
+        cache_size = getattr(options, 'hangover_cache_size', DEFAULT_CACHE_SIZE)
+        cls.cache = None
+        if cache_dir:
+            from .cache import ResultCache
+            cls.cache = ResultCache(cache_dir, cache_size)
+
+        cls.memo = None
+        memo_size = getattr(options, 'hangover_memo_size', DEFAULT_MEMO_SIZE)
+        if memo_size and memo_size > 0:
+            from .memo import StatementMemo
+            cls.memo = StatementMemo(memo_size)
+
+        cls.parallel = None
+        parallel_lines = getattr(options, 'hangover_parallel_lines', DEFAULT_PARALLEL_LINES)
+        if parallel_lines and parallel_lines > 0:
+            from .parallel import (
+                ChunkChecker,
+                get_jobs,
+            )
+            cls.parallel = ChunkChecker(parallel_lines, get_jobs(options))
+
+        cls.diff_ranges = None
+        diff_path = getattr(options, 'hangover_diff', None)
+        if diff_path:
+            from .diff import read_diff
+            cls.diff_ranges = read_diff(diff_path)
+
+        cls.stats = None
+        stats_path = getattr(options, 'hangover_stats', None) or os.environ.get(STATS_ENV_VAR)
+        if stats_path:
+            from .stats import Stats
+            cls.stats = Stats(stats_path)
+            cls.stats.start()
+
+        cls.profiler = None
+        profile_dir = getattr(options, 'hangover_profile_dir', None)
+        if profile_dir:
+            from .profiler import SlowFileProfiler
+            cls.profiler = SlowFileProfiler(
+                profile_dir,
+                getattr(options, 'hangover_profile_threshold', DEFAULT_PROFILE_THRESHOLD),
+            )
+            cls.profiler.start()
+
+        cls.codes = get_selected_codes(options)
+        # flake8 filters errors by ``# noqa`` comments itself, so plugin may skip them
+        # (unless options are not parsed by flake8)
+        cls.noqa = not getattr(options, 'disable_noqa', True)
+        cls.options_key = (
+            f'py{PYTHON_VERSION};'
+            + ','.join(sorted(cls.codes))
+            + (';noqa' if cls.noqa else '')
+        )
 
     def run(self) -> Generator[Tuple[int, int, str, Type[Any]], None, None]:
         """Run plugin."""
-        visitor = Visitor(tokens=self._tokens)
-        visitor.visit(self._tree)
-
-        for error_key, error_msg in visitor.errors.items():
-            lineno, col_offset = error_key
+        stats = self.stats
+        started = stats.clock() if stats else 0.0
+        results: Iterable[Tuple[int, int, str]]
+        if self.profiler:
+            results = self.profiler.profile(self._filename, self.get_results)
+        else:
+            results = self.get_results()
+        if stats:
+            results = list(results)
+            stats.add_file(self._filename, stats.clock() - started, len(results))
+
+        for lineno, col_offset, error_msg in results:
             yield lineno, col_offset, error_msg, type(self)
 
-        indent_validator = IndentValidator(tokens=self._tokens)
-        indent_validator.validate()
-        for error_key, error_msg in indent_validator.errors.items():
-            lineno, col_offset = error_key
-            yield lineno, col_offset, error_msg, type(self)
+    def get_results(self) -> Iterable[Tuple[int, int, str]]:
+        """Get errors from cache or by checking file."""
+        line_ranges = None
+        if self.diff_ranges is not None:
+            from .diff import normalize_path
+            line_ranges = self.diff_ranges.get(normalize_path(self._filename))
+            if not line_ranges:
+                return []  # file is not changed
+
+        if not self.cache or self._lines is None:
+            return self.check_statements(line_ranges)
+
+        options_key = f'{self.options_key}{line_ranges}'
+        cache_key = self.cache.make_key(self._lines, options_key)
+        results = self.cache.get(cache_key)
+        if results is None:
+            results = list(self.check_statements(line_ranges))
+            self.cache.set(cache_key, results)
+        elif self.stats:
+            self.stats.add('cache', 0.0, cache_hits=1)
+        return results
+
+    def check_statements(
+        self,
+        line_ranges: Optional[LineRanges] = None,
+    ) -> Iterable[Tuple[int, int, str]]:
+        """Check file reusing memoized results of unchanged statements (if enabled).
+
+        Only statements missing in memo are checked, so time of checking file again
+        after small edit depends on size of edit, not on size of file. Otherwise huge
+        files are checked by chunks of statements in parallel processes (if enabled).
+        """
+        memo = self.memo
+        if memo is None or line_ranges is not None or self._lines is None:
+            parallel = self.parallel
+            if (
+                parallel is not None
+                and line_ranges is None
+                and self._lines is not None
+                and parallel.can_split(self._lines)
+            ):
+                return self.check_in_parallel(parallel)
+            return self.check(line_ranges)
+
+        from .memo import (
+            get_segments,
+            split_results,
+        )
+        from .ranges import LineRanges
+
+        results: List[Tuple[int, int, str]] = []
+        segments = get_segments(self._tree, self._lines)
+        missed = []
+        for segment in segments:
+            segment_results = memo.get(self.options_key, segment)
+            if segment_results is None:
+                missed.append(segment)
+            else:
+                results.extend(segment_results)
+        if self.stats:
+            self.stats.add('memo', 0.0, statements_reused=len(segments) - len(missed))
+        if missed:
+            found = self.check(LineRanges((segment.start, segment.end) for segment in missed))
+            for segment, segment_results in zip(missed, split_results(found, missed)):
+                memo.set(self.options_key, segment, segment_results)
+                results.extend(segment_results)
+        results.sort()
+        return results
+
+    def check_in_parallel(self, parallel: ChunkChecker) -> List[Tuple[int, int, str]]:
+        """Check file by chunks in parallel processes."""
+        from .parallel import SharedFile
+        from .prescan import find_multiline_regions
+
+        stats = self.stats
+        started = stats.clock() if stats else 0.0
+        regions = find_multiline_regions(self._tokens, noqa=self.noqa)
+        results = parallel.check(
+            SharedFile(self._tree, self._tokens, self._lines or [], regions),
+        )
+        if stats:
+            stats.add('parallel', stats.clock() - started, parallel_files=1)
+        return results
+
+    def check(
+        self,
+        line_ranges: Optional[LineRanges] = None,
+        regions: Optional[Regions] = None,
+    ) -> Iterator[Tuple[int, int, str]]:
+        """Check file (or only line ranges of file) and return found errors.
+
+        Only multiline logical lines with brackets are checked by visitor and validator,
+        so files without them are not checked at all. Visitor or validator is skipped
+        if all codes of its rules are not selected in flake8, and errors suppressed by
+        ``# noqa`` comments are not checked (if enabled). Regions of whole file can be
+        passed if they are already found.
+        """
+        import heapq
+
+        from .index import FileIndex
+        from .prescan import find_multiline_regions
+        from .rules import get_rules
+        from .validator import IndentValidator
+        from .visitor import Visitor
+
+        codes = self.codes
+        rules = get_rules(codes)
+        run_visitor = any(rule.node_types for rule in rules)
+        run_validator = any(rule.token_events for rule in rules)
+        if not run_visitor and not run_validator:
+            return
+
+        stats = self.stats
+        started = stats.clock() if stats else 0.0
+        if regions is None:
+            regions = find_multiline_regions(self._tokens, noqa=self.noqa)
+        if line_ranges is not None:
+            regions = regions.intersection(self._tokens, line_ranges)
+        if stats:
+            stats.add('prescan', stats.clock() - started, regions=len(regions.windows))
+        if not regions.windows:
+            return
+
+        index = FileIndex(self._tokens, regions.windows)
+        streams: List[Iterator[Tuple[int, int, str]]] = []
+
+        if run_visitor:
+            visitor = self.visitor
+            if visitor is None:
+                visitor = self.visitor = Visitor(
+                    tokens=self._tokens,
+                    line_ranges=regions.lines,
+                    codes=codes,
+                    noqa=regions.noqa,
+                    index=index,
+                )
+            else:
+                visitor.reset(self._tokens, regions.lines, regions.noqa, index)
+            visitor_errors = visitor.iter_errors(self._tree)
+            if stats:
+                visitor_errors = self._measure(
+                    stats,
+                    'visitor',
+                    visitor_errors,
+                    lambda: {
+                        'nodes_visited': visitor.nodes_visited,
+                        'calls_checked': visitor.calls_checked,
+                        'functions_checked': visitor.functions_checked,
+                    },
+                )
+            streams.append(visitor_errors)
+
+        if run_validator:
+            indent_validator = self.validator
+            if indent_validator is None:
+                indent_validator = self.validator = IndentValidator(
+                    tokens=self._tokens,
+                    line_ranges=regions.lines,
+                    windows=regions.windows,
+                    noqa=regions.noqa,
+                    index=index,
+                    codes=codes,
+                )
+            else:
+                indent_validator.reset(
+                    self._tokens,
+                    regions.lines,
+                    regions.windows,
+                    regions.noqa,
+                    index,
+                )
+            validator_errors = indent_validator.iter_errors(
+                node.end_lineno or node.lineno for node in getattr(self._tree, 'body', ())
+            )
+            if stats:
+                validator_errors = self._measure(
+                    stats,
+                    'validator',
+                    validator_errors,
+                    lambda: {
+                        'tokens_scanned': indent_validator.tokens_scanned,
+                        'brackets_paired': indent_validator.brackets_paired,
+                    },
+                )
+            streams.append(validator_errors)
+
+        # errors of both engines are yielded by top-level statements sorted by position,
+        # so whole file errors are never collected
+        yield from heapq.merge(*streams)
+
+    @staticmethod
+    def _measure(
+        stats: Stats,
+        phase: str,
+        errors: Iterator[Tuple[int, int, str]],
+        get_counters: Callable[[], Dict[str, int]],
+    ) -> Iterator[Tuple[int, int, str]]:
+        """Add time spent in errors iterator (without consumer time) to stats."""
+        seconds = 0.0
+        started = stats.clock()
+        for error in errors:
+            seconds += stats.clock() - started
+            yield error
+            started = stats.clock()
+        stats.add(phase, seconds + stats.clock() - started, **get_counters())
+
+
+def get_selected_codes(options: Any) -> FrozenSet[str]:
+    """Get plugin codes selected by flake8 options (``--select``, ``--ignore`` etc).
+
+    Options which are not parsed by flake8 (e.g. by command line interface) are used
+    without flake8 (it is not even imported): all codes are selected by default, and
+    the longest prefix wins if code is both selected and ignored (as in flake8). All
+    codes are treated as selected if selection can't be found out.
+    """
+    if not hasattr(options, 'extended_default_select'):  # options are not parsed by flake8
+        select = getattr(options, 'select', None)
+        selected = [''] if select is None else select
+        selected = [*selected, *(getattr(options, 'extend_select', None) or [])]
+        ignored = [
+            *(getattr(options, 'ignore', None) or []),
+            *(getattr(options, 'extend_ignore', None) or []),
+        ]
+        return frozenset(
+            code for code in ALL_CODES
+            if get_prefix_length(code, selected) > get_prefix_length(code, ignored)
+        )
+
+    try:
+        from flake8.style_guide import (
+            Decision,
+            DecisionEngine,
+        )
+        engine = DecisionEngine(options)
+        return frozenset(
+            code for code in ALL_CODES
+            if engine.decision_for(code) is Decision.Selected
+        )
+    except (ImportError, AttributeError, TypeError):
+        return ALL_CODES
+
+
+def get_prefix_length(code: str, prefixes: Iterable[str]) -> int:
+    """Get length of the longest prefix of code (-1 if code has no prefixes)."""
+    return max((len(prefix) for prefix in prefixes if code.startswith(prefix)), default=-1)
+
+
+def __getattr__(name: str) -> object:
+    # visitor is imported for backward compatibility (on first use, like other modules)
+    if name == 'Visitor':
+        from .visitor import Visitor
+        return Visitor
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
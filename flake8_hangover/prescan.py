@@ -0,0 +1,137 @@
+import re
+from token import (
+    COMMENT,
+    DEDENT,
+    INDENT,
+    NEWLINE,
+    NL,
+    OP,
+)
+from tokenize import TokenInfo
+from typing import (
+    Dict,
+    List,
+    Match,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .ranges import LineRanges
+
+BRACKETS = frozenset('()[]{}')
+SKIPPED_TOKENS = frozenset((NL, COMMENT, INDENT, DEDENT))
+
+# the same as ``NOQA_INLINE_REGEXP`` of flake8
+NOQA_REGEX = re.compile(
+    r'# noqa(?::[\s]?(?P<codes>([A-Z]+[0-9]+(?:[,\s]+)?)+))?',
+    re.IGNORECASE,
+)
+NOQA_CODES_SEPARATOR_REGEX = re.compile(r'[,\s]')
+
+
+class NoqaIndex(Dict[int, Tuple[str, ...]]):
+    """Codes suppressed by ``# noqa`` comments by line (empty tuple means all codes)."""
+
+    def suppresses(self, line: int, code: str) -> bool:
+        """Check that error with code on line is suppressed."""
+        codes = self.get(line)
+        return codes is not None and (not codes or code.startswith(codes))
+
+
+class Regions(NamedTuple):
+    """Multiline logical lines with brackets."""
+
+    lines: LineRanges
+    windows: List[Tuple[int, int]]  # slices of tokens with these logical lines
+    noqa: NoqaIndex
+
+    def intersection(self, tokens: List[TokenInfo], line_ranges: LineRanges) -> 'Regions':
+        """Get regions overlapping line ranges."""
+        windows = [
+            (start, end)
+            for start, end in self.windows
+            if line_ranges.overlaps(tokens[start].start[0], tokens[end - 1].start[0])
+        ]
+        return Regions(self.lines.intersection(line_ranges), windows, self.noqa)
+
+
+def find_multiline_regions(tokens: List[TokenInfo], noqa: bool = False) -> Regions:
+    """Find logical lines with brackets placed on several physical lines.
+
+    All rules can be violated only by arguments or brackets on different lines, so
+    other lines can be skipped by rules. Logical line is multiline if it has multiline
+    brackets, multiline strings or line continuation (backslash) inside of it.
+
+    If ``noqa`` is set, ``# noqa`` comments are collected to index as well.
+    """
+    lines: List[Tuple[int, int]] = []
+    windows: List[Tuple[int, int]] = []
+    noqa_index = NoqaIndex()
+    start = 0  # index of first token of logical line
+    has_brackets = False
+
+    for i, token in enumerate(tokens):
+        type = token[0]
+        if type == OP:
+            if token[1] in BRACKETS:
+                has_brackets = True
+        elif type == NEWLINE:
+            if has_brackets:
+                # logical line starts with first significant token
+                first = start
+                while tokens[first][0] in SKIPPED_TOKENS:
+                    first += 1
+                start_line = tokens[first][2][0]
+                end_line = token[2][0]
+                if end_line > start_line:
+                    lines.append((start_line, end_line))
+                    if windows and windows[-1][1] == start:
+                        windows[-1] = (windows[-1][0], i + 1)
+                    else:
+                        windows.append((start, i + 1))
+                has_brackets = False
+            start = i + 1
+        elif type == COMMENT and noqa:
+            codes = get_noqa_codes(tokens, i)
+            if codes is not None:
+                noqa_index[token[2][0]] = codes
+
+    return Regions(LineRanges(lines), windows, noqa_index)
+
+
+def get_noqa_codes(tokens: List[TokenInfo], index: int) -> Optional[Tuple[str, ...]]:
+    """Get codes suppressed by comment token (empty tuple if all codes are suppressed).
+
+    Comment is used only if flake8 surely applies it to the line of comment: line has
+    no tokens started on other lines (like multiline strings) and no other ``# noqa``
+    before comment (like inside of string). Otherwise, ``None`` is returned as for
+    comment without ``# noqa``.
+    """
+    comment = tokens[index]
+    match = NOQA_REGEX.match(comment.string)
+    if match is None:
+        return None
+
+    line, column = comment.start
+    if (
+        comment.line[column:column + len(comment.string)] != comment.string
+        or NOQA_REGEX.search(comment.line, 0, column) is not None
+    ):
+        return None
+
+    index -= 1
+    while index >= 0 and tokens[index].type not in (NL, NEWLINE):
+        if tokens[index].type != DEDENT and tokens[index].start[0] != line:
+            return None
+        index -= 1
+
+    return get_matched_codes(match)
+
+
+def get_matched_codes(match: Match[str]) -> Tuple[str, ...]:
+    """Get codes from match of ``# noqa`` comment (empty tuple if all codes are suppressed)."""
+    codes = match.group('codes')
+    if codes is None:
+        return ()
+    return tuple(code for code in NOQA_CODES_SEPARATOR_REGEX.split(codes) if code)
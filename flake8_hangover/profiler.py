@@ -0,0 +1,102 @@
+import atexit
+import cProfile
+import multiprocessing
+import os
+import pstats
+import threading
+import time
+from contextlib import suppress
+from typing import (
+    Callable,
+    Iterable,
+    List,
+    Tuple,
+    TypeVar,
+)
+from urllib.parse import (
+    quote,
+    unquote,
+)
+
+T = TypeVar('T')
+
+PROFILE_SUFFIX = '.pstats'
+SUMMARY_NAME = 'summary.txt'
+SUMMARY_FUNCTIONS_COUNT = 10
+
+
+class SlowFileProfiler:
+    """Profile checks of files and keep profiles only for slow ones.
+
+    Profile of every file checked longer than ``threshold`` seconds is stored to
+    ``<directory>/<quoted file path>.pstats``. Main process writes ranked summary of
+    all stored profiles to ``<directory>/summary.txt`` on exit.
+    """
+
+    def __init__(self, directory: str, threshold: float) -> None:
+        self.directory = directory
+        self.threshold = threshold
+        # only one profiler can be active in process (since Python 3.12), so checks of
+        # several threads are profiled one by one
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start profiling in main process (profiles from previous runs are removed)."""
+        if multiprocessing.parent_process() is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if name.endswith(PROFILE_SUFFIX) or name == SUMMARY_NAME:
+                with suppress(OSError):
+                    os.remove(os.path.join(self.directory, name))
+        atexit.register(self.write_summary)
+
+    def profile(self, filename: str, func: Callable[[], Iterable[T]]) -> List[T]:
+        """Call function with profiling and return its results as list."""
+        profile = cProfile.Profile()
+        with self._lock:
+            started = time.perf_counter()
+            results: List[T] = profile.runcall(lambda: list(func()))
+            seconds = time.perf_counter() - started
+        if seconds > self.threshold:
+            with suppress(OSError):
+                profile.dump_stats(self.get_path(filename))
+        return results
+
+    def get_path(self, filename: str) -> str:
+        """Get path of profile for checked file."""
+        name = quote(os.path.normpath(filename), safe='')
+        if name.startswith('.'):
+            name = '%2E' + name[1:]  # prevent hidden files
+        return os.path.join(self.directory, name + PROFILE_SUFFIX)
+
+    def get_profiles(self) -> List[Tuple[float, str, pstats.Stats]]:
+        """Get stored profiles (total time, checked file name, stats) from slowest one."""
+        profiles = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(PROFILE_SUFFIX):
+                continue
+            with suppress(Exception):
+                stats = pstats.Stats(os.path.join(self.directory, name))
+                filename = unquote(name[:-len(PROFILE_SUFFIX)])
+                profiles.append((stats.total_tt, filename, stats))
+        return sorted(profiles, key=lambda p: p[0], reverse=True)
+
+    def write_summary(self) -> str:
+        """Write ranked summary of stored profiles and return its path."""
+        lines = [f'Files checked longer than {self.threshold}s (slowest first)', '']
+        for total_time, filename, stats in self.get_profiles():
+            lines.append(f'{total_time:.3f}s {filename}')
+            lines.append(f'    profile: {self.get_path(filename)}')
+            # functions which took the most time by themselves
+            functions = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+            for function, (_, calls, own_time, *_) in functions[:SUMMARY_FUNCTIONS_COUNT]:
+                path, lineno, func_name = function
+                location = f'{os.path.basename(path)}:{lineno}({func_name})'
+                lines.append(f'    {own_time:8.3f}s {calls:>8} calls  {location}')
+            lines.append('')
+
+        path = os.path.join(self.directory, SUMMARY_NAME)
+        with suppress(OSError), open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
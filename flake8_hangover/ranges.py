@@ -0,0 +1,48 @@
+from bisect import bisect_right
+from typing import (
+    Iterable,
+    List,
+    Tuple,
+)
+
+
+class LineRanges:
+    """Sorted set of line ranges (both ends are included)."""
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]] = ()) -> None:
+        self.ranges: List[Tuple[int, int]] = []
+        for start, end in sorted(ranges):
+            if self.ranges and start <= self.ranges[-1][1] + 1:
+                self.ranges[-1] = (self.ranges[-1][0], max(self.ranges[-1][1], end))
+            else:
+                self.ranges.append((start, end))
+        self._starts = [start for start, _ in self.ranges]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check that any line from ``start`` to ``end`` is in ranges."""
+        i = bisect_right(self._starts, end) - 1
+        return i >= 0 and self.ranges[i][1] >= start
+
+    def intersection(self, other: 'LineRanges') -> 'LineRanges':
+        """Get lines which are in both ranges."""
+        result = []
+        i = j = 0
+        while i < len(self.ranges) and j < len(other.ranges):
+            start = max(self.ranges[i][0], other.ranges[j][0])
+            end = min(self.ranges[i][1], other.ranges[j][1])
+            if start <= end:
+                result.append((start, end))
+            if self.ranges[i][1] < other.ranges[j][1]:
+                i += 1
+            else:
+                j += 1
+        return LineRanges(result)
+
+    def __bool__(self) -> bool:
+        return bool(self.ranges)
+
+    def __iter__(self) -> Iterable[Tuple[int, int]]:
+        return iter(self.ranges)
+
+    def __repr__(self) -> str:
+        return f'LineRanges({self.ranges})'
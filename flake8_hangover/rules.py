@@ -0,0 +1,268 @@
+import ast
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from .index import (
+    BracketPair,
+    FileIndex,
+)
+from .messages import (
+    TAB_SIZE,
+    Messages,
+)
+
+# token events dispatched by ``IndentValidator``
+BRACKET_PAIR = 'bracket_pair'  # pair of brackets on different lines (``BracketPair``)
+
+RuleType = TypeVar('RuleType', bound=Type['Rule'])
+
+RULES: List[Type['Rule']] = []
+
+
+def register_rule(rule: RuleType) -> RuleType:
+    """Decorator to register rule."""
+    RULES.append(rule)
+    return rule
+
+
+def get_rules(codes: Collection[str]) -> List[Type['Rule']]:
+    """Get registered rules with any of codes."""
+    return [rule for rule in RULES if not set(rule.codes).isdisjoint(codes)]
+
+
+class Rule:
+    """Base class of rules.
+
+    Rule declares codes of its errors, AST node types and token events which it checks.
+    Engines (``Visitor`` for nodes and ``IndentValidator`` for tokens) create rules with
+    selected codes only and dispatch every node or token event to all rules which need
+    it during single traversal, so new rules don't add new passes over file. Nodes are
+    dispatched to ``visit_<node type name>`` methods and token events are dispatched to
+    ``on_<event>`` methods.
+
+    Errors are added to engine, which filters them by selected codes and ``# noqa``
+    (see ``engine.Engine``).
+    """
+
+    codes: Tuple[str, ...] = ()
+    node_types: Tuple[Type[ast.AST], ...] = ()
+    token_events: Tuple[str, ...] = ()
+
+    def __init__(self, engine: Any) -> None:
+        self.engine = engine
+
+    def reset(self) -> None:
+        """Reset per-file state before engine checks another file."""
+
+
+@register_rule
+class FunctionDefRule(Rule):
+    """Check indentations of function definition arguments."""
+
+    codes = ('FHG001', 'FHG004')
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        """Visit ``FunctionDef`` node."""
+        self._check_func_args_indentations(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        """Visit ``AsyncFunctionDef`` node."""
+        self._check_func_args_indentations(node)
+
+    def _check_func_args_indentations(self, node: Any) -> None:
+        """Check indentations in function args/kwargs."""
+        engine = self.engine
+        engine.functions_checked += 1
+        cur_lineno = node.lineno
+        first_argument = None
+        multiline_arguments = False
+
+        for i, arg in enumerate(node.args.args):
+            if i == 0:
+                first_argument = (arg.lineno, arg.col_offset)
+
+            if arg.lineno != cur_lineno:
+                if (
+                    not engine.is_suppressed(arg.lineno, 'FHG001')
+                    and arg.col_offset != node.col_offset + 4
+                ):
+                    engine.add_error(arg.lineno, arg.col_offset, Messages.FHG001)
+                cur_lineno = arg.lineno
+                multiline_arguments = True
+
+        if (
+            multiline_arguments
+            and first_argument
+            and first_argument[0] == node.lineno
+            and not engine.is_suppressed(node.lineno, 'FHG004')
+        ):
+            engine.add_error(*first_argument, Messages.FHG004)
+
+
+@register_rule
+class CallRule(Rule):
+    """Check indentations of function call arguments."""
+
+    codes = ('FHG002', 'FHG003')
+    node_types = (ast.Call,)
+
+    def __init__(self, engine: Any) -> None:
+        super().__init__(engine)
+        self._func_name_lengths: Dict[ast.AST, int] = {}
+
+    def reset(self) -> None:
+        """Reset per-file state before engine checks another file."""
+        self._func_name_lengths.clear()
+
+    def visit_Call(self, node: ast.Call) -> None:
+        """Visit ``Call`` node."""
+        engine = self.engine
+        engine.calls_checked += 1
+        cur_lineno = node.lineno
+        func_name_offset = None
+        last_inner_lineno = cur_lineno  # not include args which started at the same line as node
+
+        # Iterate over positional arguments
+        for arg in node.args:
+            arg_col_offset = self._get_arg_col_offset(arg)
+            arg_lineno = self._get_arg_lineno(arg)
+
+            if arg_lineno - cur_lineno == 1 and not engine.is_suppressed(arg_lineno, 'FHG002'):
+                if func_name_offset is None:
+                    func_name_offset = self._get_func_name_offset(node)
+
+                if arg_col_offset > func_name_offset or arg_col_offset % TAB_SIZE != 0:
+                    engine.add_error(arg_lineno, arg_col_offset, Messages.FHG002)
+
+            cur_lineno = self._get_arg_end_lineno(arg, default=arg_lineno)
+            if arg_lineno != node.lineno:
+                last_inner_lineno = max(last_inner_lineno, cur_lineno)
+
+        # Iterate over keyword arguments
+        for kwarg in node.keywords:
+            kwarg_col_offset = self._get_arg_col_offset(kwarg)
+            kwarg_lineno = self._get_arg_lineno(kwarg)
+
+            if (
+                kwarg_lineno - cur_lineno == 1
+                and not engine.is_suppressed(kwarg_lineno, 'FHG003')
+            ):
+                if func_name_offset is None:
+                    func_name_offset = self._get_func_name_offset(node)
+
+                if (
+                    kwarg_col_offset > func_name_offset
+                    or (kwarg.arg and kwarg_col_offset % TAB_SIZE != 0)
+                ):
+                    engine.add_error(kwarg_lineno, kwarg_col_offset, Messages.FHG003)
+
+            cur_lineno = self._get_arg_end_lineno(kwarg, default=kwarg_lineno)
+            if getattr(kwarg, 'lineno', kwarg_lineno) != node.lineno:
+                last_inner_lineno = max(last_inner_lineno, cur_lineno)
+
+    def _get_arg_col_offset(self, obj: Any) -> int:
+        """Get `col_offset` for object."""
+        if isinstance(obj, ast.keyword):
+            return self._get_keyword_position(obj)[1]
+        if isinstance(obj, ast.GeneratorExp):
+            return self._get_arg_col_offset(obj.elt)
+        return int(obj.col_offset)
+
+    def _get_arg_lineno(self, obj: Any) -> int:
+        """Get `lineno` for object."""
+        if isinstance(obj, ast.keyword):
+            return self._get_keyword_position(obj)[0]
+        if isinstance(obj, ast.GeneratorExp):
+            return self._get_arg_lineno(obj.elt)
+
+        return int(obj.lineno)
+
+    def _get_keyword_position(self, obj: ast.keyword) -> Tuple[int, int]:
+        """Get position of keyword argument (of its name or ``**``)."""
+        if hasattr(obj, 'lineno'):
+            return obj.lineno, obj.col_offset  # Python 3.9+
+
+        value = obj.value
+        index: FileIndex = self.engine.get_index()
+        position = index.find_keyword(value.lineno, value.col_offset)
+        if position is None:
+            # tokens are not matched with tree, so position is estimated by value
+            return value.lineno, value.col_offset - len(str(obj.arg or '')) - 1  # 1 is for "="
+        return position
+
+    def _get_arg_end_lineno(self, obj: Any, default: Optional[int] = None) -> int:
+        """Get `end_lineno` for object."""
+        if isinstance(obj, ast.GeneratorExp):
+            last_gen = obj.generators[-1]
+            return max(
+                self._get_arg_end_lineno(last_gen.target),
+                self._get_arg_end_lineno(last_gen.iter),
+            )
+
+        return getattr(obj, 'end_lineno', int(obj.lineno if default is None else default))
+
+    def _get_func_name_offset(self, node: Any) -> int:
+        """Get function name offset."""
+        func_name_length = self._get_func_name_length(node.func)
+        return int(node.col_offset + max(func_name_length, TAB_SIZE))
+
+    def _get_func_name_length(self, obj: Any) -> int:
+        """Get length of function full name.
+
+        Full name is built from attributes, calls and subscripts, like ``a.b[c].d`` for
+        ``a.b(x)[c].d``. Lengths are memoized per node, so every node of long call chain
+        is processed only once. May not fully correctly work for some nodes, in this case
+        name is treated as empty string.
+        """
+        chain: List[ast.AST] = []
+        while obj not in self._func_name_lengths:
+            chain.append(obj)
+            if isinstance(obj, (ast.Attribute, ast.Subscript)):
+                obj = obj.value
+            elif isinstance(obj, ast.Index):
+                obj = obj.value
+            elif isinstance(obj, ast.Call):
+                obj = obj.func
+            else:
+                if isinstance(obj, ast.Constant):
+                    name = str(obj.value)
+                else:
+                    name = str(getattr(obj, 'id', ''))
+                self._func_name_lengths[chain.pop()] = len(name)
+                break
+
+        length = self._func_name_lengths[obj]
+        for obj in reversed(chain):
+            if isinstance(obj, ast.Attribute):
+                length += len(obj.attr) + 1  # 1 is for "."
+            elif isinstance(obj, ast.Subscript):
+                length += self._get_func_name_length(obj.slice) + 2  # 2 is for "[]"
+            self._func_name_lengths[obj] = length
+        return length
+
+
+@register_rule
+class BracketIndentRule(Rule):
+    """Check close brackets have the same line indent as open ones."""
+
+    codes = ('FHG005',)
+    token_events = (BRACKET_PAIR,)
+
+    def on_bracket_pair(self, pair: BracketPair) -> None:
+        """Check pair of brackets placed on different lines."""
+        engine = self.engine
+        if engine.is_suppressed(pair.close_line, 'FHG005'):
+            return
+        index: FileIndex = engine.get_index()
+        line_indents = index.line_indents
+        if line_indents[pair.open_line] != line_indents[pair.close_line]:
+            engine.add_error(pair.close_line, pair.close_column, Messages.FHG005)
@@ -0,0 +1,154 @@
+import re
+import sys
+from typing import (
+    List,
+    Optional,
+    Tuple,
+)
+
+from .index import (
+    BRACKETS,
+    BracketPair,
+    FileIndex,
+)
+from .prescan import (
+    NOQA_REGEX,
+    NoqaIndex,
+    get_matched_codes,
+)
+
+# f-strings are tokenized as plain strings before Python 3.12 only (then brackets of their
+# replacement fields are tokens), so scanner gives the same data as tokenize there
+SCANNER_SUPPORTED = sys.version_info < (3, 12)
+
+# things which affect brackets and line indents: strings, comments, brackets and newlines
+# (string prefixes don't change where string ends, raw strings are lexed the same way)
+SCAN_REGEX = re.compile(r'\'\'\'|"""|[\'"#()\[\]{}\n]')
+STRING_END_REGEXES = {
+    "'": re.compile(r"[^'\\\n]*(?:\\.[^'\\\n]*)*'", re.DOTALL),
+    '"': re.compile(r'[^"\\\n]*(?:\\.[^"\\\n]*)*"', re.DOTALL),
+    "'''": re.compile(r"[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''", re.DOTALL),
+    '"""': re.compile(r'[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""', re.DOTALL),
+}
+WHITESPACE_REGEX = re.compile(r'[ \t\f]*')
+
+
+class SourceIndex(FileIndex):
+    """Index of brackets built from raw source without ``tokenize``.
+
+    Collects the same line indents and pairs of multiline brackets as ``FileIndex``
+    (indent of line is column of first token started on it), but only strings, comments,
+    brackets and newlines are found in source, so it is much cheaper than tokenizing.
+    It can replace ``FileIndex`` in ``IndentValidator`` when tokens are not available
+    (tokens can't be looked up in it).
+
+    If ``noqa`` is set, ``# noqa`` comments are collected to ``noqa`` index as well (the
+    same ones as ``prescan.find_multiline_regions`` collects from tokens).
+    """
+
+    def __init__(self, source: str, noqa: bool = False) -> None:
+        super().__init__([])
+        self.source = source.replace('\r\n', '\n').replace('\r', '\n')
+        self.noqa = NoqaIndex() if noqa else None
+
+    def _scan_window(self) -> bool:
+        """Scan whole source as single window."""
+        if self._scanned:
+            return False
+        self.scan()
+        return True
+
+    def scan(self) -> None:
+        """Collect line indents and bracket pairs (only once).
+
+        ``ValueError`` is raised for unexpected close brackets and unterminated strings.
+        """
+        if self._scanned:
+            return
+        self._scanned = True
+
+        source = self.source
+        search = SCAN_REGEX.search
+        match_whitespace = WHITESPACE_REGEX.match
+        # stacks of open brackets lines and indents (index is brackets type)
+        stacks: Tuple[List[Tuple[int, int]], ...] = ([], [], [], [])
+        line_indents = self.line_indents
+        pairs = self.pairs
+        line = 1
+        line_start = 0  # offset of line in source
+        first_token: Optional[int] = 0  # offset to look for first token of line from
+        cur_indent = 0
+        pos = 0
+        noqa = self.noqa
+        string_line = 0  # the last line of last multiline string
+        comment_line = 0  # line of last comment
+
+        while True:
+            match = search(source, pos)
+            if match is None:
+                break
+            char = match.group()
+            start = match.start()
+            pos = match.end()
+
+            if char == '\n':
+                line += 1
+                line_start = first_token = pos
+                continue
+            if char == '#':
+                end = source.find('\n', pos)
+                pos = len(source) if end == -1 else end
+                if noqa is not None:
+                    match = NOQA_REGEX.match(source[start:pos])
+                    # line continues previous one (if its backslash is not in comment)
+                    continued = (
+                        source[line_start - 2:line_start] == '\\\n'
+                        and comment_line != line - 1
+                    )
+                    # comment is used only if line has no tokens started on other lines
+                    # (multiline string or line continuation) and no other ``# noqa``
+                    # before comment (see ``prescan.get_noqa_codes``)
+                    if (
+                        match is not None
+                        and string_line != line
+                        and not continued
+                        and NOQA_REGEX.search(source, line_start, start) is None
+                    ):
+                        noqa[line] = get_matched_codes(match)
+                    comment_line = line
+                continue
+            if first_token is not None:
+                # the first bracket or string on line is not always its first token
+                whitespace = match_whitespace(source, first_token)
+                cur_indent = (whitespace.end() if whitespace else first_token) - line_start
+                first_token = None
+
+            if char in BRACKETS:
+                bracket_type, open = BRACKETS[char]
+                if open:
+                    stacks[bracket_type].append((line, cur_indent))
+                    continue
+                if not stacks[bracket_type]:
+                    raise ValueError(
+                        f'Unexpected close parentheses {line}:{start - line_start}',
+                    )
+
+                open_line, open_indent = stacks[bracket_type].pop()
+                self.brackets_paired += 1
+                if open_line != line:
+                    pairs.append(BracketPair(open_line, line, start - line_start))
+                    line_indents[open_line] = open_indent
+                    line_indents[line] = cur_indent
+                continue
+
+            string_end = STRING_END_REGEXES[char].match(source, pos)
+            if string_end is None:
+                raise ValueError(f'Unterminated string {line}:{start - line_start}')
+            pos = string_end.end()
+            newlines = source.count('\n', start, pos)
+            if newlines:
+                # next token started on the last line of string is the first one of line
+                line += newlines
+                line_start = source.rfind('\n', start, pos) + 1
+                first_token = pos
+                string_line = line
@@ -0,0 +1,128 @@
+import atexit
+import heapq
+import json
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import suppress
+from multiprocessing.util import Finalize
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+SLOWEST_FILES_COUNT = 20
+
+
+class Stats:
+    """Counters and timings of plugin phases.
+
+    Every process collects own stats and dumps them to ``<report>.parts`` directory on
+    exit. Main process merges all dumped stats into single JSON report on exit.
+    """
+
+    def __init__(self, report_path: str) -> None:
+        self.report_path = report_path
+        self.parts_dir = f'{report_path}.parts'
+        self.clock = time.perf_counter
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()  # stats are added by several threads (e.g. async API)
+        self._reset()
+
+    def _reset(self) -> None:
+        """Reset collected stats."""
+        self.counters: Dict[str, int] = {}
+        self.timings: Dict[str, float] = {}
+        self.slowest_files: List[Tuple[float, str]] = []  # heap
+
+    def start(self) -> None:
+        """Start collecting stats in main process (parts from previous runs are removed)."""
+        if multiprocessing.parent_process() is not None:
+            return
+        self._remove_parts()
+        atexit.register(self.merge)
+
+    def add(self, phase: str, seconds: float, **counters: int) -> None:
+        """Add timing of phase and counters."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # every process (including forked ones) must dump own stats on exit
+                self._pid = os.getpid()
+                self._reset()
+                Finalize(None, self.dump, exitpriority=10)
+
+            self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_file(self, filename: str, seconds: float, errors: int) -> None:
+        """Add stats of checked file."""
+        self.add('total', seconds, files=1, errors=errors)
+        item = (seconds, filename)
+        with self._lock:
+            if len(self.slowest_files) < SLOWEST_FILES_COUNT:
+                heapq.heappush(self.slowest_files, item)
+            else:
+                heapq.heappushpop(self.slowest_files, item)
+
+    def dump(self) -> None:
+        """Dump stats of current process."""
+        if not self.timings:
+            return
+        data = {
+            'counters': self.counters,
+            'timings': self.timings,
+            'slowest_files': self.slowest_files,
+        }
+        with suppress(OSError):
+            os.makedirs(self.parts_dir, exist_ok=True)
+            path = os.path.join(self.parts_dir, f'{os.getpid()}-{time.time_ns()}.json')
+            with open(path, 'w') as f:
+                json.dump(data, f)
+        self._reset()
+
+    def merge(self) -> Dict[str, Any]:
+        """Merge stats of all processes into report."""
+        self.dump()
+
+        parts = []
+        with suppress(OSError):
+            for name in os.listdir(self.parts_dir):
+                with suppress(OSError, ValueError), open(os.path.join(self.parts_dir, name)) as f:
+                    parts.append(json.load(f))
+
+        counters: Dict[str, int] = {}
+        timings: Dict[str, float] = {}
+        slowest_files: List[Tuple[float, str]] = []
+        for part in parts:
+            for name, value in part['counters'].items():
+                counters[name] = counters.get(name, 0) + value
+            for name, seconds in part['timings'].items():
+                timings[name] = timings.get(name, 0.0) + seconds
+            slowest_files.extend((seconds, filename) for seconds, filename in part['slowest_files'])
+
+        report = {
+            'processes': len(parts),
+            'counters': counters,
+            'timings': timings,
+            'slowest_files': [
+                {'filename': filename, 'seconds': seconds}
+                for seconds, filename in heapq.nlargest(SLOWEST_FILES_COUNT, slowest_files)
+            ],
+        }
+        with suppress(OSError), open(self.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        self._remove_parts()
+        return report
+
+    def _remove_parts(self) -> None:
+        """Remove dumped stats of processes."""
+        with suppress(OSError):
+            for name in os.listdir(self.parts_dir):
+                with suppress(OSError):
+                    os.remove(os.path.join(self.parts_dir, name))
+            os.rmdir(self.parts_dir)
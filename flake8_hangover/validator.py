@@ -1,122 +1,136 @@
-from queue import LifoQueue
-from token import (
-    DEDENT,
-    INDENT,
-    OP,
-)
 from tokenize import TokenInfo
 from typing import (
+    Any,
+    Callable,
+    Collection,
     Dict,
+    Iterable,
+    Iterator,
     List,
     Optional,
     Tuple,
 )
 
-from .messages import Messages
+from .engine import Engine
+# brackets and parentheses are imported for backward compatibility
+from .index import (  # noqa: F401
+    BRACKETS,
+    FileIndex,
+    Parenthese,
+)
+from .messages import ALL_CODES
+from .prescan import (
+    NoqaIndex,
+    find_multiline_regions,
+)
+from .ranges import LineRanges
+from .rules import (
+    BRACKET_PAIR,
+    get_rules,
+)
+
 
+class IndentValidator(Engine):
+    """Validate close parentheses have the same line indent as open ones.
 
-class Parenthese:
-    """Store full info for single parentheses."""
+    Token events (like pairs of multiline parentheses) are dispatched to all registered
+    rules which check them (see ``rules.Rule``). Line indents and pairs of parentheses
+    are taken from per-file ``index`` shared with visitor (it is built from ``tokens``
+    if it is not passed).
+
+    If ``line_ranges`` are passed, only parentheses pairs overlapping these ranges are
+    checked and only multiline logical lines overlapping these ranges are scanned. Slices
+    of tokens with these logical lines can be passed as ``windows`` if they are already
+    known (see ``prescan.find_multiline_regions``).
+    Only errors with ``codes`` are reported (rules are not used at all if all their
+    codes are disabled), and errors suppressed by ``noqa`` index are not reported.
+    """
 
     def __init__(
         self,
-        line: int,
-        column: int,
-        type: int,
-        open: bool,
-        indent: int = 0,
-        pair: Optional['Parenthese'] = None,
+        tokens: List[TokenInfo],
+        line_ranges: Optional[LineRanges] = None,
+        windows: Optional[List[Tuple[int, int]]] = None,
+        noqa: Optional[NoqaIndex] = None,
+        index: Optional[FileIndex] = None,
+        codes: Collection[str] = ALL_CODES,
     ) -> None:
-        self.line = line
-        self.column = column
-        self.type = type
-        self.open = open
-        self.indent = indent
-        self.pair = pair
-
-    @classmethod
-    def parse_token(
-        cls, token: TokenInfo, indents: Dict[int, int],
-    ) -> Optional['Parenthese']:
-        """Create class instance from token."""
-        if token.type != OP or token.string not in '()[]{}':
-            return None
-        return cls(
-            line=token.start[0],
-            column=token.start[1],
-            type=cls.get_type(token.string),
-            open=token.string in '([{',
-            indent=indents[token.start[0]],
-        )
-
-    @classmethod
-    def get_type(cls, s: str) -> int:
-        """Split tokens by type."""
-        types = {'(': 1, ')': 1, '[': 2, ']': 2, '{': 3, '}': 3}
-        return types.get(s, 0)
-
-    def __repr__(self) -> str:
-        """Object representation."""
-        s = f"{self.line}:{self.column} ({self.indent}) type:{self.type} open:{self.open}"
-        if self.pair:
-            s += f" | pair: <{self.pair.line}:{self.pair.column} ({self.pair.indent})>"
-        return s
+        self.codes = frozenset(codes)
 
+        # token event -> handlers of rules
+        self.rules = [rule(self) for rule in get_rules(self.codes) if rule.token_events]
+        self._handlers: Dict[str, List[Callable[[Any], None]]] = {}
+        for rule in self.rules:
+            for event in rule.token_events:
+                self._handlers.setdefault(event, []).append(getattr(rule, f'on_{event}'))
 
-class IndentValidator:
-    """Validate close parentheses have the same line indent as open ones."""
+        self.reset(tokens, line_ranges, windows, noqa, index)
 
-    def __init__(self, tokens: List[TokenInfo]) -> None:
+    def reset(
+        self,
+        tokens: List[TokenInfo],
+        line_ranges: Optional[LineRanges] = None,
+        windows: Optional[List[Tuple[int, int]]] = None,
+        noqa: Optional[NoqaIndex] = None,
+        index: Optional[FileIndex] = None,
+    ) -> None:
+        """Prepare validator to check another file (rules and their handlers are reused)."""
         self.tokens = tokens
+        self.line_ranges = line_ranges
+        self.windows = windows
+        self.noqa = noqa
+        self.index = index
         self.errors: Dict[Tuple[int, int], str] = {}
+        self.reset_errors()
+        self.tokens_scanned = 0
+        self.brackets_paired = 0
+        for rule in self.rules:
+            rule.reset()
+
+    def get_index(self) -> FileIndex:
+        """Get per-file index of tokens (only logical lines from line ranges are scanned)."""
+        if self.index is None:
+            windows = self.windows
+            if windows is None and self.line_ranges is not None:
+                regions = find_multiline_regions(self.tokens)
+                windows = regions.intersection(self.tokens, self.line_ranges).windows
+            self.index = FileIndex(self.tokens, windows)
+        return self.index
 
     def validate(self) -> None:
-        """Check all parentheses"""
-        indents = self.calculate_indents(self.tokens)
-        parentheses = self.parse_parentheses(self.tokens, indents)
-        for p in parentheses:
-            if not p.open:
-                continue
-            if not p.pair or p.line == p.pair.line:
-                continue
-            if p.indent != p.pair.indent:
-                self.errors[(p.pair.line, p.pair.column)] = Messages.FHG005
+        """Check all parentheses and collect errors to ``errors`` dict."""
+        for lineno, offset, error in self.iter_errors():
+            self.errors.setdefault((lineno, offset), error)
 
-    def calculate_indents(self, tokens: List[TokenInfo]) -> Dict[int, int]:
-        """Calculate the indent for each line in the code."""
-        indents = {}
-        for t in tokens:
-            if t.type in (INDENT, DEDENT):
-                continue
-            line = t.start[0]
-            if line not in indents:
-                indents[line] = t.start[1]
-        return indents
+    def iter_errors(self, segment_ends: Iterable[int] = ()) -> Iterator[Tuple[int, int, str]]:
+        """Check all parentheses and yield errors sorted by position.
 
-    def parse_parentheses(
-        self,
-        tokens: List[TokenInfo],
-        indents: Dict[int, int],
-    ) -> List[Parenthese]:
-        """Parse all parentheses with their positions."""
-        parentheses: List[Parenthese] = []
-        # find all parentheses
-        for t in tokens:
-            p = Parenthese.parse_token(t, indents)
-            if not p:
+        Pairs of brackets never cross top-level statements, so their end lines can be
+        passed as ``segment_ends``: errors of every segment are yielded as soon as all
+        pairs closed in it are checked, and only errors of single segment are kept in
+        memory. Otherwise errors are yielded after whole file is checked. Windows of tokens
+        are scanned only when pairs of previous ones are checked.
+        """
+        handlers = self._handlers.get(BRACKET_PAIR)
+        if not handlers:
+            return
+
+        index = self.get_index()
+        line_ranges = self.line_ranges
+        ends = iter(segment_ends)
+        end = next(ends, None)
+        # windows of tokens are scanned lazily, as pairs closed in them are checked
+        for pair in index.iter_pairs():
+            if line_ranges is not None and not line_ranges.overlaps(pair[0], pair[1]):
                 continue
-            parentheses.append(p)
-        # find pairs for each parentheses
-        queues: Dict[int, LifoQueue] = {1: LifoQueue(), 2: LifoQueue(), 3: LifoQueue()}
-        for p in parentheses:
-            if p.open:
-                queues[p.type].put(p)
-            else:
-                if queues[p.type].empty():
-                    raise ValueError(f"Unexpected close parentheses {p}")
-                p_open = queues[p.type].get()
-                p.pair = p_open
-                p_open.pair = p
-                assert p.open != p_open.open
-                assert p.type == p_open.type
-        return parentheses
+            if end is not None and pair[1] > end:
+                # pairs are ordered by close brackets, so previous segments are checked
+                # and their errors (with positions kept to skip duplicates) are dropped
+                yield from self.flush()
+                while end is not None and pair[1] > end:
+                    end = next(ends, None)
+            for handler in handlers:
+                handler(pair)
+        self.tokens_scanned = index.tokens_scanned
+        self.brackets_paired = index.brackets_paired
+        yield from self.flush()
@@ -0,0 +1,183 @@
+import ast
+from tokenize import TokenInfo
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from .engine import Engine
+from .index import FileIndex
+from .messages import ALL_CODES
+from .prescan import NoqaIndex
+from .ranges import LineRanges
+from .rules import get_rules
+
+
+class Visitor(Engine):
+    """Class for visiting ast nodes.
+
+    Every node is dispatched to all registered rules which check its type (see
+    ``rules.Rule``) during single traversal. Nodes are visited iteratively with explicit
+    stack (so deeply nested expressions can't exceed recursion limit), and their
+    handlers are taken from table by node type.
+    """
+
+    def __init__(
+        self,
+        tokens: List[TokenInfo],
+        line_ranges: Optional[LineRanges] = None,
+        codes: Collection[str] = ALL_CODES,
+        noqa: Optional[NoqaIndex] = None,
+        index: Optional[FileIndex] = None,
+    ) -> None:
+        """Initialize class instance.
+
+        If ``line_ranges`` are passed, only nodes overlapping these ranges are visited.
+        Only errors with ``codes`` are reported, and rules are not used at all if all
+        their codes are disabled. Arguments on lines where errors are suppressed by
+        ``noqa`` index are not checked. Per-file ``index`` of tokens is shared with
+        validator (it is built from ``tokens`` if it is not passed).
+        """
+        self.codes = frozenset(codes)
+
+        # node type -> handlers of rules
+        self.rules = [rule(self) for rule in get_rules(self.codes) if rule.node_types]
+        self._handlers: Dict[Type[ast.AST], List[Callable[[Any], None]]] = {}
+        for rule in self.rules:
+            for node_type in rule.node_types:
+                handler = getattr(rule, f'visit_{node_type.__name__}')
+                self._handlers.setdefault(node_type, []).append(handler)
+
+        self.reset(tokens, line_ranges, noqa, index)
+
+    def reset(
+        self,
+        tokens: List[TokenInfo],
+        line_ranges: Optional[LineRanges] = None,
+        noqa: Optional[NoqaIndex] = None,
+        index: Optional[FileIndex] = None,
+    ) -> None:
+        """Prepare visitor to check another file (rules and their handlers are reused)."""
+        self.errors: Dict[Tuple[int, int], str] = {}
+        self.reset_errors()
+        self.nodes_visited = 0
+        self.calls_checked = 0
+        self.functions_checked = 0
+        self._tokens = tokens
+        self._line_ranges = line_ranges
+        self.noqa = noqa
+        self._index = index
+        for rule in self.rules:
+            rule.reset()
+
+    def visit(self, node: ast.AST) -> None:
+        """Visit node and collect its errors to ``errors`` dict."""
+        self.walk(node)
+        for lineno, offset, error in self.flush():
+            self.errors.setdefault((lineno, offset), error)
+
+    def iter_errors(self, tree: ast.AST) -> Iterator[Tuple[int, int, str]]:
+        """Visit tree and yield errors sorted by position.
+
+        Errors of every top-level statement are yielded as soon as it is visited, so
+        only errors of single statement are kept in memory (statements never share
+        positions of their nodes).
+        """
+        if not isinstance(tree, ast.Module):
+            self.walk(tree)
+            yield from self.flush()
+            return
+
+        self.nodes_visited += 1
+        line_ranges = self._line_ranges
+        for statement in tree.body:
+            if (
+                statement.lineno == statement.end_lineno
+                and not getattr(statement, 'decorator_list', None)
+            ):
+                continue
+            if line_ranges is not None and not self._is_in_line_ranges(statement):
+                continue
+            self.walk(statement)
+            if self._pending:
+                yield from self.flush()
+
+    def walk(self, node: ast.AST) -> None:
+        """Visit node and its child nodes that can contain multiline constructions.
+
+        All rules are checking arguments placed on different lines, so single line nodes
+        are skipped with all their subtrees. Nodes are visited in the same order as
+        recursive visitor does (parent first, then children from first to last).
+        """
+        handlers = self._handlers
+        line_ranges = self._line_ranges
+        is_in_line_ranges = self._is_in_line_ranges
+        stack = [node]
+        nodes_visited = 0
+
+        while stack:
+            node = stack.pop()
+            nodes_visited += 1
+            node_handlers = handlers.get(type(node))
+            if node_handlers is not None:
+                for handler in node_handlers:
+                    handler(node)
+
+            # the same as ``ast.iter_child_nodes`` without single line nodes (their subtrees
+            # can't contain multiline constructions)
+            children = []
+            for field in node._fields:
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    items = value
+                elif isinstance(value, ast.AST):
+                    items = [value]
+                else:
+                    continue
+
+                for child in items:
+                    if not isinstance(child, ast.AST) or not child._fields:
+                        continue
+                    lineno = getattr(child, 'lineno', None)
+                    if (
+                        lineno is not None
+                        and lineno == getattr(child, 'end_lineno', None)
+                        and not getattr(child, 'decorator_list', None)
+                    ):
+                        continue
+                    if line_ranges is not None and not is_in_line_ranges(child):
+                        continue
+                    children.append(child)
+
+            if children:
+                children.reverse()
+                stack.extend(children)
+
+        self.nodes_visited += nodes_visited
+
+    def get_index(self) -> FileIndex:
+        """Get per-file index of tokens."""
+        if self._index is None:
+            self._index = FileIndex(self._tokens)
+        return self._index
+
+    def _is_in_line_ranges(self, node: ast.AST) -> bool:
+        """Check that node overlaps line ranges (if they are set)."""
+        if self._line_ranges is None:
+            return True
+
+        lineno = getattr(node, 'lineno', None)
+        if lineno is None:
+            return True
+
+        decorators = getattr(node, 'decorator_list', None)
+        if decorators:
+            lineno = min(lineno, decorators[0].lineno)
+        return self._line_ranges.overlaps(lineno, getattr(node, 'end_lineno', lineno))
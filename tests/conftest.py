@@ -9,17 +9,67 @@ from flake8_hangover import Plugin
 
 CLASSES_REGISTRY = {}
 
+# class attributes set by ``Plugin.parse_options`` (and engines reused by API)
+PLUGIN_OPTIONS = (
+    'codes',
+    'noqa',
+    'options_key',
+    'cache',
+    'memo',
+    'parallel',
+    'diff_ranges',
+    'stats',
+    'profiler',
+    'visitor',
+    'validator',
+)
+
+
+@pytest.fixture(autouse=True)
+def plugin_options(monkeypatch):
+    """Restore plugin options parsed by tested command line interfaces."""
+    for name in PLUGIN_OPTIONS:
+        monkeypatch.setattr(Plugin, name, getattr(Plugin, name))
+
+
+def tokenize_code(code_str):
+    """Get tokens of code."""
+    return list(generate_tokens(StringIO(code_str).readline))
+
+
+@pytest.fixture
+def get_tokens():
+    """Fixture to get tokens of code."""
+    return tokenize_code
+
 
 @pytest.fixture
 def run_plugin():
-    """Fixture to parse ast from string and run plugin on it."""
-    def wrapper(code_str, strip_tabs: Optional[int] = None):
+    """Fixture to parse ast from string and run plugin on it.
+
+    Results are returned without plugin type. Source ``lines`` are passed to plugin
+    (as flake8 does) if they are enabled, and ``# noqa`` index is used if ``noqa`` is
+    set (plugin option is used by default).
+    """
+    def wrapper(
+        code_str,
+        strip_tabs: Optional[int] = None,
+        lines: bool = False,
+        filename: str = 'stdin',
+        noqa: Optional[bool] = None,
+    ):
         if strip_tabs:
             tabs = strip_tabs * 4
             code_str = '\n'.join([line[tabs:] for line in code_str.strip('\n').split('\n')])
-        tree = ast.parse(code_str)
-        tokens = list(generate_tokens(StringIO(code_str).readline))
-        return {'{}:{}: {}'.format(*r) for r in Plugin(tree=tree, file_tokens=tokens).run()}
+        plugin = Plugin(
+            tree=ast.parse(code_str),
+            file_tokens=tokenize_code(code_str),
+            lines=code_str.splitlines(keepends=True) if lines else None,
+            filename=filename,
+        )
+        if noqa is not None:
+            plugin.noqa = noqa
+        return [r[:3] for r in plugin.run()]
     return wrapper
 
 
@@ -45,7 +95,10 @@ def check_registered_case(
     name = case_name or case.__name__
     code = case_code or case.code
     expected_errors = sorted(case.errors or [])
-    found_errors = sorted(list(run_plugin(code, strip_tabs=1)), key=lambda s: s.split(': ', 1)[1])
+    found_errors = sorted(
+        {'{}:{}: {}'.format(*r) for r in run_plugin(code, strip_tabs=1)},
+        key=lambda s: s.split(': ', 1)[1],
+    )
 
     def show_error(found, expected):
         if isinstance(found, list):
@@ -0,0 +1,220 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from flake8_hangover import aio
+from flake8_hangover.aio import AsyncChecker
+from flake8_hangover.api import (
+    Source,
+    check_source,
+)
+from flake8_hangover.memo import StatementMemo
+from flake8_hangover.plugin import Plugin
+
+CODE = '''
+result = func(param,
+              other)
+'''
+
+
+@pytest.fixture
+def slow_checks(monkeypatch):
+    """Make checks slow and collect max number of simultaneous checks."""
+    state = {'active': 0, 'max_active': 0, 'started': []}
+    lock = threading.Lock()
+    check_in_worker = aio.check_in_worker
+
+    def slow_check(source, *args):
+        with lock:
+            state['active'] += 1
+            state['max_active'] = max(state['max_active'], state['active'])
+            state['started'].append(source)
+        time.sleep(0.02)
+        with lock:
+            state['active'] -= 1
+        return check_in_worker(source, *args)
+
+    monkeypatch.setattr(aio, 'check_in_worker', slow_check)
+    return state
+
+
+def run(coro):
+    """Run coroutine in new event loop."""
+    return asyncio.run(coro)
+
+
+async def collect(stream):
+    """Collect items of async iterator."""
+    return [item async for item in stream]
+
+
+def test_check():
+    """Test results are the same as results of sync API."""
+    async def main():
+        async with AsyncChecker() as checker:
+            return (
+                await checker.check(CODE),
+                [d async for d in checker.iter_check(CODE.encode(), filename='a.py')],
+            )
+
+    assert run(main()) == (check_source(CODE), check_source(CODE))
+
+
+def test_check_concurrency_limit(slow_checks):
+    """Test number of simultaneous checks is limited."""
+    async def main():
+        async with AsyncChecker(max_concurrency=2) as checker:
+            return await asyncio.gather(*(checker.check(CODE) for _ in range(8)))
+
+    assert run(main()) == [check_source(CODE)] * 8
+    assert slow_checks['max_active'] == 2
+
+
+def test_check_cancel(slow_checks):
+    """Test cancelled checks are not run and slot is released after running check."""
+    async def main():
+        checker = AsyncChecker(max_concurrency=1)
+        running = asyncio.ensure_future(checker.check('running = 1\n'))
+        waiting = asyncio.ensure_future(checker.check('waiting = 1\n'))
+        while not slow_checks['started']:
+            await asyncio.sleep(0.001)
+        running.cancel()
+        waiting.cancel()
+        # slot is free only when running check is finished in executor
+        result = await checker.check(CODE)
+        checker.close()
+        return running.cancelled() and waiting.cancelled(), result
+
+    assert run(main()) == (True, check_source(CODE))
+    assert slow_checks['started'] == ['running = 1\n', CODE]
+    assert slow_checks['max_active'] == 1
+
+
+def test_check_many(slow_checks):
+    """Test sources are taken lazily and results are streamed."""
+    taken = []
+
+    def sources():
+        for i in range(10):
+            taken.append(i)
+            yield Source(CODE, filename=f'{i}.py') if i % 2 else 'x = 1\n'
+
+    async def main():
+        async with AsyncChecker(max_concurrency=3) as checker:
+            results = {}
+            async for index, diagnostics in checker.check_many(sources()):
+                assert len(taken) <= len(results) + 3
+                results[index] = diagnostics
+            return results
+
+    results = run(main())
+    assert sorted(results) == list(range(10))
+    assert all(results[i] == (check_source(CODE) if i % 2 else []) for i in range(10))
+    assert slow_checks['max_active'] <= 3
+
+
+def test_check_many_stop(slow_checks):
+    """Test not finished checks are cancelled when iteration is stopped."""
+    async def main():
+        async with AsyncChecker(max_concurrency=2) as checker:
+            stream = checker.check_many([f'x{i} = 1\n' for i in range(10)])
+            async for _ in stream:
+                break
+            await stream.aclose()
+            await asyncio.sleep(0.05)
+
+    run(main())
+    assert len(slow_checks['started']) <= 3
+
+
+def test_check_process_pool():
+    """Test checks in process pool."""
+    async def main():
+        with ProcessPoolExecutor(1) as executor:
+            checker = AsyncChecker(executor, max_concurrency=2)
+            return await asyncio.gather(
+                checker.check(CODE),
+                checker.check('x = 1\n'),
+                collect(checker.iter_check(CODE)),
+            )
+
+    assert run(main()) == [check_source(CODE), [], check_source(CODE)]
+
+
+def test_max_concurrency():
+    """Test max concurrency must be positive."""
+    with pytest.raises(ValueError):
+        AsyncChecker(max_concurrency=0)
+
+
+def test_checks_in_threads(monkeypatch):
+    """Test checks run in several threads at once, and every thread has own checker."""
+    state = {'active': 0, 'max_active': 0, 'checkers': {}}
+    lock = threading.Lock()
+    check = aio.Checker.check
+
+    def slow_check(self, *args, **kwargs):
+        with lock:
+            state['active'] += 1
+            state['max_active'] = max(state['max_active'], state['active'])
+            state['checkers'].setdefault(threading.get_ident(), set()).add(id(self))
+        time.sleep(0.01)
+        with lock:
+            state['active'] -= 1
+        return check(self, *args, **kwargs)
+
+    monkeypatch.setattr(aio.Checker, 'check', slow_check)
+    monkeypatch.setattr(Plugin, 'memo', StatementMemo(10))
+    sources = [CODE.replace('func', f'func_{i}') for i in range(20)]
+
+    async def main():
+        async with AsyncChecker(max_concurrency=4) as checker:
+            return await asyncio.gather(*[checker.check(source) for source in sources])
+
+    results = run(main())
+    checkers = list(state['checkers'].values())
+    assert state['max_active'] > 1
+    assert all(len(ids) == 1 for ids in checkers)
+    assert len(set.union(*checkers)) == len(checkers)
+    assert results == [check_source(source) for source in sources]
+
+
+def test_iter_check_streams(monkeypatch):
+    """Test errors are yielded while source is still checked."""
+    consumed = threading.Event()
+    iter_check = aio.Checker.iter_check
+
+    def paused_iter_check(self, *args, **kwargs):
+        diagnostics = iter_check(self, *args, **kwargs)
+        yield next(diagnostics)
+        assert consumed.wait(5)  # the first error is consumed before the rest is checked
+        yield from diagnostics
+
+    monkeypatch.setattr(aio.Checker, 'iter_check', paused_iter_check)
+
+    async def main():
+        async with AsyncChecker() as checker:
+            diagnostics = []
+            async for diagnostic in checker.iter_check(CODE * 3):
+                diagnostics.append(diagnostic)
+                consumed.set()
+            return diagnostics
+
+    assert run(main()) == check_source(CODE * 3)
+
+
+def test_iter_check_stop():
+    """Test check is stopped when iteration is stopped."""
+    async def main():
+        async with AsyncChecker(max_concurrency=1) as checker:
+            stream = checker.iter_check(CODE * 100)
+            async for _ in stream:
+                break
+            await stream.aclose()
+            # slot is released when check is stopped
+            return await asyncio.wait_for(checker.check(CODE), 5)
+
+    assert run(main()) == check_source(CODE)
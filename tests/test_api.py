@@ -0,0 +1,112 @@
+import ast
+import tokenize
+from io import StringIO
+
+import pytest
+
+import flake8_hangover
+from flake8_hangover import api
+from flake8_hangover.api import (
+    Checker,
+    Diagnostic,
+    Source,
+    check_many,
+    check_source,
+)
+from flake8_hangover.visitor import Visitor
+
+CODE = '''
+result = func(param,
+              other)
+'''
+
+ERRORS = [
+    Diagnostic(3, 15, 'FHG002', 'Function call positional argument has hanging indentation'),
+    Diagnostic(3, 20, 'FHG005', 'Close bracket have different indentation with open bracket'),
+]
+
+
+def test_check_source():
+    """Test errors of source."""
+    assert check_source(CODE) == ERRORS
+    assert check_source('x = 1\n') == []
+    assert str(ERRORS[0]) == f'3:15: FHG002 {ERRORS[0].message}'
+
+
+def test_check_source_bytes():
+    """Test source bytes are decoded with encoding from cookie."""
+    code = '# -*- coding: latin-1 -*-\nresult = func(param,  # é\n              other)\n'
+    assert [d.code for d in check_source(code.encode('latin-1'))] == ['FHG002', 'FHG005']
+
+
+@pytest.mark.parametrize('newline', ['\r\n', '\r'])
+def test_check_source_newlines(newline):
+    """Test line numbers of source with any newlines."""
+    code = '# \x0c form feed\n' + CODE
+    expected = [d._replace(line=d.line + 1) for d in ERRORS]
+    assert check_source(code.replace('\n', newline)) == expected
+
+
+def test_check_source_reuses_tree_and_tokens(monkeypatch):
+    """Test passed tree and tokens are not built again."""
+    tree = ast.parse(CODE)
+    tokens = list(tokenize.generate_tokens(StringIO(CODE).readline))
+
+    def fail(*args, **kwargs):
+        raise AssertionError('Source must not be parsed')
+
+    monkeypatch.setattr(api.ast, 'parse', fail)
+    monkeypatch.setattr(api.tokenize, 'generate_tokens', fail)
+    assert check_source(CODE, tree=tree, tokens=tokens) == ERRORS
+
+
+def test_check_source_invalid():
+    """Test errors of invalid sources."""
+    assert [d.code for d in check_source('def foo(:\n')] == ['E999']
+    assert [d.code for d in check_source(b'# coding: unknown\nx = 1\n')] == ['E902']
+    assert [d.code for d in check_source(b'x = "\xff"\n')] == ['E902']
+
+
+def test_check_many(monkeypatch):
+    """Test sources are checked in order with the same visitor."""
+    created = []
+    init = Visitor.__init__
+
+    def count_init(self, *args, **kwargs):
+        created.append(self)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(Visitor, '__init__', count_init)
+    tree = ast.parse(CODE)
+    results = list(check_many([
+        CODE,
+        'x = 1\n',
+        Source(CODE.encode(), tree=tree, filename='module.py'),
+        'def foo(:\n',
+        CODE.replace('func', 'f.g(x).h'),
+    ]))
+    assert results[:3] == [ERRORS, [], ERRORS]
+    assert [d.code for d in results[3]] == ['E999']
+    assert [(d.line, d.column) for d in results[4]] == [(3, 15), (3, 20)]
+    assert len(created) == 1
+
+
+def test_iter_check():
+    """Test errors of interleaved checks are not mixed (their engines are not shared)."""
+    checker = Checker()
+    checker.check(CODE)  # engines are created
+    first = checker.iter_check(CODE * 2)
+    second = checker.iter_check('x = 1\n' + CODE)
+    assert next(first) == ERRORS[0]
+    assert list(second) == [d._replace(line=d.line + 1) for d in ERRORS]
+    assert list(first) == [
+        ERRORS[1],
+        *(d._replace(line=d.line + 3) for d in ERRORS),
+    ]
+
+
+def test_lazy_api_names():
+    """Test API is available from package."""
+    assert flake8_hangover.check_source is check_source
+    with pytest.raises(AttributeError):
+        flake8_hangover.unknown_name
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from flake8_hangover.cache import ResultCache
+from flake8_hangover.plugin import (
+    Messages,
+    Plugin,
+)
+
+CODE = '''
+result = func(param,
+              other)
+'''
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Enable plugin cache in temporary directory."""
+    cache = ResultCache(str(tmp_path / 'cache'), max_entries=10)
+    monkeypatch.setattr(Plugin, 'cache', cache)
+    return cache
+
+
+def test_cache_skips_check_for_unchanged_file(cache, monkeypatch, run_plugin):
+    """Test second run of plugin uses cached results."""
+    results = run_plugin(CODE, lines=True)
+    assert [msg for _, _, msg in results] == [Messages.FHG002, Messages.FHG005]
+
+    def check(self):
+        raise AssertionError('File must not be checked')
+
+    monkeypatch.setattr(Plugin, 'check', check)
+    assert run_plugin(CODE, lines=True) == results
+
+
+def test_cache_checks_changed_file(cache, run_plugin):
+    """Test changed file is checked again."""
+    assert len(run_plugin(CODE, lines=True)) == 2
+    assert run_plugin(CODE.replace('              other', '    other,\n'), lines=True) == []
+
+
+def test_cache_broken_entry(cache, run_plugin):
+    """Test broken cache entry is treated as cache miss."""
+    results = run_plugin(CODE, lines=True)
+    for name in os.listdir(cache.directory):
+        with open(os.path.join(cache.directory, name), 'w') as f:
+            f.write('{broken')
+    assert run_plugin(CODE, lines=True) == results
+
+
+def test_cache_eviction(cache):
+    """Test least recently used entries are removed."""
+    keys = [cache.make_key([f'x = {i}\n']) for i in range(15)]
+    for i, key in enumerate(keys):
+        cache.set(key, [(i, 0, 'message')])
+        os.utime(cache._get_path(key), (i, i))
+
+    remaining = [key for key in keys if cache.get(key) is not None]
+    assert len(remaining) <= cache.max_entries
+    assert remaining == keys[-len(remaining):]
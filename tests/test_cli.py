@@ -0,0 +1,152 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from flake8_hangover import api
+from flake8_hangover.cli import (
+    get_parser,
+    main,
+)
+from flake8_hangover.plugin import Messages
+from flake8_hangover.scanner import SCANNER_SUPPORTED
+
+BAD_CODE = '''
+result = func(param,
+              other)
+'''
+
+GOOD_CODE = '''
+result = func(
+    param,
+    other,
+)
+'''
+
+NOQA_CODE = '''x = func(
+    a,
+      b)  # noqa: FHG002
+y = [
+    1,
+         2]  # noqa
+z = (
+    1,
+         2)
+w = func(a,
+      b)  # noqa: E501
+'''
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Create directory with python files."""
+    for i in range(10):
+        (tmp_path / f'bad_{i}.py').write_text(BAD_CODE)
+        (tmp_path / f'good_{i}.py').write_text(GOOD_CODE)
+    (tmp_path / '.git').mkdir()
+    (tmp_path / '.git' / 'excluded.py').write_text(BAD_CODE)
+    return tmp_path
+
+
+@pytest.mark.parametrize('jobs', ['1', '3'])
+def test_cli(files, capsys, jobs):
+    """Test command line interface output in flake8 format."""
+    assert main(['--jobs', jobs, '--chunk-size', '2', str(files)]) == 1
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 20
+    assert output[:2] == [
+        f'{files / "bad_0.py"}:3:15: {Messages.FHG002}',
+        f'{files / "bad_0.py"}:3:20: {Messages.FHG005}',
+    ]
+
+
+def test_cli_no_errors(files, capsys):
+    """Test command line interface exit code without errors."""
+    assert main([str(files / 'good_0.py'), str(files / 'good_1.py')]) == 0
+    assert capsys.readouterr().out == ''
+
+
+def test_cli_syntax_error(tmp_path, capsys):
+    """Test command line interface on file with syntax error."""
+    (tmp_path / 'broken.py').write_text('def foo(:\n')
+    assert main([str(tmp_path / 'broken.py')]) == 1
+    assert ': E999 SyntaxError: ' in capsys.readouterr().out
+
+
+def run_flake8(tmp_path, *args):
+    """Run flake8 with plugin from sources and return its output lines."""
+    config = tmp_path / 'flake8.cfg'
+    config.write_text(
+        f'[flake8:local-plugins]\nextension =\n    FHG = flake8_hangover:Plugin\npaths = {ROOT}\n',
+    )
+    process = subprocess.run(
+        [sys.executable, '-m', 'flake8', '--config', str(config), '--select', 'FHG', *args],
+        cwd=str(tmp_path),
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    return process.stdout.splitlines()
+
+
+@pytest.mark.parametrize('args', [[], ['--disable-noqa']])
+def test_cli_noqa(tmp_path, capsys, monkeypatch, args):
+    """Test errors on lines with ``# noqa`` comments are filtered as flake8 does."""
+    (tmp_path / 'noqa.py').write_text(NOQA_CODE)
+    expected = run_flake8(tmp_path, *args, 'noqa.py')
+    assert len(expected) == (6 if args else 4)
+
+    monkeypatch.chdir(tmp_path)
+    main([*args, 'noqa.py'])
+    assert capsys.readouterr().out.splitlines() == expected
+
+
+@pytest.mark.parametrize('args', [
+    ['--select', 'FHG005'],
+    ['--ignore', 'FHG002'],
+    ['--select', 'FHG00', '--ignore', 'FHG0'],
+    ['--select', 'FHG0', '--ignore', 'FHG00', '--extend-select', 'FHG005'],
+    ['--extend-ignore', 'FHG001,FHG002'],
+])
+def test_cli_selection(tmp_path, capsys, monkeypatch, args):
+    """Test codes are selected as flake8 does (without flake8)."""
+    (tmp_path / 'bad.py').write_text(NOQA_CODE + BAD_CODE)
+    expected = run_flake8(tmp_path, '--disable-noqa', *args, 'bad.py')
+    assert expected
+
+    # flake8 can't be used to select codes
+    monkeypatch.setitem(sys.modules, 'flake8.style_guide', None)
+    monkeypatch.chdir(tmp_path)
+    main(['--disable-noqa', *args, 'bad.py'])
+    assert capsys.readouterr().out.splitlines() == expected
+
+
+@pytest.mark.skipif(not SCANNER_SUPPORTED, reason='scanner is not used')
+def test_cli_scanner(tmp_path, capsys, monkeypatch):
+    """Test sources are not tokenized if only rules of brackets are selected."""
+    (tmp_path / 'noqa.py').write_text(NOQA_CODE)
+    expected = run_flake8(tmp_path, '--select', 'FHG005', 'noqa.py')
+    assert len(expected) == 3
+
+    monkeypatch.setattr(api.tokenize, 'generate_tokens', None)
+    monkeypatch.chdir(tmp_path)
+    main(['--select', 'FHG005', 'noqa.py'])
+    assert capsys.readouterr().out.splitlines() == expected
+
+
+def test_cli_config(tmp_path, monkeypatch):
+    """Test options are read from flake8 config in parent directory."""
+    (tmp_path / 'tox.ini').write_text('[tox]\nenvlist = py38\n')
+    (tmp_path / 'setup.cfg').write_text(
+        '[flake8]\nmax-line-length = 100\nselect = FHG001,\n  FHG005\nhangover-memo-size = 5\n',
+    )
+    (tmp_path / 'src').mkdir()
+    monkeypatch.chdir(tmp_path / 'src')
+
+    options = get_parser().parse_args([])
+    assert (options.select, options.hangover_memo_size) == (['FHG001', 'FHG005'], 5)
+    assert not hasattr(options, 'max_line_length')
+    options = get_parser().parse_args(['--select', 'FHG002', '--hangover-memo-size', '1'])
+    assert (options.select, options.hangover_memo_size) == (['FHG002'], 1)
@@ -0,0 +1,136 @@
+import io
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from flake8_hangover import daemon
+from flake8_hangover.plugin import (
+    Messages,
+    Plugin,
+)
+
+from .test_cli import NOQA_CODE
+
+BAD_CODE = '''
+result = func(param,
+              other)
+'''
+
+
+@pytest.fixture
+def socket_path(tmp_path_factory):
+    """Path of socket (in short directory, as length of socket path is limited)."""
+    return str(tmp_path_factory.mktemp('daemon') / 'hangover.sock')
+
+
+@pytest.fixture
+def server(socket_path):
+    """Run daemon in thread."""
+    server = daemon.create_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01})
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_daemon_paths_and_sources(server, socket_path, tmp_path):
+    """Test files and sources are checked by daemon."""
+    path = tmp_path / 'bad.py'
+    path.write_text(BAD_CODE)
+    responses = list(daemon.send_requests(socket_path, [
+        {'path': str(path)},
+        {'path': 'buffer.py', 'source': BAD_CODE.replace('func', 'f')},
+        {'path': 'good.py', 'source': 'x = 1\n'},
+        {'path': 'broken.py', 'source': 'def foo(:\n'},
+    ]))
+    assert responses[:3] == [
+        {'path': str(path), 'errors': [[3, 15, Messages.FHG002], [3, 20, Messages.FHG005]]},
+        {'path': 'buffer.py', 'errors': [[3, 15, Messages.FHG002], [3, 20, Messages.FHG005]]},
+        {'path': 'good.py', 'errors': []},
+    ]
+    assert [message[:4] for _, _, message in responses[3]['errors']] == ['E999']
+    assert server.files_checked == 4
+
+
+@pytest.mark.parametrize('request_line', [
+    b'not json\n',
+    b'[]\n',
+    b'{"source": "x = 1"}\n',
+    b'{"path": 1}\n',
+])
+def test_daemon_invalid_request(server, socket_path, request_line):
+    """Test invalid request is answered with error and connection is kept."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        with sock.makefile('rwb') as f:
+            f.write(request_line + b'{"path": "a.py", "source": "x = 1"}\n')
+            f.flush()
+            assert json.loads(f.readline())['error'].startswith('Invalid request')
+            assert json.loads(f.readline()) == {'path': 'a.py', 'errors': []}
+
+
+def test_daemon_concurrent_clients(server, socket_path):
+    """Test several clients are served at once."""
+    def run_client(i):
+        requests = [{'path': f'{i}_{j}.py', 'source': BAD_CODE} for j in range(20)]
+        return list(daemon.send_requests(socket_path, requests))
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(run_client, range(8)))
+    assert all(len(response['errors']) == 2 for responses in results for response in responses)
+    assert server.files_checked == 160
+
+
+def test_daemon_check_command(server, socket_path, tmp_path, monkeypatch, capsys):
+    """Test client command output in flake8 format."""
+    (tmp_path / 'bad.py').write_text(BAD_CODE)
+    monkeypatch.setattr('sys.stdin', io.StringIO(BAD_CODE))
+    monkeypatch.chdir(tmp_path)
+    args = ['check', '--socket', socket_path, '--stdin-filename', 'buffer.py', 'bad.py', '-']
+    assert daemon.main(args) == 1
+    assert capsys.readouterr().out.splitlines() == [
+        f'bad.py:3:15: {Messages.FHG002}',
+        f'bad.py:3:20: {Messages.FHG005}',
+        f'buffer.py:3:15: {Messages.FHG002}',
+        f'buffer.py:3:20: {Messages.FHG005}',
+    ]
+
+
+@pytest.mark.parametrize(('args', 'expected'), [
+    ([], [(3, 8), (9, 11), (11, 7), (11, 8)]),
+    (['--disable-noqa'], [(3, 7), (3, 8), (6, 11), (9, 11), (11, 7), (11, 8)]),
+])
+def test_daemon_noqa(server, socket_path, args, expected):
+    """Test errors on lines with ``# noqa`` comments are filtered as flake8 does."""
+    Plugin.parse_options(daemon.get_parser().parse_args(['serve', '--socket', socket_path, *args]))
+    [response] = daemon.send_requests(socket_path, [{'path': 'noqa.py', 'source': NOQA_CODE}])
+    assert [(row, col) for row, col, _ in response['errors']] == expected
+
+
+def test_daemon_is_not_available(socket_path, capsys):
+    """Test client command without running daemon."""
+    assert daemon.main(['check', '--socket', socket_path, 'bad.py']) == 2
+    assert 'Daemon is not available' in capsys.readouterr().err
+
+
+def test_daemon_socket_exists(server, socket_path, tmp_path):
+    """Test daemon is not started on socket of running daemon or on other file."""
+    with pytest.raises(FileExistsError, match='already running'):
+        daemon.create_server(socket_path)
+
+    (tmp_path / 'file').write_text('')
+    with pytest.raises(FileExistsError, match='not a socket'):
+        daemon.create_server(str(tmp_path / 'file'))
+
+
+def test_daemon_removes_stale_socket(socket_path):
+    """Test socket left by stopped daemon is replaced."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(socket_path)
+    server = daemon.create_server(socket_path)
+    server.server_close()
@@ -0,0 +1,141 @@
+import ast
+from argparse import Namespace
+from io import StringIO
+from tokenize import generate_tokens
+
+import pytest
+
+from flake8_hangover.diff import (
+    STDIN_DIFF_ENV_VAR,
+    normalize_path,
+    parse_unified_diff,
+)
+from flake8_hangover.plugin import (
+    Messages,
+    Plugin,
+)
+from flake8_hangover.ranges import LineRanges
+
+CODE = '''
+first = func(param,
+             other)
+
+
+def foo():
+    second = func(param,
+        other)
+    third = [
+        1,
+        2]
+'''
+
+DIFF = '''diff --git a/module.py b/module.py
+index 1111111..2222222 100644
+--- a/module.py
++++ b/module.py
+@@ -5,3 +5,4 @@ first = func(param,
+\x20
+ def foo():
+-    second = func(param, other)
++    second = func(param,
++        other)
+@@ -8,2 +9,3 @@ def foo():
+     third = [
++        1,
+         2]
+--- a/removed.py
++++ /dev/null
+@@ -1 +0,0 @@
+-x = 1
+'''
+
+
+def test_parse_unified_diff():
+    """Test changed lines are parsed from unified diff."""
+    changes = parse_unified_diff(DIFF)
+    assert list(changes) == [normalize_path('module.py')]
+    assert list(changes[normalize_path('module.py')]) == [(6, 8), (10, 10)]
+
+
+@pytest.mark.parametrize(('hunk', 'expected'), [
+    ('@@ -5,2 +4,0 @@\n-    a,\n-    b,\n', [(4, 5)]),
+    ('@@ -1 +0,0 @@\n-import os\n', [(1, 1)]),
+    ('@@ -3 +2,0 @@ def foo():\n-    pass\n@@ -8,0 +8,1 @@\n+x = 1\n', [(2, 3), (8, 8)]),
+])
+def test_parse_unified_diff_without_context(hunk, expected):
+    """Test lines around removed ones are changed in diff without context (``-U0``)."""
+    changes = parse_unified_diff(f'--- a/module.py\n+++ b/module.py\n{hunk}')
+    assert list(changes[normalize_path('module.py')]) == expected
+
+
+@pytest.mark.parametrize('ranges, expected', [
+    ([(1, 1), (5, 7)], [(1, 1), (5, 7)]),
+    ([(5, 7), (1, 5)], [(1, 7)]),
+    ([(1, 2), (3, 4)], [(1, 4)]),
+])
+def test_line_ranges(ranges, expected):
+    """Test line ranges are sorted and merged."""
+    assert list(LineRanges(ranges)) == expected
+
+
+@pytest.mark.parametrize('start, end, overlaps', [
+    (1, 2, False),
+    (2, 3, True),
+    (6, 6, True),
+    (8, 9, False),
+    (9, 12, True),
+])
+def test_line_ranges_overlaps(start, end, overlaps):
+    """Test line ranges overlapping."""
+    assert LineRanges([(3, 4), (6, 7), (10, 10)]).overlaps(start, end) is overlaps
+
+
+def test_plugin_checks_only_changed_lines(monkeypatch):
+    """Test plugin reports errors only for nodes and brackets in changed lines."""
+    monkeypatch.setattr(Plugin, 'diff_ranges', parse_unified_diff(DIFF))
+    tree = ast.parse(CODE)
+    tokens = list(generate_tokens(StringIO(CODE).readline))
+
+    plugin = Plugin(tree=tree, file_tokens=tokens, filename='./module.py')
+    assert sorted(r[:3] for r in plugin.run()) == [
+        (8, 13, Messages.FHG005),
+        (11, 9, Messages.FHG005),
+    ]
+
+    plugin = Plugin(tree=tree, file_tokens=tokens, filename='other.py')
+    assert list(plugin.run()) == []
+
+
+@pytest.mark.parametrize('first, second, expected', [
+    ([(1, 5), (10, 20)], [(3, 12)], [(3, 5), (10, 12)]),
+    ([(1, 5)], [(6, 7)], []),
+    ([(1, 5), (7, 8)], [(1, 1), (5, 7)], [(1, 1), (5, 5), (7, 7)]),
+])
+def test_line_ranges_intersection(first, second, expected):
+    """Test intersection of line ranges."""
+    assert list(LineRanges(first).intersection(LineRanges(second))) == expected
+    assert list(LineRanges(second).intersection(LineRanges(first))) == expected
+
+
+def test_stdin_diff_in_spawned_worker(monkeypatch):
+    """Test spawned worker (with empty stdin) gets diff read from stdin by main process."""
+    monkeypatch.setenv(STDIN_DIFF_ENV_VAR, '')  # restored after test
+    monkeypatch.setattr('sys.stdin', StringIO(DIFF))
+    Plugin.parse_options(Namespace(hangover_diff='-'))
+    expected = {path: list(ranges) for path, ranges in parse_unified_diff(DIFF).items()}
+    assert {path: list(ranges) for path, ranges in Plugin.diff_ranges.items()} == expected
+
+    # worker parses options again
+    monkeypatch.setattr('sys.stdin', StringIO(''))
+    monkeypatch.setattr('multiprocessing.parent_process', lambda: object())
+    Plugin.diff_ranges = None
+    Plugin.parse_options(Namespace(hangover_diff='-'))
+    assert {path: list(ranges) for path, ranges in Plugin.diff_ranges.items()} == expected
+
+
+def test_stdin_diff_not_read_by_main_process(monkeypatch):
+    """Test worker fails if diff from stdin is not passed by main process."""
+    monkeypatch.setenv(STDIN_DIFF_ENV_VAR, '')  # restored after test
+    monkeypatch.setattr('multiprocessing.parent_process', lambda: object())
+    with pytest.raises(RuntimeError):
+        Plugin.parse_options(Namespace(hangover_diff='-'))
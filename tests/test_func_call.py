@@ -458,6 +458,16 @@ class Case38:
     """
 
 
+@register_case
+class Case39:
+    errors = [Messages.FHG002, Messages.FHG005]
+    code = """
+    @decorator(param,
+               other)
+    def foo(): pass
+    """
+
+
 @pytest.mark.parametrize('case', CLASSES_REGISTRY[__name__].values())
 def test_plugin_on_func_call(run_plugin, case):
     """Test plugin on function calls."""
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+# modules already imported by flake8 before plugin is loaded
+PRELOADED_MODULES = 'ast, tokenize'
+# import time of plugin (with all its modules) relative to import time of preloaded modules
+IMPORT_TIME_RATIO = 0.25
+
+
+def run_python(code, tmp_path, *options):
+    """Run python code in subprocess (with bytecode cache in temporary directory)."""
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(tmp_path))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return subprocess.run(
+        [sys.executable, *options, '-c', code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_modules(tmp_path):
+    """Test only required modules are imported with plugin."""
+    result = run_python(
+        f'import sys, {PRELOADED_MODULES}\n'
+        'before = set(sys.modules)\n'
+        'import flake8_hangover\n'
+        'print(sorted(set(sys.modules) - before))\n',
+        tmp_path,
+    )
+    assert result.stdout.strip() == str([
+        '__future__',
+        'flake8_hangover',
+        'flake8_hangover.__version__',
+        'flake8_hangover.messages',
+        'flake8_hangover.plugin',
+    ])
+
+
+def get_import_times(stderr):
+    """Get cumulative import times (in microseconds) of top-level imports from report."""
+    times = {}
+    for line in stderr.splitlines():
+        _, cumulative, name = line.split('|')
+        # nested imports are indented
+        if cumulative.strip().isdigit() and not name.startswith('  '):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time(tmp_path):
+    """Test plugin is imported fast comparing to modules imported by flake8 anyway."""
+    code = f'import {PRELOADED_MODULES}; import flake8_hangover'
+    run_python(code, tmp_path)  # bytecode is cached
+
+    ratios = []
+    for _ in range(5):
+        times = get_import_times(run_python(code, tmp_path, '-X', 'importtime').stderr)
+        baseline = sum(times[name] for name in PRELOADED_MODULES.split(', '))
+        ratios.append(times['flake8_hangover'] / baseline)
+    assert min(ratios) < IMPORT_TIME_RATIO
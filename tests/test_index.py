@@ -0,0 +1,73 @@
+import ast
+
+import pytest
+
+from flake8_hangover.index import (
+    BracketPair,
+    FileIndex,
+)
+from flake8_hangover.ranges import LineRanges
+from flake8_hangover.validator import IndentValidator
+from flake8_hangover.visitor import Visitor
+
+
+def test_brackets_and_indents(get_tokens):
+    """Test only multiline bracket pairs and line indents are collected."""
+    code = 'x = [(1, 2),\n    {\n        3: 4}]\nif x:\n    y = f(\n        z)\n'
+    index = FileIndex(get_tokens(code))
+    index.scan()
+    assert index.pairs == [BracketPair(2, 3, 12), BracketPair(1, 3, 13), BracketPair(5, 6, 9)]
+    assert index.line_indents == {1: 0, 2: 4, 3: 8, 5: 4, 6: 8}
+    assert index.brackets_paired == 4
+
+
+def test_index_scanned_once(get_tokens):
+    """Test index shared by several validators scans tokens only once."""
+    code = 'x = f(\n    a)\n'
+    tokens = get_tokens(code)
+    index = FileIndex(tokens)
+    for _ in range(2):
+        validator = IndentValidator(tokens, index=index)
+        validator.validate()
+        assert validator.tokens_scanned == len(tokens)
+        assert list(validator.errors) == [(2, 5)]
+
+
+def test_validator_line_ranges(get_tokens):
+    """Test only logical lines overlapping line ranges are scanned without windows."""
+    code = 'x = f(\n    a)\ny = 1\nz = [\n    1,\n  ]\n'
+    tokens = get_tokens(code)
+    validator = IndentValidator(tokens, line_ranges=LineRanges([(5, 5)]))
+    validator.validate()
+    assert list(validator.errors) == [(6, 2)]
+    assert validator.tokens_scanned < len(tokens) / 2
+
+
+@pytest.mark.parametrize('code, expected', [
+    ('f(key=value)', (1, 2)),
+    ('f(a, key = value)', (1, 5)),
+    ('f(\n    key=\n        value,\n)', (2, 4)),
+    ('f(key=(\n    value))', (1, 2)),
+    ('f(**kwargs)', (1, 2)),
+    ('f(a, ** kwargs)', (1, 5)),
+    ('f(**(\n    kwargs))', (1, 2)),
+    ('f(key=  # comment\n    value)', (1, 2)),
+])
+def test_find_keyword(code, expected, get_tokens):
+    """Test position of keyword argument is found by position of its value."""
+    value = ast.parse(code).body[0].value.keywords[0].value
+    assert FileIndex(get_tokens(code)).find_keyword(value.lineno, value.col_offset) == expected
+
+
+def test_find_keyword_not_found(get_tokens):
+    """Test keyword is not found if value is not keyword argument."""
+    assert FileIndex(get_tokens('f(a)')).find_keyword(1, 2) is None
+    assert FileIndex([]).find_keyword(1, 2) is None
+
+
+def test_keyword_exact_position(get_tokens):
+    """Test exact position of keyword argument is used for checks."""
+    code = 'result = func(\n    key = 1,\n    **kwargs,\n)\n'
+    visitor = Visitor(tokens=get_tokens(code))
+    visitor.visit(ast.parse(code))
+    assert visitor.errors == {}
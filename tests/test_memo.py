@@ -0,0 +1,130 @@
+import ast
+
+import pytest
+
+from flake8_hangover.diff import normalize_path
+from flake8_hangover.memo import (
+    Segment,
+    StatementMemo,
+    get_segments,
+)
+from flake8_hangover.plugin import Plugin
+from flake8_hangover.ranges import LineRanges
+
+CODE = '''
+import os
+
+
+def first(a,
+          b):
+    return func(a,
+                b)
+
+
+class Foo(Base,
+          Mixin):
+
+    @decorator(
+        x)
+    def method(self):
+        return func(a,
+                    b)
+
+    def other(self):
+        return func(
+            a)
+
+
+x = 1; y = func(a,
+                b)
+'''
+
+
+@pytest.fixture
+def memo(monkeypatch):
+    """Enable plugin memo."""
+    memo = StatementMemo(max_entries=100)
+    monkeypatch.setattr(Plugin, 'memo', memo)
+    return memo
+
+
+@pytest.fixture
+def checked_ranges(monkeypatch):
+    """Collect line ranges checked by plugin."""
+    checked = []
+    check = Plugin.check
+
+    def check_ranges(self, line_ranges=None):
+        checked.append(None if line_ranges is None else list(line_ranges))
+        return check(self, line_ranges)
+
+    monkeypatch.setattr(Plugin, 'check', check_ranges)
+    return checked
+
+
+def test_get_segments():
+    """Test file is split to top-level statements and methods of classes."""
+    lines = CODE.splitlines(keepends=True)
+    segments = get_segments(ast.parse(CODE), lines)
+    assert [(s.start, s.end) for s in segments] == [
+        (2, 2),
+        (5, 8),
+        (11, 13),  # class header
+        (14, 18),  # decorated method
+        (20, 22),
+        (25, 26),  # statements on the same line
+    ]
+    assert segments[1].source == ''.join(lines[4:8]).rstrip('\n')
+
+
+def test_memo_results_are_same(memo, checked_ranges, run_plugin):
+    """Test results with memo are the same as without it."""
+    results = run_plugin(CODE, lines=True)
+    assert len(results) == 12
+    assert checked_ranges == [[(2, 2), (5, 8), (11, 18), (20, 22), (25, 26)]]
+    assert len(memo) == 6
+
+    assert run_plugin(CODE, lines=True) == results
+    assert checked_ranges == [checked_ranges[0]]  # nothing checked again
+
+
+def test_memo_checks_only_changed_statements(memo, checked_ranges, run_plugin):
+    """Test only changed statements are checked and other results are shifted."""
+    run_plugin(CODE, lines=True)
+    code = CODE.replace('import os\n', 'import os\nimport sys\n\n\n').replace(
+        'return func(\n            a)',
+        'return func(\n            a,\n        )',
+    )
+    results = run_plugin(code, lines=True)
+    assert checked_ranges[1:] == [[(3, 3), (23, 26)]]
+
+    Plugin.memo = None
+    assert results == run_plugin(code, lines=True)
+
+
+def test_memo_trailing_whitespaces(memo, checked_ranges, run_plugin):
+    """Test trailing whitespaces don't invalidate memo."""
+    results = run_plugin(CODE, lines=True)
+    assert run_plugin(CODE.replace('(a,\n', '(a,   \n'), lines=True) == results
+    assert len(checked_ranges) == 1
+
+
+def test_memo_is_not_used_for_diff(memo, checked_ranges, monkeypatch, run_plugin):
+    """Test memo is not used when only changed lines are checked."""
+    diff_ranges = {normalize_path('stdin'): LineRanges([(5, 8)])}
+    monkeypatch.setattr(Plugin, 'diff_ranges', diff_ranges)
+    assert [line for line, _, _ in run_plugin(CODE, lines=True)] == [5, 6, 6, 8, 8]
+    assert len(memo) == 0
+
+
+def test_memo_eviction():
+    """Test least recently used entries are evicted."""
+    memo = StatementMemo(max_entries=2)
+    a, b, c = (Segment(10, 12, source) for source in 'abc')
+    memo.set('', a, [(11, 4, 'A')])
+    memo.set('', b, [])
+    assert memo.get('', Segment(1, 3, 'a')) == [(2, 4, 'A')]
+    memo.set('', c, [])
+    assert memo.get('', a) == [(11, 4, 'A')]
+    assert memo.get('', b) is None
+    assert memo.get('other options', c) is None
@@ -0,0 +1,163 @@
+import ast
+from argparse import Namespace
+
+import pytest
+
+from flake8_hangover.engine import Engine
+from flake8_hangover.plugin import (
+    Messages,
+    Plugin,
+)
+from flake8_hangover.prescan import (
+    find_multiline_regions,
+    get_noqa_codes,
+)
+
+from . import (
+    test_func_call,
+    test_func_def,
+    test_simple_indent,
+)
+
+CODE = '''
+result = func(
+      param,  # noqa
+      key=value)  # noqa: FHG003
+other = [
+    1]  # noqa:E501
+'''
+
+
+def filter_noqa(code, results, options):
+    """Filter results by ``# noqa`` comments as flake8 does."""
+    from flake8.processor import FileProcessor
+    from flake8.violation import Violation
+
+    processor = FileProcessor('test.py', options, lines=code.splitlines(keepends=True))
+    return [
+        (lineno, col_offset, msg)
+        for lineno, col_offset, msg in results
+        if not Violation(
+            msg.split()[0],
+            'test.py',
+            lineno,
+            col_offset + 1,
+            msg,
+            processor.noqa_line_for(lineno),
+        ).is_inline_ignored(False)
+    ]
+
+
+@pytest.mark.parametrize('code, expected', [
+    ('x = 1  # noqa\n', ()),
+    ('x = 1  # NoQA\n', ()),
+    ('x = 1  # noqa:FHG002,FHG003\n', ('FHG002', 'FHG003')),
+    ('x = 1  # noqa: FHG0 E501\n', ('FHG0', 'E501')),
+    ('x = 1  # noqa: FHG E501\n', ()),
+    ('x = 1  # noqa : E501\n', ()),
+    ('x = 1  # comment\n', None),
+    ('x = 1  # comment # noqa\n', None),
+    ("x = '# noqa: E501'  # noqa\n", None),
+    ('x = """\n"""  # noqa\n', None),
+    ('x = [\n    1,  # noqa\n]\n', ()),
+])
+def test_get_noqa_codes(code, expected, get_tokens):
+    """Test codes of ``# noqa`` comments which flake8 surely applies to their lines."""
+    tokens = get_tokens(code)
+    comments = [i for i, token in enumerate(tokens) if token.string.startswith('#')]
+    assert get_noqa_codes(tokens, comments[0]) == expected
+
+
+def test_noqa_index(get_tokens):
+    """Test ``# noqa`` index is collected only if it is enabled."""
+    tokens = get_tokens(CODE)
+    assert find_multiline_regions(tokens).noqa == {}
+
+    index = find_multiline_regions(tokens, noqa=True).noqa
+    assert index == {3: (), 4: ('FHG003',), 6: ('E501',)}
+    assert index.suppresses(3, 'FHG002')
+    assert index.suppresses(4, 'FHG003')
+    assert not index.suppresses(4, 'FHG002')
+    assert not index.suppresses(5, 'FHG005')
+
+
+def test_suppressed_errors_not_checked(run_plugin):
+    """Test errors suppressed by ``# noqa`` are skipped."""
+    assert run_plugin(CODE, noqa=False) == [
+        (3, 6, Messages.FHG002),
+        (4, 6, Messages.FHG003),
+        (4, 15, Messages.FHG005),
+        (6, 5, Messages.FHG005),
+    ]
+    assert run_plugin(CODE, noqa=True) == [
+        (4, 15, Messages.FHG005),
+        (6, 5, Messages.FHG005),
+    ]
+
+
+@pytest.fixture
+def added_errors(monkeypatch):
+    """Collect errors added by rules (before they are filtered by engines)."""
+    errors = []
+    add_error = Engine.add_error
+
+    def wrapper(self, lineno, offset, error):
+        errors.append((lineno, offset, error))
+        add_error(self, lineno, offset, error)
+
+    monkeypatch.setattr(Engine, 'add_error', wrapper)
+    return errors
+
+
+def test_suppressed_function_args_not_checked(run_plugin, added_errors):
+    """Test arguments of function definition are not checked on suppressed lines."""
+    code = 'def func(a,  # noqa: FHG004\n  b,  # noqa\n  c,\n):\n    pass\n'
+    expected = [(3, 2, Messages.FHG001)]
+    assert run_plugin(code, noqa=True) == expected
+    assert added_errors == expected
+
+
+def test_suppressed_brackets_not_checked(run_plugin, added_errors):
+    """Test pairs of brackets are not checked if close bracket line is suppressed."""
+    code = 'x = [\n    1]  # noqa: FHG005\ny = (\n    2)\n'
+    expected = [(4, 5, Messages.FHG005)]
+    assert run_plugin(code, noqa=True) == expected
+    assert added_errors == expected
+
+
+def test_noqa_parity(run_plugin):
+    """Test results filtered by flake8 are the same with and without ``# noqa`` index.
+
+    ``# noqa`` comments are added to every line of registered cases.
+    """
+    from flake8.options.parse_args import parse_args
+
+    _, options = parse_args([])
+    for module in (test_func_call, test_func_def, test_simple_indent):
+        for case in module.CLASSES_REGISTRY[module.__name__].values():
+            lines = [line[4:] for line in case.code.strip('\n').split('\n')]
+            for i in range(len(lines)):
+                for comment in ('# noqa', '# NOQA:FHG002,FHG005', '# noqa: E'):
+                    code = '\n'.join(lines[:i] + [f'{lines[i]}  {comment}'] + lines[i + 1:]) + '\n'
+                    try:
+                        ast.parse(code)
+                    except SyntaxError:
+                        continue  # comment breaks code
+
+                    expected = filter_noqa(code, run_plugin(code, noqa=False), options)
+                    assert run_plugin(code, noqa=True) == expected, code
+
+
+@pytest.mark.parametrize('argv, expected', [
+    ([], True),
+    (['--disable-noqa'], False),
+    (None, False),
+])
+def test_noqa_option(monkeypatch, argv, expected):
+    """Test ``# noqa`` index is used only if flake8 filters errors by ``# noqa``."""
+    from flake8.options.parse_args import parse_args
+
+    for name in ('codes', 'noqa', 'options_key', 'cache', 'diff_ranges', 'stats', 'profiler'):
+        monkeypatch.setattr(Plugin, name, getattr(Plugin, name))
+    Plugin.parse_options(Namespace() if argv is None else parse_args(argv)[1])
+    assert Plugin.noqa is expected
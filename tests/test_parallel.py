@@ -0,0 +1,117 @@
+import ast
+from argparse import Namespace
+
+import pytest
+from flake8.main.options import JobsArgument
+
+from benchmarks.corpus import (
+    CorpusParams,
+    generate_corpus,
+)
+from flake8_hangover import parallel
+from flake8_hangover.parallel import (
+    ChunkChecker,
+    get_jobs,
+    split_chunks,
+)
+from flake8_hangover.plugin import Plugin
+
+CODE = '''# comment
+
+def first(a,
+          b):
+    pass
+x = 1; y = func(a,
+                b)
+
+@decorator
+class Foo:
+    pass
+z = 2
+'''
+
+
+@pytest.fixture
+def chunk_checker(monkeypatch):
+    """Enable parallel checks of all files."""
+    checker = ChunkChecker(min_lines=1, jobs=3)
+    monkeypatch.setattr(Plugin, 'parallel', checker)
+    return checker
+
+
+@pytest.mark.parametrize(('count', 'expected'), [
+    (1, [(1, 12)]),
+    (2, [(1, 8), (9, 12)]),
+    (3, [(1, 5), (6, 8), (9, 12)]),
+    (10, [(1, 5), (6, 8), (9, 11), (12, 12)]),
+])
+def test_split_chunks(count, expected):
+    """Test file is split by top-level statements (including decorators)."""
+    assert split_chunks(ast.parse(CODE), len(CODE.splitlines()), count) == expected
+
+
+def test_split_chunks_empty():
+    """Test file without statements is single chunk."""
+    assert split_chunks(ast.parse('# comment\n'), 1, 4) == [(1, 1)]
+    assert split_chunks(ast.parse(''), 0, 4) == []
+
+
+def test_parallel_results(chunk_checker, run_plugin):
+    """Test results of parallel check are the same as of serial one."""
+    code = generate_corpus(CorpusParams(lines=3000, errors=0.2))
+    results = run_plugin(code, lines=True)
+    assert results == sorted(results)
+    assert chunk_checker.files_checked == 1
+    assert ChunkChecker.shared_file is None
+
+    Plugin.parallel = None
+    assert results == sorted(run_plugin(code, lines=True))
+
+
+def test_parallel_small_file(chunk_checker, run_plugin):
+    """Test files smaller than limit are checked as usual."""
+    chunk_checker.min_lines = 100
+    assert len(run_plugin(CODE, lines=True)) == 5
+    assert chunk_checker.files_checked == 0
+
+
+def test_parallel_child_process(chunk_checker, monkeypatch, run_plugin):
+    """Test files are checked as usual in worker processes (of flake8 or of CLI)."""
+    monkeypatch.setattr(parallel.multiprocessing, 'parent_process', lambda: object())
+    assert len(run_plugin(CODE, lines=True)) == 5
+    assert chunk_checker.files_checked == 0
+
+
+def test_parallel_threads(chunk_checker, monkeypatch, run_plugin):
+    """Test files are checked as usual in processes with several threads."""
+    monkeypatch.setattr(parallel.threading, 'active_count', lambda: 2)
+    assert len(run_plugin(CODE, lines=True)) == 5
+    assert chunk_checker.files_checked == 0
+
+
+def test_parallel_without_fork(chunk_checker, monkeypatch, run_plugin):
+    """Test files are checked as usual where processes can't be forked."""
+    monkeypatch.setattr(parallel.multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+    assert len(run_plugin(CODE, lines=True)) == 5
+    assert chunk_checker.files_checked == 0
+
+
+def test_parallel_options(monkeypatch):
+    """Test parallel checks are enabled by options."""
+    monkeypatch.setattr(Plugin, 'parallel', None)
+    Plugin.parse_options(Namespace(hangover_parallel_lines=5000, hangover_parallel_jobs=2))
+    assert (Plugin.parallel.min_lines, Plugin.parallel.jobs) == (5000, 2)
+    Plugin.parse_options(Namespace())
+    assert Plugin.parallel is None
+
+
+@pytest.mark.parametrize(('jobs', 'expected'), [
+    (None, 8),
+    (JobsArgument('auto'), 8),
+    (JobsArgument('1'), 8),
+    (JobsArgument('4'), 4),
+    (16, 8),
+])
+def test_parallel_jobs_capped(jobs, expected):
+    """Test number of workers is capped by ``--jobs`` of flake8 or CLI."""
+    assert get_jobs(Namespace(hangover_parallel_jobs=8, jobs=jobs)) == expected
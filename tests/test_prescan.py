@@ -0,0 +1,41 @@
+import ast
+
+import pytest
+
+from flake8_hangover import plugin
+from flake8_hangover.plugin import Plugin
+from flake8_hangover.prescan import find_multiline_regions
+
+
+@pytest.mark.parametrize('code, regions', [
+    ('x = func(a, b)\ny = [1, 2]\n', []),
+    ('def foo():\n    """Multiline\n    docstring."""\n    return 1\n', []),
+    ('x = 1 + \\\n    2\n', []),
+    ('x = func(\n    a,\n)\ny = 1\n', [(1, 3)]),
+    ('x = func \\\n    (a)\n', [(1, 2)]),
+    ('if x:\n    y = [\n        1,\n    ]\nz = {\n}\n', [(2, 6)]),
+    ('a = f(\n    # comment\n\n    b)  # comment\n\nc = d(e)\n', [(1, 4)]),
+])
+def test_find_multiline_regions(code, regions, get_tokens):
+    """Test multiline logical lines with brackets are found."""
+    assert list(find_multiline_regions(get_tokens(code)).lines) == regions
+
+
+def test_find_multiline_regions_windows(get_tokens):
+    """Test token slices of adjacent multiline logical lines are merged."""
+    tokens = get_tokens('a = 1\nb = f(\n    c)\nd = [\n]\ne = 2\ng = h(\n)\n')
+    windows = find_multiline_regions(tokens).windows
+    assert [(tokens[start].start[0], tokens[end - 1].start[0]) for start, end in windows] == [
+        (2, 5),
+        (7, 8),
+    ]
+
+
+def test_plugin_skips_files_without_multiline_brackets(monkeypatch, get_tokens):
+    """Test visitor and validator are not used for file without multiline brackets."""
+    def fail(*args, **kwargs):
+        raise AssertionError('Visitor must not be used')
+
+    monkeypatch.setattr(plugin, 'Visitor', fail)
+    code = 'import os\n\n\ndef foo(a, b):\n    return os.path.join(a, b)\n'
+    assert list(Plugin(tree=ast.parse(code), file_tokens=get_tokens(code)).run()) == []
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from flake8_hangover.plugin import Plugin
+from flake8_hangover.profiler import SlowFileProfiler
+
+CODE = '''
+result = func(param,
+              other)
+'''
+
+
+@pytest.mark.parametrize('threshold, profiled', [(0.0, True), (60.0, False)])
+def test_profiler(tmp_path, monkeypatch, threshold, profiled, run_plugin):
+    """Test profiles are stored only for slow files."""
+    profiler = SlowFileProfiler(str(tmp_path), threshold)
+    monkeypatch.setattr(Plugin, 'profiler', profiler)
+
+    assert len(run_plugin(CODE, filename='./src/first.py')) == 2
+    assert len(run_plugin(CODE, filename='src/second.py')) == 2
+
+    profiles = profiler.get_profiles()
+    assert sorted(filename for _, filename, _ in profiles) == (
+        [os.path.join('src', 'first.py'), os.path.join('src', 'second.py')] if profiled else []
+    )
+
+    with open(profiler.write_summary()) as f:
+        summary = f.read()
+    assert ('src/first.py' in summary) is profiled
+    assert ('(visit_Call)' in summary) is profiled
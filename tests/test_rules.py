@@ -0,0 +1,94 @@
+import ast
+
+import pytest
+
+from flake8_hangover import rules
+from flake8_hangover.plugin import Plugin
+from flake8_hangover.validator import IndentValidator
+from flake8_hangover.visitor import Visitor
+
+CODE = '''
+result = func(
+    [1, 2],
+    other(
+        3),
+)
+'''
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Restore registered rules after test."""
+    monkeypatch.setattr(rules, 'RULES', list(rules.RULES))
+    return rules.RULES
+
+
+def make_rule(code):
+    """Make rule reporting every call and multiline brackets pair."""
+    class CountingRule(rules.Rule):
+        codes = (code,)
+        node_types = (ast.Call,)
+        token_events = (rules.BRACKET_PAIR,)
+        instances = []
+
+        def __init__(self, engine):
+            super().__init__(engine)
+            self.instances.append(self)
+            self.nodes = []
+            self.pairs = []
+
+        def visit_Call(self, node):
+            self.nodes.append(node)
+            self.engine.add_error(node.lineno, node.col_offset, f'{code} call')
+
+        def on_bracket_pair(self, pair):
+            self.pairs.append(pair)
+
+    return CountingRule
+
+
+def test_rules_registered():
+    """Test all plugin codes are checked by registered rules."""
+    codes = {code for rule in rules.RULES for code in rule.codes}
+    assert codes == {'FHG001', 'FHG002', 'FHG003', 'FHG004', 'FHG005'}
+
+
+def test_rules_dispatched_in_single_traversal(registry, get_tokens):
+    """Test nodes and token events are dispatched to all rules during single traversal."""
+    tree = ast.parse(CODE)
+    tokens = get_tokens(CODE)
+    visitor = Visitor(tokens=tokens)
+    visitor.visit(tree)
+    nodes_visited = visitor.nodes_visited
+
+    first = rules.register_rule(make_rule('XYZ001'))
+    second = rules.register_rule(make_rule('XYZ002'))
+    codes = ('FHG002', 'FHG005', 'XYZ001', 'XYZ002')
+    visitor = Visitor(tokens=tokens, codes=codes)
+    visitor.visit(tree)
+    validator = IndentValidator(tokens=tokens, codes=codes)
+    validator.validate()
+
+    assert visitor.nodes_visited == nodes_visited
+    assert validator.tokens_scanned == len(tokens)
+    for rule in (first, second):
+        visitor_rule, validator_rule = rule.instances
+        assert [node.lineno for node in visitor_rule.nodes] == [2, 4]
+        assert [(pair.open_line, pair.close_line) for pair in validator_rule.pairs] == [
+            (4, 5),
+            (2, 6),
+        ]
+    # only first error is reported for every position
+    assert visitor.errors == {(2, 9): 'XYZ001 call', (4, 4): 'XYZ001 call'}
+    assert list(validator.errors) == [(5, 9)]
+
+
+def test_rules_of_disabled_codes_not_used(registry, get_tokens):
+    """Test rules are not created if all their codes are disabled."""
+    rule = rules.register_rule(make_rule('XYZ001'))
+    visitor = Visitor(tokens=[], codes=('FHG005',))
+    assert visitor.rules == []
+
+    plugin = Plugin(tree=ast.parse(CODE), file_tokens=get_tokens(CODE))
+    assert [r[2] for r in plugin.run()].count('XYZ001 call') == 0
+    assert rule.instances == []
@@ -0,0 +1,160 @@
+import ast
+import glob
+import os
+from io import StringIO
+from tokenize import generate_tokens
+
+import pytest
+
+from benchmarks.corpus import (
+    CorpusParams,
+    generate_corpus,
+)
+from flake8_hangover import api
+from flake8_hangover.api import check_source
+from flake8_hangover.index import FileIndex
+from flake8_hangover.plugin import Plugin
+from flake8_hangover.prescan import find_multiline_regions
+from flake8_hangover.scanner import (
+    SCANNER_SUPPORTED,
+    SourceIndex,
+)
+from flake8_hangover.validator import IndentValidator
+
+from . import (
+    test_func_call,
+    test_func_def,
+    test_simple_indent,
+)
+from .conftest import CLASSES_REGISTRY
+
+pytestmark = pytest.mark.skipif(
+    not SCANNER_SUPPORTED,
+    reason='f-strings are tokenized differently',
+)
+
+TRICKY_CODE = '''
+x = ("(", ')',
+     """
+     ) ] }
+  (""" + f"{a(b)}" + rb'\\')', 'a \\
+  ('
+)
+y = [  # ( comment with ) brackets
+    """first""", SQ
+    SQ (
+        1,
+    ) + x[
+        2]
+]
+z = 1 + \\
+    (2 +
+     3)
+a = 'text' [  # noqa: FHG005
+    0]  # NOQA:FHG001,FHG005
+b = """
+"""  # noqa
+c = 1 + \\
+    2  # noqa
+d = "# noqa" + (  # noqa: E501
+    3)  # comment \\
+e = [1]  # noqa:FHG005 E501
+def f(  # noqa
+\tx,
+\f):
+    return {
+        'key': ("""a""",
+    )}
+'''.replace('SQ', "'" * 3)
+
+
+def assert_parity(code):
+    """Check scanner finds the same brackets and indents as tokens index."""
+    tokens = list(generate_tokens(StringIO(code).readline))
+    expected = FileIndex(tokens)
+    expected.scan()
+    index = SourceIndex(code, noqa=True)
+    index.scan()
+    assert index.pairs == expected.pairs
+    assert index.line_indents == expected.line_indents
+    assert index.brackets_paired == expected.brackets_paired
+    assert index.noqa == find_multiline_regions(tokens, noqa=True).noqa
+
+
+def test_scanner_tricky_code():
+    """Test brackets in strings and comments are skipped."""
+    ast.parse(TRICKY_CODE)
+    assert_parity(TRICKY_CODE)
+    assert_parity(TRICKY_CODE.replace('\n', '\r\n'))
+
+
+def test_scanner_registered_cases():
+    """Test scanner on all registered cases."""
+    for module in (test_func_call, test_func_def, test_simple_indent):
+        for case in CLASSES_REGISTRY[module.__name__].values():
+            assert_parity(case.code)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_scanner_corpus(seed):
+    """Test scanner on synthetic corpus."""
+    assert_parity(generate_corpus(CorpusParams(lines=2000, seed=seed)))
+
+
+def test_scanner_package_sources():
+    """Test scanner on sources of package, tests and benchmarks."""
+    root = os.path.dirname(os.path.dirname(__file__))
+    for path in glob.glob(os.path.join(root, '*', '*.py')):
+        with open(path, encoding='utf-8') as f:
+            assert_parity(f.read())
+
+
+@pytest.mark.parametrize('code', [
+    'x = (1, 2))\n',
+    'x = "text\n',
+    "x = '''text\n",
+])
+def test_scanner_invalid_code(code):
+    """Test scanner errors on invalid code."""
+    with pytest.raises(ValueError):
+        SourceIndex(code).scan()
+
+
+def test_scanner_in_validator():
+    """Test validator finds the same errors with scanner index."""
+    code = generate_corpus(CorpusParams(lines=2000, errors=0.2))
+    tokens = list(generate_tokens(StringIO(code).readline))
+    validator = IndentValidator(tokens)
+    validator.validate()
+    scanned = IndentValidator([], index=SourceIndex(code))
+    scanned.validate()
+    assert validator.errors
+    assert scanned.errors == validator.errors
+
+
+def test_api_uses_scanner(monkeypatch):
+    """Test source is not tokenized by API if only rules of brackets are selected."""
+    code = generate_corpus(CorpusParams(lines=500, errors=0.2))
+    expected = [d for d in check_source(code) if d.code == 'FHG005']
+
+    def fail(*args, **kwargs):
+        raise AssertionError('Source must not be tokenized')
+
+    monkeypatch.setattr(Plugin, 'codes', frozenset({'FHG005'}))
+    monkeypatch.setattr(api.tokenize, 'generate_tokens', fail)
+    assert expected
+    assert check_source(code) == expected
+    assert list(api.check_many([code, 'x = 1\n'])) == [expected, []]
+
+
+def test_api_scanner_noqa(monkeypatch):
+    """Test errors suppressed by ``# noqa`` comments are not reported with scanner."""
+    code = 'x = [\n    1,\n      ]  # noqa\ny = (\n    2,\n      )\n'
+    monkeypatch.setattr(Plugin, 'codes', frozenset({'FHG005'}))
+    monkeypatch.setattr(Plugin, 'noqa', True)
+    tokens = list(generate_tokens(StringIO(code).readline))
+    expected = check_source(code, tokens=tokens)
+    assert [(d.line, d.code) for d in expected] == [(6, 'FHG005')]
+
+    monkeypatch.setattr(api.tokenize, 'generate_tokens', None)  # source is not tokenized
+    assert check_source(code) == expected
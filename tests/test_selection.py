@@ -0,0 +1,125 @@
+import ast
+from argparse import Namespace
+
+import pytest
+
+from flake8_hangover import plugin
+from flake8_hangover.plugin import (
+    Messages,
+    Plugin,
+)
+from flake8_hangover.visitor import Visitor
+
+CODE = '''
+def foo(a,
+        b):
+    pass
+
+
+result = func(
+      param,
+      key=value)
+'''
+
+
+@pytest.fixture
+def parse_options(monkeypatch):
+    """Parse flake8 options to plugin (plugin options are restored after test)."""
+    from flake8.options.parse_args import parse_args
+
+    monkeypatch.delenv(plugin.STATS_ENV_VAR, raising=False)
+    for name in ('codes', 'noqa', 'options_key', 'cache', 'diff_ranges', 'stats', 'profiler'):
+        monkeypatch.setattr(Plugin, name, getattr(Plugin, name))
+
+    def wrapper(*argv):
+        _, options = parse_args(list(argv))
+        Plugin.parse_options(options)
+    return wrapper
+
+
+def fail(*args, **kwargs):
+    """Fail if disabled engine is used."""
+    raise AssertionError('Engine must not be used')
+
+
+def test_all_codes_selected_by_default(parse_options, run_plugin):
+    """Test all codes are checked by default."""
+    parse_options()
+    assert Plugin.codes == plugin.ALL_CODES
+    assert sorted(msg for _, _, msg in run_plugin(CODE)) == sorted([
+        Messages.FHG001,
+        Messages.FHG002,
+        Messages.FHG003,
+        Messages.FHG004,
+        Messages.FHG005,
+        Messages.FHG005,
+    ])
+
+
+def test_visitor_skipped(parse_options, monkeypatch, run_plugin):
+    """Test visitor is not used if only validator codes are selected."""
+    parse_options('--select', 'FHG005')
+    monkeypatch.setattr(plugin, 'Visitor', fail)
+    assert sorted(msg for _, _, msg in run_plugin(CODE)) == [Messages.FHG005, Messages.FHG005]
+
+
+def test_validator_skipped(parse_options, monkeypatch, run_plugin):
+    """Test validator is not used if its codes are ignored."""
+    from flake8_hangover import validator
+
+    parse_options('--extend-ignore', 'FHG005')
+    monkeypatch.setattr(validator, 'IndentValidator', fail)
+    assert Messages.FHG005 not in [msg for _, _, msg in run_plugin(CODE)]
+
+
+def test_nothing_selected(parse_options, monkeypatch, run_plugin):
+    """Test nothing is checked if plugin codes are not selected."""
+    from flake8_hangover import prescan
+
+    parse_options('--select', 'E')
+    monkeypatch.setattr(prescan, 'find_multiline_regions', fail)
+    assert run_plugin(CODE) == []
+
+
+@pytest.mark.parametrize('argv, expected', [
+    (('--select', 'FHG002'), [Messages.FHG002]),
+    (('--select', 'FHG001,FHG003'), [Messages.FHG001, Messages.FHG003]),
+    (('--extend-ignore', 'FHG001,FHG002,FHG003,FHG004'), [Messages.FHG005, Messages.FHG005]),
+])
+def test_rules_selected(parse_options, argv, expected, run_plugin):
+    """Test only selected rules are reported."""
+    parse_options(*argv)
+    assert sorted(msg for _, _, msg in run_plugin(CODE)) == expected
+
+
+def test_functions_not_checked():
+    """Test function definitions are not checked if their codes are disabled."""
+    code = CODE.strip() + '\n'
+    visitor = Visitor(tokens=[], codes=('FHG002', 'FHG003'))
+    visitor.visit(ast.parse(code))
+    assert visitor.functions_checked == 0
+    assert visitor.calls_checked == 1
+    assert sorted(visitor.errors.values()) == [Messages.FHG002, Messages.FHG003]
+
+
+def test_selection_is_part_of_cache_key(parse_options):
+    """Test cached results of one selection are not used for another one."""
+    parse_options('--select', 'FHG005')
+    key = Plugin.options_key
+    parse_options()
+    assert Plugin.options_key != key
+
+
+def test_python_version_is_part_of_cache_key(parse_options, monkeypatch):
+    """Test cached results of one Python version are not used for another one."""
+    parse_options()
+    key = Plugin.options_key
+    monkeypatch.setattr(plugin, 'PYTHON_VERSION', '3.7')
+    parse_options()
+    assert Plugin.options_key != key
+    assert Plugin.options_key.startswith('py3.7;')
+
+
+def test_unknown_selection():
+    """Test all codes are selected if options are not parsed by flake8."""
+    assert plugin.get_selected_codes(Namespace()) == plugin.ALL_CODES
@@ -0,0 +1,67 @@
+import json
+from collections import Counter
+
+import pytest
+
+from flake8_hangover.cli import main
+from flake8_hangover.plugin import (
+    STATS_ENV_VAR,
+    Messages,
+    Plugin,
+)
+
+CODE = '''
+def foo(
+    param,
+    other=None,
+):
+    return func(param,
+                other)
+'''
+
+
+@pytest.fixture(autouse=True)
+def restore_plugin(monkeypatch):
+    """Restore plugin options and prevent merging stats on exit."""
+    monkeypatch.setattr(Plugin, 'stats', None)
+    monkeypatch.setattr('atexit.register', lambda func: None)
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_stats_report(tmp_path, capsys, jobs):
+    """Test stats of all processes are merged into report."""
+    for i in range(10):
+        (tmp_path / f'file_{i}.py').write_text(CODE)
+    report_path = tmp_path / 'report.json'
+
+    assert main(['--jobs', jobs, '--hangover-stats', str(report_path), str(tmp_path)]) == 1
+    output = capsys.readouterr().out.splitlines()
+    assert Counter(line.split()[1] for line in output) == {'FHG002': 10, 'FHG005': 10}
+    assert output[:2] == [
+        f'{tmp_path / "file_0.py"}:7:17: {Messages.FHG002}',
+        f'{tmp_path / "file_0.py"}:7:22: {Messages.FHG005}',
+    ]
+
+    report = Plugin.stats.merge()
+    assert json.loads(report_path.read_text()) == report
+    assert report['processes'] >= 1
+    assert set(report['timings']) == {'total', 'prescan', 'visitor', 'validator'}
+    assert report['counters'] == {
+        'files': 10,
+        'regions': 10,
+        'errors': 20,
+        'nodes_visited': 50,
+        'calls_checked': 10,
+        'functions_checked': 10,
+        'tokens_scanned': 260,
+        'brackets_paired': 20,
+    }
+    assert len(report['slowest_files']) == 10
+    assert not (tmp_path / 'report.json.parts').exists()
+
+
+def test_stats_env_var(tmp_path, monkeypatch):
+    """Test stats are enabled by environment variable."""
+    monkeypatch.setenv(STATS_ENV_VAR, str(tmp_path / 'report.json'))
+    Plugin.parse_options(object())
+    assert Plugin.stats.report_path == str(tmp_path / 'report.json')
@@ -0,0 +1,136 @@
+import ast
+from io import StringIO
+from tokenize import generate_tokens
+
+from flake8_hangover.plugin import Plugin
+from flake8_hangover.prescan import find_multiline_regions
+from flake8_hangover.rules import CallRule
+from flake8_hangover.validator import IndentValidator
+from flake8_hangover.visitor import Visitor
+
+TYPICAL_CODE = '''
+import os
+from typing import Optional
+
+DEFAULT_NAME = 'world'
+
+
+class Greeter:
+    """Greet somebody."""
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name = name or os.environ.get('NAME', DEFAULT_NAME)
+        self.count = 0
+
+    def greet(self, times: int = 1) -> str:
+        self.count += times
+        parts = [f'Hello, {self.name}!' for _ in range(times)]
+        message = ' '.join(parts).strip().upper()
+        if self.count > 10 and not message.startswith('HELLO'):
+            raise ValueError(f'Too many greetings: {self.count}')
+        return message
+
+    def farewell(self) -> str:
+        result = self.format_message(
+            prefix='Goodbye',
+            suffix='!',
+        )
+        return result.replace('  ', ' ').strip()
+
+    def format_message(self, prefix: str, suffix: str) -> str:
+        return f'{prefix}, {self.name}{suffix}' if self.name else prefix + suffix
+'''
+
+# errors of both visitor and validator in every statement
+LEGACY_CODE = ''.join(
+    f'def func_{i}(a,\n        b):\n    return g(\n          a,\n    )\n'
+    for i in range(200)
+)
+
+
+def test_visitor_skips_single_line_nodes():
+    """Test visitor does not descend into single line nodes."""
+    tree = ast.parse(TYPICAL_CODE)
+    tokens = list(generate_tokens(StringIO(TYPICAL_CODE).readline))
+    visitor = Visitor(tokens=tokens)
+    visitor.visit(tree)
+
+    total_nodes = sum(1 for _ in ast.walk(tree))
+    assert visitor.nodes_visited * 10 <= total_nodes
+
+
+def test_visitor_func_name_offset_on_long_chain():
+    """Test function name width is calculated for long call chains."""
+    tree = ast.parse('qs' + ''.join(f'.m{i % 10}(x)[k]' for i in range(200)))
+    rule = CallRule(Visitor(tokens=[]))
+    calls = [node for node in ast.walk(tree) if isinstance(node, ast.Call)]
+    assert rule._get_func_name_offset(calls[0]) == len('qs') + 6 * 200 - 3
+    assert rule._get_func_name_offset(calls[-1]) == len('qs.m0')
+
+
+def test_visitor_deeply_nested_expression():
+    """Test deeply nested expression does not exceed recursion limit."""
+    depth = 1000
+    code = 'x = (\n    a\n' + '    + f(\n          a,\n    )\n' * depth + ')\n'
+    tree = ast.parse(code)
+    visitor = Visitor(tokens=[])
+    visitor.visit(tree)
+    assert visitor.calls_checked == depth
+    assert len(visitor.errors) == depth
+
+
+def test_visitor_streams_errors():
+    """Test errors are yielded by top-level statements sorted by position."""
+    tree = ast.parse(LEGACY_CODE)
+    tokens = list(generate_tokens(StringIO(LEGACY_CODE).readline))
+    visitor = Visitor(tokens=tokens)
+    visitor.visit(tree)
+    expected = sorted((*key, msg) for key, msg in visitor.errors.items())
+
+    streaming = Visitor(tokens=tokens)
+    errors = streaming.iter_errors(tree)
+    first = next(errors)
+    assert streaming.nodes_visited * 10 < visitor.nodes_visited
+    assert not streaming.errors
+    assert [first, *errors] == expected
+
+
+def test_validator_streams_errors():
+    """Test errors are yielded by segments sorted by position."""
+    code = 'x = f(\n    a)\ny = [\n    g(\n        b)]\nz = (\n    1,\n  )\n'
+    validator = IndentValidator(list(generate_tokens(StringIO(code).readline)))
+    errors = validator.iter_errors([2, 5, 8])
+    assert next(errors)[:2] == (2, 5)
+    assert validator._pending == []  # errors of next segments are not checked yet
+    assert [error[:2] for error in errors] == [(5, 9), (5, 10), (8, 2)]
+
+
+def test_validator_scans_windows_lazily():
+    """Test windows of tokens are scanned only when pairs of previous ones are checked."""
+    code = 'x = f(\n    a)\nv = 1\ny = [\n    g(\n        b)]\nv = 2\nz = (\n    1,\n  )\n'
+    tokens = list(generate_tokens(StringIO(code).readline))
+    windows = find_multiline_regions(tokens).windows
+    assert len(windows) == 3
+    validator = IndentValidator(tokens, windows=windows)
+    errors = validator.iter_errors([2, 3, 6, 7, 10])
+    assert next(errors)[:2] == (2, 5)
+    assert validator.get_index().tokens_scanned < windows[-1][0]  # last window is not scanned
+    assert not validator._pending and not validator._seen  # segment state is cleared
+    assert [error[:2] for error in errors] == [(6, 9), (6, 10), (10, 2)]
+    assert validator.tokens_scanned == sum(end - start for start, end in windows)
+
+
+def test_plugin_merges_engines_errors():
+    """Test errors of visitor and validator are merged in order of positions."""
+    tree = ast.parse(LEGACY_CODE)
+    tokens = list(generate_tokens(StringIO(LEGACY_CODE).readline))
+    results = [r[:3] for r in Plugin(tree=tree, file_tokens=tokens).run()]
+    assert len(results) == 200 * 4
+    assert results == sorted(results)
+
+    visitor = Visitor(tokens=tokens)
+    visitor.visit(tree)
+    validator = IndentValidator(tokens)
+    validator.validate()
+    expected = [(*key, msg) for key, msg in [*visitor.errors.items(), *validator.errors.items()]]
+    assert results == sorted(expected)